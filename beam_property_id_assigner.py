@@ -6,7 +6,6 @@ import os
 import sys
 import ctypes
 from typing import Callable, Optional, Dict
-from datetime import datetime
 
 # ==============================================================================
 # CONFIGURAZIONE STRAND7 API
@@ -26,6 +25,9 @@ try:
 except Exception as e:
     raise ImportError(f"Errore durante l'importazione di St7API: {e}")
 
+from bxs_async import AsyncEngineMixin
+from bxs_events import EventSourceMixin
+
 # ==============================================================================
 # COSTANTI STRAND7
 # ==============================================================================
@@ -52,7 +54,7 @@ def ChkErr(ErrorCode):
 # ==============================================================================
 # CLASSE PER ASSEGNAZIONE PROPRIETÀ PER ID
 # ==============================================================================
-class BeamPropertyByIDAssigner:
+class BeamPropertyByIDAssigner(EventSourceMixin, AsyncEngineMixin):
     """Assegna proprietà beam agli elementi in base al loro ID"""
     
     def __init__(self, 
@@ -79,15 +81,6 @@ class BeamPropertyByIDAssigner:
         self.property_map = {}  # {nome_proprietà: PropNum}
         self.beam_assignments = {}  # {beam_num: (beam_id, prop_num)}
     
-    def log(self, message: str):
-        """Invia messaggio al log con timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        if self.log_callback:
-            self.log_callback(formatted_message)
-        else:
-            print(formatted_message)
-    
     def validate_inputs(self) -> bool:
         """Valida il file di input"""
         if not os.path.exists(self.st7_file_path):
@@ -255,12 +248,19 @@ class BeamPropertyByIDAssigner:
         Returns:
             dict con statistiche
         """
+        result = self._run()
+        self._publish_summary(result)
+        return result
+    
+    def _run(self) -> dict:
+        """Corpo di run(): il riepilogo viene pubblicato all'uscita"""
         if self.is_running:
             self.log("⚠ Processo già in esecuzione!")
             return {"status": "already_running"}
         
         self.is_running = True
         self.should_stop = False
+        self._start_progress()
         
         stats = {
             "total_beams": 0,
@@ -312,6 +312,7 @@ class BeamPropertyByIDAssigner:
                 return {"status": "no_beams", **stats}
             
             # Scansiona e assegna
+            self.progress.total = total_beams
             for beam_num in range(1, total_beams + 1):
                 if self.should_stop:
                     stats["skipped"] = total_beams - beam_num + 1
@@ -319,6 +320,7 @@ class BeamPropertyByIDAssigner:
                     self.log(f"   Beam rimanenti: {stats['skipped']}")
                     break
                 
+                assigned = False
                 try:
                     # Ottieni ID beam
                     beam_id = self.get_beam_id(beam_num)
@@ -332,6 +334,7 @@ class BeamPropertyByIDAssigner:
                             self.log(f"  ✅ Beam #{beam_num} (ID:{beam_id}) → Proprietà {prop_num} ({self.property_prefix}{beam_id})")
                             stats["assigned"] += 1
                             self.beam_assignments[beam_num] = (beam_id, prop_num)
+                            assigned = True
                         else:
                             stats["failed"] += 1
                     else:
@@ -342,6 +345,7 @@ class BeamPropertyByIDAssigner:
                 except Exception as e:
                     self.log(f"  ❌ Errore beam #{beam_num}: {e}")
                     stats["failed"] += 1
+                self._item_done(f"Beam #{beam_num}", assigned)
             
             # Salva file
             self.log("\n" + "─"*60)
@@ -404,17 +408,20 @@ class BeamPropertyByIDAssigner:
 # ESEMPIO DI UTILIZZO
 # ==============================================================================
 if __name__ == "__main__":
-    # Configurazione
-    st7_file = r"C:\Users\rosso\Desktop\Code\inserire_proprietà.st7"
-    property_prefix = "sec_"
+    # Uso: python beam_property_id_assigner.py <file.st7> [prefisso]
+    # (per job pianificati con più motori vedere bxs_cli.py)
+    if len(sys.argv) not in (2, 3):
+        print("Uso: python beam_property_id_assigner.py <file.st7> [prefisso, default: sec_]")
+        sys.exit(2)
     
     # Crea assegnatore
     assigner = BeamPropertyByIDAssigner(
-        st7_file_path=st7_file,
-        property_prefix=property_prefix
+        st7_file_path=sys.argv[1],
+        property_prefix=sys.argv[2] if len(sys.argv) == 3 else "sec_"
     )
     
     # Esegui
     result = assigner.run()
     
     print(f"\nRisultato: {result}")
+    sys.exit(0 if result.get("status") == "success" else 1)
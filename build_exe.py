@@ -53,8 +53,28 @@ print("\n4. Verifica file richiesti...")
 required_files = [
     "bxs_generator_ui.py",
     "bxs_generator.py",
+    "bxs_cache.py",
+    "iges_analyzer.py",
+    "bxs_scheduler.py",
+    "bxs_stats.py",
+    "bxs_supervisor.py",
+    "bxs_journal.py",
+    "bxs_memory.py",
+    "bxs_manifest.py",
+    "bxs_work_queue.py",
+    "bxs_failures.py",
+    "bxs_prefetch.py",
+    "bxs_json_store.py",
+    "file_discovery.py",
+    "section_store.py",
+    "bxs_format.py",
+    "section_calculator.py",
+    "torsion_solver.py",
     "bxs_property_assigner.py",
     "beam_property_id_assigner.py",
+    "bxs_cli.py",
+    "bxs_async.py",
+    "bxs_events.py",
     "strand7_config.py",
     "St7API.py"
 ]
@@ -81,6 +101,7 @@ cmd = [
     "--windowed",                   # Senza console
     "--name=BXS_Manager",           # Nome dell'exe
     "--add-data", "St7API.py;.",    # Include St7API.py
+    "--hidden-import=St7API",       # Caricato con importlib da bxs_generator
     "--hidden-import=customtkinter", # Forza inclusione customtkinter
     "--collect-submodules", "customtkinter", # Include tutti i submoduli
     "bxs_generator_ui.py"           # File principale
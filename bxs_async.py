@@ -0,0 +1,185 @@
+"""
+BXS Async
+Facciata asyncio per i motori BXS (generatore e assegnatori di proprietà)
+
+run() dei motori è bloccante: qui viene eseguito su un executor dedicato e
+gli eventi del motore (bxs_events) diventano un iteratore asincrono. La
+cancellazione del task asyncio chiama stop() sul motore e attende la sua
+chiusura ordinata (file in corso completato, API Strand7 rilasciata), così
+un solo event loop può orchestrare più job.
+
+Per default i job di tutti i motori del processo condividono un executor con
+un solo thread (St7Init/St7Release e uID sono globali al processo): più
+start_async() avviati insieme vengono eseguiti uno dopo l'altro, non in
+parallelo. Il parallelismo di un job viene da workers/slots/isolate del
+generatore; un executor diverso può essere passato a start_async().
+
+    run = generator.start_async()
+    async for event in run:
+        if event.kind == "item_done":
+            print(event.done, event.total, event.eta)
+    result = await run
+
+oppure, senza eventi:
+
+    result = await assigner.run_async()
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+from bxs_events import ProgressEvent
+
+# ==============================================================================
+# EXECUTOR STRAND7
+# ==============================================================================
+_END_OF_EVENTS = object()
+_strand7_executor = None
+_executor_lock = threading.Lock()
+
+def get_strand7_executor() -> ThreadPoolExecutor:
+    """
+    Executor predefinito per il lavoro Strand7 (un solo thread)
+
+    St7Init/St7Release e gli uID dei modelli sono globali al processo: i job
+    avviati nello stesso processo vengono quindi eseguiti uno alla volta.
+    Per elaborare più file in parallelo usare workers/slots/isolate del
+    generatore, che distribuiscono il lavoro a processi o modelli separati.
+    """
+    global _strand7_executor
+    with _executor_lock:
+        if _strand7_executor is None:
+            _strand7_executor = ThreadPoolExecutor(max_workers=1,
+                                                   thread_name_prefix="bxs-strand7")
+        return _strand7_executor
+
+# ==============================================================================
+# CLASSE ESECUZIONE ASINCRONA
+# ==============================================================================
+class AsyncRun:
+    """Esecuzione in corso di run() di un motore: awaitable e iteratore asincrono di eventi"""
+
+    def __init__(self, engine, executor: Optional[Executor] = None):
+        """
+        Avvia run() del motore sull'executor (da chiamare dentro l'event loop)
+
+        Args:
+            engine: Motore con run(), stop() e subscribe()
+            executor: Executor su cui eseguire run() (default: get_strand7_executor())
+        """
+        self.engine = engine
+        self._loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+        self._finished = False
+        self._cancelled = False
+        self._events_ended = False  # END_OF_EVENTS già accodato
+        self._end_lock = threading.Lock()
+        engine.subscribe(self._post)
+        self._job = (executor or get_strand7_executor()).submit(self._run)
+        self._future = asyncio.wrap_future(self._job, loop=self._loop)
+
+    def _run(self) -> dict:
+        """Eseguito nel thread dell'executor"""
+        try:
+            if self._cancelled:
+                # Annullato mentre attendeva il proprio turno: run() azzererebbe stop()
+                return {"status": "cancelled"}
+            return self.engine.run()
+        finally:
+            self._end_events()
+
+    def _end_events(self):
+        """Chiude il flusso di eventi (una sola volta, anche con cancel() ripetuti)"""
+        with self._end_lock:
+            if self._events_ended:
+                return
+            self._events_ended = True
+        self.engine.unsubscribe(self._post)
+        self._post(_END_OF_EVENTS)
+
+    def _post(self, item):
+        """Accoda un evento dal thread del motore (o da uno slot)"""
+        try:
+            self._loop.call_soon_threadsafe(self._events.put_nowait, item)
+        except RuntimeError:
+            pass  # Event loop già chiuso
+
+    @property
+    def done(self) -> bool:
+        """True se run() è terminato"""
+        return self._future.done()
+
+    def cancel(self):
+        """
+        Chiede l'interruzione del motore
+
+        Un job ancora in coda sull'executor viene tolto dalla coda (attenderlo
+        solleva CancelledError); un job avviato riceve stop() e il risultato
+        arriva comunque da run().
+        """
+        self._cancelled = True
+        if self._job.cancel():
+            self._end_events()
+            return
+        self.engine.stop()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ProgressEvent:
+        if self._finished:
+            raise StopAsyncIteration
+        item = await self._events.get()
+        if item is _END_OF_EVENTS:
+            self._finished = True
+            raise StopAsyncIteration
+        return item
+
+    async def wait(self) -> dict:
+        """
+        Attende il risultato di run()
+
+        Se il task che attende viene cancellato, il motore riceve stop() e
+        la cancellazione si propaga solo dopo la sua chiusura ordinata.
+        """
+        try:
+            return await asyncio.shield(self._future)
+        except asyncio.CancelledError:
+            self.cancel()
+            await asyncio.wait({self._future})
+            raise
+
+    def __await__(self):
+        return self.wait().__await__()
+
+# ==============================================================================
+# MIXIN PER I MOTORI
+# ==============================================================================
+class AsyncEngineMixin:
+    """Aggiunge start_async() e run_async() a un motore con run()/stop()/subscribe()"""
+
+    def start_async(self, executor: Optional[Executor] = None) -> AsyncRun:
+        """
+        Avvia run() su un executor dedicato
+
+        Con l'executor predefinito (get_strand7_executor(), un solo thread
+        per processo) i job avviati insieme vengono eseguiti in serie: un
+        secondo start_async() attende la fine del primo.
+
+        Args:
+            executor: Executor su cui eseguire run() (default: quello Strand7 condiviso)
+
+        Returns:
+            AsyncRun da attendere (risultato di run()) e/o iterare (eventi)
+        """
+        return AsyncRun(self, executor)
+
+    async def run_async(self, executor: Optional[Executor] = None) -> dict:
+        """
+        Versione asincrona di run(): la cancellazione del task chiama stop()
+
+        Come start_async(), con l'executor predefinito i job dello stesso
+        processo vengono eseguiti uno alla volta.
+        """
+        return await self.start_async(executor)
@@ -0,0 +1,160 @@
+"""
+BXS Cache
+Cache content-addressed dei file BXS generati, indicizzata da hash IGES + parametri mesh
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+from typing import Optional
+
+from bxs_json_store import SharedJSONStore, read_json_dict, unique_tmp_path
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+CACHE_FOLDER_NAME = ".bxs_cache"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024**3  # 2 GB
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def hash_file(file_path: str) -> str:
+    """Calcola l'hash SHA-256 del contenuto di un file"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def make_cache_key(iges_hash: str, parameters: dict) -> str:
+    """
+    Combina l'hash del file IGES con i parametri di mesh/pulizia
+
+    Args:
+        iges_hash: Hash SHA-256 del contenuto IGES
+        parameters: Parametri che influenzano il BXS generato, compresa la
+                    versione di Strand7 (BXSGenerator.get_mesh_parameters)
+
+    Returns:
+        Chiave esadecimale della cache
+    """
+    payload = json.dumps(parameters, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(iges_hash.encode("ascii") + b"\0" + payload).hexdigest()
+
+# ==============================================================================
+# CLASSE CACHE BXS
+# ==============================================================================
+class BXSCache(SharedJSONStore):
+    """
+    Archivio BXS indicizzato per contenuto con manifest JSON ed eviction LRU
+
+    Il manifest viene unito a quello su disco a ogni salvataggio: istanze
+    distribuite che condividono la cache non perdono le voci delle altre, e
+    un blob rimosso da un'altra istanza viene trattato come assente.
+    """
+    json_indent = 1
+
+    def __init__(self, cache_folder: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        Inizializza la cache
+
+        Args:
+            cache_folder: Cartella della cache (contiene blob e manifest)
+            max_bytes: Dimensione massima complessiva dei blob in byte
+        """
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(cache_folder, MANIFEST_NAME)
+        os.makedirs(cache_folder, exist_ok=True)
+        super().__init__(self.manifest_path)
+
+    def _load(self) -> dict:
+        """Legge il manifest, scartando le voci senza blob su disco"""
+        entries = read_json_dict(self.manifest_path)
+        return {key: entry for key, entry in entries.items()
+                if os.path.exists(self._blob_path(key))}
+
+    def _blob_path(self, key: str) -> str:
+        """Percorso del blob BXS associato a una chiave"""
+        return os.path.join(self.cache_folder, f"{key}.bxs")
+
+    @property
+    def total_bytes(self) -> int:
+        """Dimensione complessiva dei blob in cache"""
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def restore(self, key: str, dest_path: str) -> bool:
+        """
+        Copia il BXS in cache nella destinazione richiesta
+
+        Args:
+            key: Chiave della cache
+            dest_path: Percorso del file BXS da scrivere
+
+        Returns:
+            True se la chiave era presente e il file è stato copiato
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            # Copia su nome temporaneo e rename atomico: nessun BXS parziale
+            # visibile e un eventuale hard link viene sostituito, non sovrascritto
+            tmp_path = unique_tmp_path(dest_path)
+            try:
+                shutil.copyfile(self._blob_path(key), tmp_path)
+                os.replace(tmp_path, dest_path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                self._pop(key)  # Blob mancante (es. rimosso da un'altra istanza)
+                return False
+            entry["last_used"] = time.time()
+            self._changed.add(key)
+            return True
+
+    def store(self, key: str, bxs_path: str, source_name: str):
+        """
+        Salva in cache un BXS appena generato ed applica il limite di dimensione
+
+        Args:
+            key: Chiave della cache
+            bxs_path: Percorso del file BXS generato
+            source_name: Nome del file IGES di origine (informativo)
+        """
+        with self._lock:
+            blob_path = self._blob_path(key)
+            tmp_path = unique_tmp_path(blob_path)
+            try:
+                shutil.copyfile(bxs_path, tmp_path)
+                os.replace(tmp_path, blob_path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._set(key, {
+                "source": source_name,
+                "size": os.path.getsize(bxs_path),
+                "last_used": time.time(),
+            })
+            self._evict()
+
+    def _evict(self):
+        """Rimuove le voci usate meno di recente fino a rientrare in max_bytes"""
+        total = sum(entry["size"] for entry in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._pop(key)["size"]
+            try:
+                os.remove(self._blob_path(key))
+            except OSError:
+                pass
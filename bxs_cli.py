@@ -0,0 +1,398 @@
+"""
+BXS CLI
+Esecuzione senza interfaccia grafica dei tre motori da un file di job JSON/TOML
+
+Non importa customtkinter/tkinter: i moduli dei motori vengono importati
+solo se il job li usa, così un job pianificato parte senza il costo di
+avvio della GUI. I log vanno su stderr (o su file), il risultato in JSON
+su stdout (o su file) e l'esito è riassunto nel codice di uscita.
+
+Formato del job (JSON, oppure le stesse chiavi in TOML con [[jobs]]):
+    {
+        "stop_on_failure": false,
+        "jobs": [
+            {"engine": "generator", "name": "sezioni",
+             "iges_folder": "IGES", "output_folder": "BXS", "scratch_folder": "tmp",
+             "workers": 4, "resume": true},
+            {"engine": "properties", "st7_file_path": "modello.st7", "bxs_folder": "BXS"},
+            {"engine": "beam_ids", "st7_file_path": "modello.st7", "property_prefix": "BXS_"}
+        ]
+    }
+Le altre chiavi di un job sono gli argomenti del costruttore del motore.
+I percorsi relativi sono risolti rispetto alla cartella del file di job.
+
+Uso:
+    python bxs_cli.py job.json [--output risultato.json] [--log-file log.txt] [--quiet]
+                               [--events eventi.jsonl]
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import importlib
+import inspect
+import threading
+from contextlib import contextmanager, redirect_stdout
+from typing import Callable, List, Optional, TextIO, Tuple
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from bxs_events import ProgressEvent
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+# Motori disponibili: nome nel job → (modulo, classe)
+ENGINES = {
+    "generator": ("bxs_generator", "BXSGenerator"),
+    "properties": ("bxs_property_assigner", "BXSPropertyAssigner"),
+    "beam_ids": ("beam_property_id_assigner", "BeamPropertyByIDAssigner"),
+}
+
+# Argomenti dei motori che contengono percorsi (risolti rispetto al file di job)
+PATH_OPTIONS = ("iges_folder", "output_folder", "scratch_folder", "timing_report",
+                "st7_file_path", "bxs_folder")
+
+# Chiavi del job che non sono argomenti del motore
+JOB_KEYS = ("engine", "name")
+
+# Codici di uscita (vale il più grave fra i job)
+EXIT_SUCCESS = 0     # Tutti i job completati con successo
+EXIT_PARTIAL = 1     # Almeno un job completato con errori o senza file
+EXIT_FAILED = 2      # Almeno un job fallito
+EXIT_INVALID = 3     # File di job non valido
+EXIT_INTERRUPTED = 130  # Interrotto da SIGINT/SIGTERM
+
+STATUS_EXIT_CODES = {
+    "success": EXIT_SUCCESS,
+    "partial_success": EXIT_PARTIAL,
+    "no_files": EXIT_PARTIAL,
+    "no_beams": EXIT_PARTIAL,
+}
+
+# ==============================================================================
+# ERRORI
+# ==============================================================================
+class JobSpecError(Exception):
+    """File di job non leggibile o non valido"""
+    pass
+
+# ==============================================================================
+# LETTURA E VALIDAZIONE DEL JOB
+# ==============================================================================
+def load_job_spec(spec_path: str) -> dict:
+    """
+    Legge un file di job JSON o TOML
+
+    Returns:
+        Dizionario con la chiave "jobs" (lista di job)
+
+    Raises:
+        JobSpecError: Se il file non è leggibile o non è valido
+    """
+    try:
+        if spec_path.lower().endswith(".toml"):
+            if tomllib is None:
+                raise JobSpecError("Lettura TOML non disponibile: installare tomli "
+                                   "(o usare Python 3.11+)")
+            with open(spec_path, "rb") as f:
+                spec = tomllib.load(f)
+        else:
+            with open(spec_path, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+    except OSError as e:
+        raise JobSpecError(f"File di job non leggibile: {e}")
+    except ValueError as e:  # json.JSONDecodeError e tomllib.TOMLDecodeError
+        raise JobSpecError(f"File di job non valido: {e}")
+
+    if isinstance(spec, list):
+        spec = {"jobs": spec}
+    elif isinstance(spec, dict) and "engine" in spec:
+        spec = {"jobs": [spec]}  # Un solo job al primo livello
+    if not isinstance(spec, dict) or not isinstance(spec.get("jobs"), list) or not spec["jobs"]:
+        raise JobSpecError("Il file di job deve contenere una lista 'jobs' non vuota")
+    return spec
+
+def get_engine_class(engine: str) -> type:
+    """Importa (solo ora) il modulo di un motore e ne restituisce la classe"""
+    module_name, class_name = ENGINES[engine]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def prepare_job(job: dict, index: int, base_dir: str) -> Tuple[str, str, dict]:
+    """
+    Valida un job e ne ricava gli argomenti del costruttore del motore
+
+    Args:
+        job: Job letto dal file
+        index: Posizione del job (per nome e messaggi)
+        base_dir: Cartella rispetto alla quale risolvere i percorsi relativi
+
+    Returns:
+        Tupla (nome job, motore, argomenti)
+
+    Raises:
+        JobSpecError: Se il motore o gli argomenti non sono validi
+    """
+    if not isinstance(job, dict):
+        raise JobSpecError(f"Job {index}: deve essere un oggetto")
+    engine = job.get("engine")
+    if engine not in ENGINES:
+        raise JobSpecError(f"Job {index}: motore '{engine}' non valido "
+                           f"(ammessi: {', '.join(ENGINES)})")
+    name = str(job.get("name") or f"{index}-{engine}")
+    options = {key: value for key, value in job.items() if key not in JOB_KEYS}
+
+    parameters = inspect.signature(get_engine_class(engine).__init__).parameters
+    unknown = sorted(key for key in options if key not in parameters or key == "log_callback")
+    if unknown:
+        raise JobSpecError(f"Job '{name}': argomenti non validi per {engine}: {', '.join(unknown)}")
+    missing = sorted(key for key, parameter in parameters.items()
+                     if key != "self" and parameter.default is inspect.Parameter.empty
+                     and key not in options)
+    if missing:
+        raise JobSpecError(f"Job '{name}': argomenti obbligatori mancanti: {', '.join(missing)}")
+
+    for key in PATH_OPTIONS:
+        if isinstance(options.get(key), str):
+            options[key] = os.path.join(base_dir, os.path.expanduser(options[key]))
+    return name, engine, options
+
+# ==============================================================================
+# ESECUZIONE
+# ==============================================================================
+def exit_code_for(status: Optional[str]) -> int:
+    """Codice di uscita corrispondente allo stato restituito da un motore"""
+    return STATUS_EXIT_CODES.get(status, EXIT_FAILED)
+
+class JobRunner:
+    """Esegue in sequenza i job di un file, con interruzione su SIGINT/SIGTERM"""
+
+    def __init__(self, jobs: List[Tuple[str, str, dict]],
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 stop_on_failure: bool = False,
+                 event_callback: Optional[Callable[[str, ProgressEvent], None]] = None):
+        """
+        Args:
+            jobs: Job validati (nome, motore, argomenti)
+            log_callback: Destinazione dei messaggi dei motori
+            stop_on_failure: Non avvia i job successivi a uno fallito
+            event_callback: Riceve (nome job, evento) per ogni evento dei motori
+        """
+        self.jobs = jobs
+        self.log_callback = log_callback
+        self.event_callback = event_callback
+        self.stop_on_failure = stop_on_failure
+        self.engine = None  # Motore in esecuzione
+        self.interrupted = False
+
+    def _on_signal(self, signum, frame):
+        """Prima richiesta: stop() del motore corrente; seconda: uscita immediata"""
+        if self.interrupted:
+            raise KeyboardInterrupt
+        self.interrupted = True
+        if self.engine is not None:
+            self.engine.stop()
+
+    def _install_signal_handlers(self) -> dict:
+        previous = {}
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                previous[signum] = signal.signal(signum, self._on_signal)
+        return previous
+
+    def run_job(self, name: str, engine: str, options: dict) -> dict:
+        """Esegue un job e ne restituisce il risultato"""
+        start = time.monotonic()
+        try:
+            self.engine = get_engine_class(engine)(log_callback=self.log_callback, **options)
+            if self.event_callback is not None:
+                self.engine.subscribe(lambda event: self.event_callback(name, event))
+            result = self.engine.run()
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        finally:
+            self.engine = None
+        status = result.get("status")
+        return {
+            "name": name,
+            "engine": engine,
+            "status": status,
+            "exit_code": exit_code_for(status),
+            "elapsed": round(time.monotonic() - start, 3),
+            "result": result,
+        }
+
+    def run(self) -> dict:
+        """
+        Esegue tutti i job
+
+        Returns:
+            Risultato complessivo {"status", "exit_code", "elapsed", "jobs"}
+        """
+        start = time.monotonic()
+        results = []
+        previous = self._install_signal_handlers()
+        try:
+            for name, engine, options in self.jobs:
+                if self.interrupted:
+                    results.append({"name": name, "engine": engine, "status": "not_run",
+                                    "exit_code": EXIT_INTERRUPTED, "elapsed": 0.0, "result": {}})
+                    continue
+                job_result = self.run_job(name, engine, options)
+                results.append(job_result)
+                if self.stop_on_failure and job_result["exit_code"] >= EXIT_FAILED:
+                    for name, engine, _ in self.jobs[len(results):]:
+                        results.append({"name": name, "engine": engine, "status": "not_run",
+                                        "exit_code": EXIT_FAILED, "elapsed": 0.0, "result": {}})
+                    break
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+        exit_code = max((job["exit_code"] for job in results), default=EXIT_SUCCESS)
+        if self.interrupted:
+            exit_code = EXIT_INTERRUPTED
+        return {
+            "status": "interrupted" if self.interrupted else
+                      ("success" if exit_code == EXIT_SUCCESS else
+                       "partial_success" if exit_code == EXIT_PARTIAL else "failed"),
+            "exit_code": exit_code,
+            "elapsed": round(time.monotonic() - start, 3),
+            "jobs": results,
+        }
+
+# ==============================================================================
+# INTERFACCIA A RIGA DI COMANDO
+# ==============================================================================
+def _make_log_callback(stream: Optional[TextIO]) -> Callable[[str], None]:
+    """Callback che scrive i messaggi dei motori su uno stream (None per scartarli)"""
+    def log(message: str):
+        if stream is not None:
+            stream.write(message + "\n")
+            stream.flush()
+    return log
+
+def _make_event_writer(stream: TextIO) -> Callable[[str, ProgressEvent], None]:
+    """Scrittore di eventi in JSON Lines (un oggetto per riga, con il nome del job)"""
+    lock = threading.Lock()  # Eventi pubblicati anche dai thread degli slot
+
+    def write(job_name: str, event: ProgressEvent):
+        line = json.dumps({"job": job_name, **event.to_dict()}, ensure_ascii=False, default=str)
+        with lock:
+            stream.write(line + "\n")
+            stream.flush()
+    return write
+
+@contextmanager
+def _redirect_stdout_fd(stream: TextIO):
+    """
+    Redirige su stream anche il descrittore 1 (non solo sys.stdout)
+
+    I processi worker del generatore (workers > 1, isolate) ereditano il
+    descrittore 1 e stampano all'import di strand7_config: senza questa
+    redirezione il loro testo finirebbe nel risultato JSON su stdout.
+    """
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    try:
+        stream.flush()
+        os.dup2(stream.fileno(), 1)
+        with redirect_stdout(stream):
+            yield
+    finally:
+        try:
+            sys.stdout.flush()
+            stream.flush()
+        finally:
+            os.dup2(saved_fd, 1)
+            os.close(saved_fd)
+
+def _write_result(result: dict, output_path: Optional[str]):
+    """Scrive il risultato JSON su file (in modo atomico) o su stdout"""
+    text = json.dumps(result, indent=2, ensure_ascii=False, default=str)
+    if output_path is None:
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+        return
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    os.replace(tmp_path, output_path)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto di ingresso: restituisce il codice di uscita"""
+    parser = argparse.ArgumentParser(
+        prog="bxs_cli",
+        description="Esegue i job BXS (generazione, proprietà, assegnazione per ID) "
+                    "da un file JSON/TOML senza interfaccia grafica")
+    parser.add_argument("job_file", help="File di job .json o .toml")
+    parser.add_argument("-o", "--output", help="File JSON del risultato (default: stdout)")
+    parser.add_argument("--log-file", help="Scrive i log su file invece che su stderr")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Nessun log")
+    parser.add_argument("--only", action="append", metavar="NOME",
+                        help="Esegue solo i job con questo nome (ripetibile)")
+    parser.add_argument("--stop-on-failure", action="store_true",
+                        help="Non avvia i job successivi a un job fallito")
+    parser.add_argument("--events", metavar="FILE",
+                        help="Scrive gli eventi di avanzamento (JSON Lines) su file")
+    args = parser.parse_args(argv)
+
+    if args.log_file:
+        log_stream = open(args.log_file, "a", encoding="utf-8")
+    elif not args.quiet:
+        log_stream = sys.stderr
+    else:
+        log_stream = None
+    console = log_stream or open(os.devnull, "w")
+    events_stream = open(args.events, "w", encoding="utf-8") if args.events else None
+
+    try:
+        # stdout resta riservato al risultato JSON (strand7_config stampa
+        # all'import, anche nei processi worker)
+        with _redirect_stdout_fd(console):
+            try:
+                spec = load_job_spec(args.job_file)
+                base_dir = os.path.dirname(os.path.abspath(args.job_file))
+                jobs = [prepare_job(job, index, base_dir)
+                        for index, job in enumerate(spec["jobs"], 1)]
+                if args.only:
+                    jobs = [job for job in jobs if job[0] in args.only]
+                    if not jobs:
+                        raise JobSpecError(f"Nessun job con nome: {', '.join(args.only)}")
+            except JobSpecError as e:
+                result = {"status": "invalid", "exit_code": EXIT_INVALID,
+                          "error": str(e), "jobs": []}
+            except (ImportError, OSError) as e:  # St7API o DLL Strand7 non disponibili
+                result = {"status": "error", "exit_code": EXIT_FAILED,
+                          "error": str(e), "jobs": []}
+            else:
+                runner = JobRunner(jobs, _make_log_callback(log_stream),
+                                   stop_on_failure=args.stop_on_failure or
+                                   bool(spec.get("stop_on_failure", False)),
+                                   event_callback=_make_event_writer(events_stream)
+                                   if events_stream is not None else None)
+                result = runner.run()
+    finally:
+        if console is not sys.stderr:
+            console.close()
+        if events_stream is not None:
+            events_stream.close()
+
+    if "error" in result and not args.quiet:
+        sys.stderr.write(f"❌ {result['error']}\n")
+    _write_result(result, args.output)
+    return result["exit_code"]
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # Worker del generatore nell'eseguibile
+    sys.exit(main())
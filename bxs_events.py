@@ -0,0 +1,294 @@
+"""
+BXS Events
+Eventi di avanzamento tipizzati dei motori BXS, con throughput ed ETA (EWMA)
+
+I motori pubblicano oggetti evento ai sottoscrittori (UI, CLI, metriche,
+facciata asincrona) invece di sole stringhe: chi li riceve non deve
+analizzare il testo dei log. Il testo con l'orario viene composto solo
+quando serve a una callback testuale o alla console (LogEvent.format),
+non a ogni messaggio.
+
+Eventi (attributo kind):
+    log             messaggio di log (testo senza orario)
+    file_started    inizio elaborazione di un elemento (file IGES o BXS)
+    stage_finished  fine di una fase di un elemento, con durata
+    item_done       elemento completato, con throughput ed ETA
+    summary         fine del processo, con stato e statistiche
+"""
+import time
+import threading
+from typing import Callable, Optional, Tuple
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+DEFAULT_EWMA_ALPHA = 0.2  # Peso dell'ultimo intervallo nella media mobile esponenziale
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def format_clock(timestamp: float) -> str:
+    """Orario HH:MM:SS di un istante (time.time())"""
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Durata leggibile (es. 1h 02m, 3m 05s, 12s)"""
+    if seconds is None:
+        return "n/d"
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+# ==============================================================================
+# CLASSI EVENTO
+# ==============================================================================
+class ProgressEvent:
+    """Evento di avanzamento con istante di creazione"""
+    kind = "event"
+    __slots__ = ("timestamp",)
+
+    def __init__(self):
+        self.timestamp = time.time()
+
+    def describe(self) -> str:
+        """Testo dell'evento senza orario"""
+        return self.kind
+
+    def format(self) -> str:
+        """Testo dell'evento con orario, come nei log"""
+        return f"[{format_clock(self.timestamp)}] {self.describe()}"
+
+    def to_dict(self) -> dict:
+        """Dizionario serializzabile in JSON"""
+        data = {"kind": self.kind}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                data[name] = getattr(self, name)
+        return data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.describe()!r})"
+
+class LogEvent(ProgressEvent):
+    """Messaggio di log"""
+    kind = "log"
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        super().__init__()
+        self.message = message
+
+    def describe(self) -> str:
+        return self.message
+
+class FileStartedEvent(ProgressEvent):
+    """Inizio dell'elaborazione di un elemento"""
+    kind = "file_started"
+    __slots__ = ("item",)
+
+    def __init__(self, item: str):
+        super().__init__()
+        self.item = item
+
+    def describe(self) -> str:
+        return f"▶ {self.item}"
+
+class StageFinishedEvent(ProgressEvent):
+    """Fine di una fase dell'elaborazione di un elemento"""
+    kind = "stage_finished"
+    __slots__ = ("item", "stage", "seconds")
+
+    def __init__(self, item: str, stage: str, seconds: float):
+        super().__init__()
+        self.item = item
+        self.stage = stage
+        self.seconds = seconds
+
+    def describe(self) -> str:
+        return f"⏱ {self.item}: {self.stage} {self.seconds:.2f}s"
+
+class ItemDoneEvent(ProgressEvent):
+    """Elemento completato, con avanzamento complessivo"""
+    kind = "item_done"
+    __slots__ = ("item", "success", "seconds", "error", "done", "total", "rate", "eta")
+
+    def __init__(self, item: str, success: bool, seconds: Optional[float],
+                 error: Optional[str], done: int, total: Optional[int],
+                 rate: Optional[float], eta: Optional[float]):
+        """
+        Args:
+            item: Elemento completato
+            success: Esito
+            seconds: Durata dell'elaborazione dell'elemento
+            error: Messaggio di errore (None se riuscito)
+            done: Elementi completati finora
+            total: Elementi previsti (None se non noto)
+            rate: Elementi al secondo dall'inizio
+            eta: Secondi stimati al completamento (None se non stimabile)
+        """
+        super().__init__()
+        self.item = item
+        self.success = success
+        self.seconds = seconds
+        self.error = error
+        self.done = done
+        self.total = total
+        self.rate = rate
+        self.eta = eta
+
+    def describe(self) -> str:
+        progress = f"{self.done}/{self.total}" if self.total else f"{self.done}"
+        rate = f", {self.rate:.2f}/s" if self.rate else ""
+        eta = f", ETA {format_duration(self.eta)}" if self.eta is not None else ""
+        return f"{'✅' if self.success else '❌'} {self.item} ({progress}{rate}{eta})"
+
+class SummaryEvent(ProgressEvent):
+    """Fine del processo"""
+    kind = "summary"
+    __slots__ = ("status", "stats", "elapsed", "items", "rate")
+
+    def __init__(self, status: Optional[str], stats: dict, elapsed: float,
+                 items: int, rate: Optional[float]):
+        super().__init__()
+        self.status = status
+        self.stats = stats
+        self.elapsed = elapsed
+        self.items = items
+        self.rate = rate
+
+    def describe(self) -> str:
+        rate = f", {self.rate:.2f}/s" if self.rate else ""
+        return f"🏁 {self.status}: {self.items} elementi in {format_duration(self.elapsed)}{rate}"
+
+# ==============================================================================
+# CLASSE THROUGHPUT
+# ==============================================================================
+class ThroughputTracker:
+    """Elementi al secondo ed ETA da una media mobile esponenziale degli intervalli"""
+
+    def __init__(self, total: Optional[int] = None, alpha: float = DEFAULT_EWMA_ALPHA):
+        """
+        Args:
+            total: Elementi previsti (None se non noto: nessuna ETA)
+            alpha: Peso dell'ultimo intervallo tra due completamenti
+        """
+        self.total = total
+        self.alpha = alpha
+        self.done = 0
+        self.start = self.last = time.monotonic()
+        self.interval = None  # Media mobile dei secondi tra due completamenti
+        self._lock = threading.Lock()
+
+    def add_total(self, count: int):
+        """Aggiorna gli elementi previsti quando il totale è scoperto durante l'esecuzione"""
+        with self._lock:
+            self.total = (self.total or 0) + count
+
+    def update(self, count: int = 1):
+        """Registra il completamento di count elementi (anche da thread diversi)"""
+        with self._lock:
+            now = time.monotonic()
+            interval = (now - self.last) / count
+            self.last = now
+            self.done += count
+            if self.interval is None:
+                self.interval = interval
+            else:
+                self.interval = self.alpha * interval + (1 - self.alpha) * self.interval
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def _rate(self) -> Optional[float]:
+        elapsed = self.elapsed
+        return self.done / elapsed if self.done and elapsed > 0 else None
+
+    def _eta(self) -> Optional[float]:
+        if self.total is None or self.interval is None:
+            return None
+        return max(0, self.total - self.done) * self.interval
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Elementi al secondo dall'inizio"""
+        with self._lock:
+            return self._rate()
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Secondi stimati per gli elementi restanti"""
+        with self._lock:
+            return self._eta()
+
+    def snapshot(self) -> Tuple[int, Optional[int], Optional[float], Optional[float]]:
+        """Tupla coerente (completati, totale, elementi al secondo, ETA)"""
+        with self._lock:
+            return self.done, self.total, self._rate(), self._eta()
+
+# ==============================================================================
+# MIXIN PER I MOTORI
+# ==============================================================================
+class EventSourceMixin:
+    """Sottoscrizione agli eventi di un motore e pubblicazione di avanzamento e riepilogo"""
+    subscribers = ()  # Sostituita da una lista alla prima sottoscrizione
+    progress = None   # ThroughputTracker dell'esecuzione in corso
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None]):
+        """
+        Registra una funzione che riceve ogni evento del motore
+
+        La funzione può essere chiamata da thread diversi (slot del
+        generatore) e deve restituire rapidamente.
+        """
+        if not isinstance(self.subscribers, list):
+            self.subscribers = []
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ProgressEvent], None]):
+        """Rimuove una funzione registrata con subscribe()"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def publish(self, event: ProgressEvent):
+        """Invia un evento a tutti i sottoscrittori"""
+        for callback in tuple(self.subscribers):
+            callback(event)
+
+    def _emit(self, event: LogEvent):
+        """Pubblica un messaggio e lo inoltra alla callback testuale o alla console"""
+        if self.subscribers:
+            self.publish(event)
+        if self.log_callback:
+            self.log_callback(event.format())
+        elif not self.subscribers:
+            print(event.format())
+
+    def log(self, message: str):
+        """Invia messaggio al log (l'orario è formattato solo per i consumatori testuali)"""
+        self._emit(LogEvent(message))
+
+    def _start_progress(self, total: Optional[int] = None):
+        """Azzera throughput ed ETA all'inizio di un'esecuzione"""
+        self.progress = ThroughputTracker(total)
+
+    def _item_done(self, item: str, success: bool, seconds: Optional[float] = None,
+                   error: Optional[str] = None):
+        """Aggiorna il throughput e pubblica il completamento di un elemento"""
+        progress = self.progress
+        if progress is None:
+            progress = self.progress = ThroughputTracker()
+        progress.update()
+        if self.subscribers:
+            self.publish(ItemDoneEvent(item, success, seconds, error, *progress.snapshot()))
+
+    def _publish_summary(self, result: dict):
+        """Pubblica il riepilogo finale di un'esecuzione"""
+        if self.subscribers and self.progress is not None and \
+                result.get("status") != "already_running":
+            stats = {key: value for key, value in result.items() if key != "status"}
+            self.publish(SummaryEvent(result.get("status"), stats, self.progress.elapsed,
+                                      self.progress.done, self.progress.rate))
@@ -0,0 +1,111 @@
+"""
+BXS Failures
+Cache negativa dei file IGES che falliscono in Strand7 e quarantena
+
+Un file che fallisce in una fase che dipende dal suo contenuto (import,
+mesh, generazione BXS) viene registrato con la chiave hash IGES + parametri
+di mesh, il codice di errore Strand7 e la fase. Alle esecuzioni successive
+viene saltato, o spostato nella cartella di quarantena, finché contenuto o
+parametri non cambiano. Gli errori delle fasi di apertura/salvataggio del
+modello dipendono dall'ambiente (licenza, disco) e non vengono registrati.
+"""
+import os
+import json
+import time
+import shutil
+from typing import Optional
+
+from bxs_json_store import SharedJSONStore
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+FAILURES_FILE_NAME = ".bxs_failures.json"
+QUARANTINE_FOLDER_NAME = ".bxs_quarantine"  # Nella cartella IGES (ignorata dalla ricerca)
+QUARANTINE_INFO_SUFFIX = ".error.json"
+
+# Fasi il cui fallimento dipende dal file IGES
+FILE_DEPENDENT_STAGES = ("import_iges", "surface_mesh", "clean_mesh", "generate_bxs")
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def is_file_dependent(record: dict) -> bool:
+    """True se il fallimento di un record è imputabile al file IGES"""
+    return not record["success"] and record.get("failed_stage") in FILE_DEPENDENT_STAGES
+
+def quarantine_file(iges_path: str, quarantine_folder: str, entry: dict) -> str:
+    """
+    Sposta un file IGES in quarantena affiancandogli la descrizione dell'errore
+
+    Args:
+        iges_path: Percorso del file IGES
+        quarantine_folder: Cartella di quarantena (creata se necessario)
+        entry: Voce della cache negativa del file
+
+    Returns:
+        Nuovo percorso del file
+    """
+    os.makedirs(quarantine_folder, exist_ok=True)
+    dest_path = os.path.join(quarantine_folder, os.path.basename(iges_path))
+    shutil.move(iges_path, dest_path)
+    with open(dest_path + QUARANTINE_INFO_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"source": iges_path, **entry}, f, indent=1)
+    return dest_path
+
+# ==============================================================================
+# CLASSE CACHE NEGATIVA
+# ==============================================================================
+class FailureCache(SharedJSONStore):
+    """
+    Fallimenti per file IGES, indicizzati per hash IGES + parametri di mesh
+
+    Il salvataggio unisce le voci al file su disco (istanze distribuite).
+    """
+    json_indent = 1
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Percorso del file JSON della cache negativa
+        """
+        super().__init__(db_path)
+        self.db_path = db_path
+
+    def get(self, key: Optional[str]) -> Optional[dict]:
+        """Voce registrata per una chiave (None se il file non è noto come fallito)"""
+        if key is None:
+            return None
+        return self.entries.get(key)
+
+    def record(self, key: str, record: dict) -> dict:
+        """
+        Registra il fallimento di un file
+
+        Args:
+            key: Chiave hash IGES + parametri
+            record: Record del file (errore, codice Strand7, fase)
+
+        Returns:
+            Voce aggiornata
+        """
+        now = time.time()
+        with self._lock:
+            previous = self.entries.get(key, {})
+            entry = {
+                "file": record["file"],
+                "error": record["error"],
+                "error_code": record.get("error_code"),
+                "stage": record.get("failed_stage"),
+                "seconds": record["total"],
+                "failures": previous.get("failures", 0) + 1,
+                "first": previous.get("first", now),
+                "last": now,
+            }
+            self._set(key, entry)
+        return entry
+
+    def forget(self, key: Optional[str]) -> bool:
+        """Rimuove un file dalla cache (es. dopo un nuovo tentativo riuscito)"""
+        with self._lock:
+            return self._pop(key) is not None
@@ -0,0 +1,339 @@
+"""
+BXS Format
+Lettura/scrittura in Python puro delle sezioni BXS in formato di scambio testuale
+
+Il file .bxs nativo di Strand7 è un formato proprietario non documentato e
+questo modulo NON lo legge: read_bxsx/iter_bxsx rifiutano i file .bxs con
+BXSFormatError. Il generatore (export_sections) affianca a ogni BXS un file
+.bxsx con i dati che Strand7 restituisce tramite API (proprietà prop_bxs,
+loop del contorno, numero di plate); questo modulo legge, scrive, valida e
+confronta i file .bxsx senza la DLL Strand7, anche come librerie di molte
+sezioni in un unico file.
+
+Formato (una riga per record, campi separati da spazi):
+    BXSX 2
+    SECTION <nome>
+    HEADER <chiave> <valore come stringa JSON>
+    PROP <nome proprietà> <valore>
+    (chiavi HEADER e nomi PROP senza spazi, nome della sezione su una riga)
+    PLATES <numero>
+    LOOP <numero punti>
+    <x> <y>                 (una riga per punto)
+    END
+"""
+import os
+import sys
+import json
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+SECTION_FILE_EXTENSION = ".bxsx"
+NATIVE_BXS_EXTENSION = ".bxs"  # Formato Strand7 non supportato
+FORMAT_MAGIC = "BXSX"
+FORMAT_VERSION = 2  # 2: valori HEADER come stringhe JSON (spazi e a capo conservati)
+FLOAT_FORMAT = "{:.17g}"
+
+# ==============================================================================
+# ECCEZIONI
+# ==============================================================================
+class BXSFormatError(ValueError):
+    """File di sezione non conforme al formato .bxsx"""
+
+    def __init__(self, path: str, line_number: int, message: str):
+        super().__init__(f"{os.path.basename(path)}:{line_number}: {message}")
+        self.path = path
+        self.line_number = line_number
+
+# ==============================================================================
+# CLASSE SEZIONE
+# ==============================================================================
+class BXSSection:
+    """Sezione BXS: dati di testata, proprietà, loop del contorno e numero di plate"""
+
+    def __init__(self, name: str,
+                 header: Optional[Dict[str, str]] = None,
+                 properties: Optional[Dict[str, float]] = None,
+                 loops: Optional[List[List[Tuple[float, float]]]] = None,
+                 plates: Optional[int] = None):
+        """
+        Args:
+            name: Nome della sezione (nome base del file BXS)
+            header: Dati descrittivi (es. file BXS, hash IGES, profilo di mesh)
+            properties: Proprietà di sezione {nome: valore}
+            loops: Contorni chiusi come liste di punti (x, y)
+            plates: Numero di elementi plate della mesh della sezione
+        """
+        self.name = name
+        self.header = header or {}
+        self.properties = properties or {}
+        self.loops = loops or []
+        self.plates = plates
+
+    @staticmethod
+    def loop_area(loop: List[Tuple[float, float]]) -> float:
+        """Area con segno di un loop (positiva se antiorario)"""
+        area = 0.0
+        for (x1, y1), (x2, y2) in zip(loop, loop[1:] + loop[:1]):
+            area += x1 * y2 - x2 * y1
+        return 0.5 * area
+
+    @property
+    def bounding_box(self) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """Bounding box ((xmin, ymin), (xmax, ymax)) di tutti i loop"""
+        points = [point for loop in self.loops for point in loop]
+        if not points:
+            return None
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return (min(xs), min(ys)), (max(xs), max(ys))
+
+    def validate(self) -> List[str]:
+        """
+        Controlla la coerenza geometrica della sezione
+
+        Returns:
+            Lista di errori (vuota se la sezione è valida)
+        """
+        errors = []
+        if not self.loops:
+            errors.append("Nessun loop di contorno")
+        for index, loop in enumerate(self.loops, 1):
+            if len(loop) < 3:
+                errors.append(f"Loop {index}: solo {len(loop)} punti")
+                continue
+            if any(not (math.isfinite(x) and math.isfinite(y)) for x, y in loop):
+                errors.append(f"Loop {index}: coordinate non finite")
+                continue
+            if self.loop_area(loop) == 0.0:
+                errors.append(f"Loop {index}: area nulla")
+        for name, value in self.properties.items():
+            if not math.isfinite(value):
+                errors.append(f"Proprietà {name} non finita")
+        area = self.properties.get("area")
+        if area is not None and area <= 0:
+            errors.append(f"Area non positiva ({area:g})")
+        return errors
+
+    def to_dict(self) -> dict:
+        """Rappresentazione serializzabile (es. JSON)"""
+        return {
+            "name": self.name,
+            "header": dict(self.header),
+            "properties": dict(self.properties),
+            "loops": [[list(point) for point in loop] for loop in self.loops],
+            "plates": self.plates,
+        }
+
+# ==============================================================================
+# LETTURA
+# ==============================================================================
+def iter_bxsx(path: str) -> Iterator[BXSSection]:
+    """
+    Legge in streaming le sezioni di un file .bxsx (anche una libreria)
+
+    Il file viene letto riga per riga: in memoria c'è una sola sezione
+    alla volta, indipendentemente dalla dimensione della libreria.
+
+    Args:
+        path: Percorso del file .bxsx (non un .bxs nativo di Strand7)
+
+    Yields:
+        BXSSection nell'ordine del file
+
+    Raises:
+        BXSFormatError: se il file non rispetta il formato o è un .bxs nativo
+    """
+    if path.lower().endswith(NATIVE_BXS_EXTENSION):
+        raise BXSFormatError(path, 1, "il formato .bxs nativo di Strand7 non è supportato "
+                                      f"(usare il file {SECTION_FILE_EXTENSION} esportato)")
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            first = f.readline().split()
+        except UnicodeDecodeError:
+            first = []
+        if len(first) != 2 or first[0] != FORMAT_MAGIC or not first[1].isdigit():
+            raise BXSFormatError(path, 1, "intestazione BXSX mancante")
+        version = int(first[1])
+        if version > FORMAT_VERSION:
+            raise BXSFormatError(path, 1, f"versione {first[1]} non supportata")
+
+        section = None
+        loop = None
+        points_left = 0
+        line_number = 1
+        for line_number, line in enumerate(f, 2):
+            fields = line.split()
+            if not fields:
+                continue
+            try:
+                if points_left:
+                    loop.append((float(fields[0]), float(fields[1])))
+                    points_left -= 1
+                    continue
+                keyword = fields[0]
+                if keyword == "SECTION":
+                    if section is not None:
+                        raise BXSFormatError(path, line_number, "END mancante")
+                    section = BXSSection(line.strip()[len("SECTION"):].strip())
+                elif section is None:
+                    raise BXSFormatError(path, line_number, f"{keyword} fuori da una sezione")
+                elif keyword == "HEADER":
+                    if version >= 2:
+                        section.header[fields[1]] = json.loads(line.split(None, 2)[2])
+                    else:
+                        section.header[fields[1]] = " ".join(fields[2:])
+                elif keyword == "PROP":
+                    section.properties[fields[1]] = float(fields[2])
+                elif keyword == "PLATES":
+                    section.plates = int(fields[1])
+                elif keyword == "LOOP":
+                    loop = []
+                    points_left = int(fields[1])
+                    section.loops.append(loop)
+                elif keyword == "END":
+                    yield section
+                    section = None
+                else:
+                    raise BXSFormatError(path, line_number, f"record sconosciuto '{keyword}'")
+            except BXSFormatError:
+                raise
+            except (IndexError, ValueError):
+                raise BXSFormatError(path, line_number, f"record non valido: {line.strip()}")
+
+        if section is not None:
+            raise BXSFormatError(path, line_number, "file troncato")
+
+def read_bxsx(path: str) -> BXSSection:
+    """Legge la prima sezione di un file .bxsx"""
+    for section in iter_bxsx(path):
+        return section
+    raise BXSFormatError(path, 1, "nessuna sezione nel file")
+
+# ==============================================================================
+# SCRITTURA
+# ==============================================================================
+def _check_token(kind: str, value: str):
+    """Rifiuta chiavi e nomi che il lettore non saprebbe separare dal valore"""
+    if not value or any(c.isspace() for c in value):
+        raise ValueError(f"{kind} {value!r}: non sono ammessi valori vuoti o spazi")
+
+def _format_section(section: BXSSection) -> Iterator[str]:
+    """
+    Righe di testo di una sezione
+
+    Raises:
+        ValueError: chiave HEADER o nome PROP vuoti o con spazi, nome della
+                    sezione su più righe
+    """
+    if "\n" in section.name or "\r" in section.name:
+        raise ValueError(f"Nome della sezione su più righe: {section.name!r}")
+    for key in section.header:
+        _check_token("Chiave HEADER", key)
+    for name in section.properties:
+        _check_token("Nome PROP", name)
+    yield f"SECTION {section.name}\n"
+    for key, value in section.header.items():
+        yield f"HEADER {key} {json.dumps(str(value), ensure_ascii=False)}\n"
+    for name, value in section.properties.items():
+        yield f"PROP {name} {FLOAT_FORMAT.format(value)}\n"
+    if section.plates is not None:
+        yield f"PLATES {section.plates}\n"
+    for loop in section.loops:
+        yield f"LOOP {len(loop)}\n"
+        for x, y in loop:
+            yield f"{FLOAT_FORMAT.format(x)} {FLOAT_FORMAT.format(y)}\n"
+    yield "END\n"
+
+def write_bxsx(path: str, sections) -> int:
+    """
+    Scrive una o più sezioni in un file .bxsx in modo atomico
+
+    Args:
+        path: Percorso del file di destinazione
+        sections: Iterabile di BXSSection (anche un generatore)
+
+    Returns:
+        Numero di sezioni scritte
+
+    Raises:
+        ValueError: sezione non rappresentabile (chiave HEADER o nome PROP
+                    con spazi); il file di destinazione resta invariato
+    """
+    tmp_path = path + ".tmp"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{FORMAT_MAGIC} {FORMAT_VERSION}\n")
+            for section in sections:
+                f.writelines(_format_section(section))
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Errore (anche dal generatore di sezioni): nessun file temporaneo residuo
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+# ==============================================================================
+# CONFRONTO
+# ==============================================================================
+def diff_sections(a: BXSSection, b: BXSSection, rel_tol: float = 1e-6) -> List[str]:
+    """
+    Confronta due sezioni e ne elenca le differenze
+
+    Args:
+        a, b: Sezioni da confrontare
+        rel_tol: Tolleranza relativa sui valori numerici
+
+    Returns:
+        Lista di differenze (vuota se equivalenti)
+    """
+    differences = []
+    for name in sorted(set(a.properties) | set(b.properties)):
+        va, vb = a.properties.get(name), b.properties.get(name)
+        if va is None or vb is None:
+            differences.append(f"Proprietà {name}: presente solo in una sezione")
+        elif not math.isclose(va, vb, rel_tol=rel_tol, abs_tol=1e-12):
+            differences.append(f"Proprietà {name}: {va:.6g} ≠ {vb:.6g}")
+    if a.plates != b.plates:
+        differences.append(f"Plate: {a.plates} ≠ {b.plates}")
+    if len(a.loops) != len(b.loops):
+        differences.append(f"Loop: {len(a.loops)} ≠ {len(b.loops)}")
+    else:
+        scale = max((abs(c) for loop in a.loops for point in loop for c in point), default=1.0)
+        for index, (loop_a, loop_b) in enumerate(zip(a.loops, b.loops), 1):
+            if len(loop_a) != len(loop_b):
+                differences.append(f"Loop {index}: {len(loop_a)} ≠ {len(loop_b)} punti")
+            elif any(math.hypot(xa - xb, ya - yb) > rel_tol * scale
+                     for (xa, ya), (xb, yb) in zip(loop_a, loop_b)):
+                differences.append(f"Loop {index}: coordinate diverse")
+    return differences
+
+
+# ==============================================================================
+# ESEMPIO DI UTILIZZO
+# ==============================================================================
+if __name__ == "__main__":
+    from file_discovery import iter_files
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    n_valid = n_invalid = 0
+    for section_path in iter_files(folder, (SECTION_FILE_EXTENSION,), recursive=True, sort=True):
+        try:
+            for section in iter_bxsx(section_path):
+                errors = section.validate()
+                if errors:
+                    n_invalid += 1
+                    print(f"❌ {section.name}: {'; '.join(errors)}")
+                else:
+                    n_valid += 1
+        except (OSError, BXSFormatError) as e:
+            n_invalid += 1
+            print(f"❌ {e}")
+    print(f"Sezioni valide: {n_valid}, non valide: {n_invalid}")
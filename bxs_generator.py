@@ -5,46 +5,268 @@ Gestisce la logica di generazione file BXS da IGES usando Strand7 API
 import os
 import sys
 import ctypes
-import glob
-from typing import Callable, Optional
-from datetime import datetime
+import json
+import math
+import time
+import queue
+import socket
+import sqlite3
+import importlib
+import threading
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.connection import wait as wait_connections
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, List, Tuple
 
 # ==============================================================================
 # CONFIGURAZIONE STRAND7 API
 # ==============================================================================
-from strand7_config import STRAND7_DLL_PATH
+DEFAULT_API_MODULE = "St7API"
+St7API = None  # Modulo dell'API in uso, caricato da load_st7_api() alla prima elaborazione
 
-dll_dir = os.path.dirname(STRAND7_DLL_PATH)
+def load_st7_api(module_name: str = DEFAULT_API_MODULE):
+    """
+    Carica il modulo dell'API Strand7 (una sola volta per processo)
+    
+    Per "St7API" la DLL viene cercata da strand7_config e la sua cartella
+    aggiunta al PATH. Un altro nome carica un backend con la stessa
+    interfaccia, ad esempio "st7api_sim" per eseguire la pipeline su Linux
+    senza Strand7.
+    
+    Args:
+        module_name: Nome del modulo dell'API
+        
+    Returns:
+        Modulo caricato
+        
+    Raises:
+        ImportError: se il modulo o la DLL Strand7 non sono disponibili
+    """
+    global St7API
+    if St7API is not None and St7API.__name__ == module_name:
+        return St7API
+    if module_name == DEFAULT_API_MODULE:
+        try:
+            from strand7_config import STRAND7_DLL_PATH
+        except FileNotFoundError as e:
+            raise ImportError(str(e))
+        dll_dir = os.path.dirname(STRAND7_DLL_PATH)
+        
+        # Configura PATH
+        if dll_dir not in os.environ['PATH'].split(os.pathsep):
+            os.environ['PATH'] = dll_dir + os.pathsep + os.environ['PATH']
+        if hasattr(os, 'add_dll_directory'):
+            os.add_dll_directory(dll_dir)
+        
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            raise ImportError(f"Errore durante l'importazione di St7API: {e}")
+    else:
+        module = importlib.import_module(module_name)
+    St7API = module
+    return module
+
+def get_st7_api_version(module_name: str = DEFAULT_API_MODULE) -> Optional[str]:
+    """
+    Versione dell'API Strand7 (St7APIVersion, non richiede St7Init)
+    
+    Args:
+        module_name: Nome del modulo dell'API
+        
+    Returns:
+        Versione "major.minor.point", None se l'API non è disponibile
+    """
+    major, minor, point = ctypes.c_long(), ctypes.c_long(), ctypes.c_long()
+    try:
+        api = load_st7_api(module_name)
+        if api.St7APIVersion(ctypes.byref(major), ctypes.byref(minor), ctypes.byref(point)) != 0:
+            return None
+    except (ImportError, OSError, AttributeError):
+        return None
+    return f"{major.value}.{minor.value}.{point.value}"
 
-# Configura PATH
-os.environ['PATH'] = dll_dir + os.pathsep + os.environ['PATH']
-if hasattr(os, 'add_dll_directory'):
-    os.add_dll_directory(dll_dir)
+from bxs_cache import BXSCache, CACHE_FOLDER_NAME, DEFAULT_CACHE_MAX_BYTES, hash_file, make_cache_key
+from iges_analyzer import analyze_iges
+from file_discovery import iter_files, IGES_EXTENSIONS
+from section_store import SectionStore, SECTION_STORE_NAME, BXS_PROPERTY_NAMES
+from section_calculator import NUMPY_AVAILABLE, section_properties, check_properties
+from bxs_format import BXSSection, BXSFormatError, SECTION_FILE_EXTENSION, read_bxsx, write_bxsx
+from bxs_memory import (MemoryMonitor, DEFAULT_RECYCLE_RSS_BYTES, get_rss_bytes, format_bytes,
+                        is_process_alive)
+from bxs_manifest import PublicationManifest, PARTIAL_FOLDER_NAME, TEMP_SUFFIX, publish_copy
+from bxs_work_queue import LeaseQueue, QUEUE_FOLDER_NAME, DEFAULT_LEASE_TTL
+from bxs_prefetch import (IGESPrefetcher, PREFETCH_FOLDER_NAME, PREFETCH_MODES,
+                          DEFAULT_PREFETCH_DEPTH, DEFAULT_PREFETCH_MAX_BYTES)
+from bxs_failures import (FailureCache, FAILURES_FILE_NAME, QUARANTINE_FOLDER_NAME,
+                          is_file_dependent, quarantine_file)
+from bxs_journal import RunJournal, JOURNAL_NAME, STATUS_DONE, STATUS_CACHED, STATUS_FAILED
+from bxs_supervisor import SupervisedWorker, DEFAULT_STAGE_TIMEOUT, KILL_TIMEOUT
+from bxs_async import AsyncEngineMixin
+from bxs_events import EventSourceMixin, LogEvent, FileStartedEvent, StageFinishedEvent
+from bxs_stats import new_file_record, format_summary, write_records
+from bxs_scheduler import (TimingDatabase, TIMINGS_FILE_NAME, estimate_durations,
+                           estimate_makespan, order_longest_first)
 
-# Importa St7API
-try:
-    import St7API
-except Exception as e:
-    raise ImportError(f"Errore durante l'importazione di St7API: {e}")
+# ==============================================================================
+# PARAMETRI IMPORT / MESH / PULIZIA
+# ==============================================================================
+IGES_IMPORT_OPTIONS = (0, 0, 1, 1, 0, 2)
+IGES_IMPORT_DOUBLES = (0.0,)
+SURFACE_MESH_SELECT = (1, 0, 4, -1, 1, 12, 1, 1, 1)
+SURFACE_MESH_SIZE = (0.5, 0.1, 30.0, 0.0)
+CLEAN_MESH_OPTIONS = (0, 1, 1, 1, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0)
+CLEAN_MESH_TOLERANCE = 0.0001
+
+# Profili di mesh: parametri dimensionali di St7SurfaceMesh (dimensione in %)
+MESH_PROFILES = {
+    "fast": (2.0, 0.1, 30.0, 0.0),
+    "balanced": SURFACE_MESH_SIZE,
+    "accurate": (0.2, 0.1, 30.0, 0.0),
+}
+ADAPTIVE_MESH_PROFILE = "adaptive"
+DEFAULT_TARGET_ELEMENTS = 2000
+
+# ==============================================================================
+# CARTELLA SCRATCH
+# ==============================================================================
+SCRATCH_WORKER_PREFIX = "worker_"
+SCRATCH_TEMP_PREFIX = "temp_"
+SCRATCH_OWNED_DIR_PREFIXES = (SCRATCH_WORKER_PREFIX, PREFETCH_FOLDER_NAME + "_")
+SCRATCH_PURGE_INTERVAL = 60.0  # Secondi tra due controlli della quota durante l'esecuzione
+DEFAULT_SCRATCH_QUOTA_BYTES = 1024**3  # 1 GB
+
+# ==============================================================================
+# DEDUPLICAZIONE GEOMETRICA
+# ==============================================================================
+DEDUPE_REPORT_NAME = ".bxs_dedupe.json"
+
+# ==============================================================================
+# ESPORTAZIONE SEZIONI (.bxsx)
+# ==============================================================================
+# Proprietà beam temporanea usata per rileggere i loop del BXS nel modello scratch
+BXS_EXPORT_PROPERTY = 9999
 
 # ==============================================================================
 # FUNZIONI DI SUPPORTO
 # ==============================================================================
+class Strand7Error(Exception):
+    """Errore restituito da una funzione dell'API Strand7 (con il codice numerico)"""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(f"Errore Strand7 ({code}): {message}")
+        self.code = code
+
 def ChkErr(ErrorCode):
     """Verifica errori API Strand7"""
     if ErrorCode != 0:
         err_buffer = ctypes.create_string_buffer(255)
         St7API.St7GetAPIErrorString(ErrorCode, err_buffer, 255)
-        raise Exception(f"Errore Strand7 ({ErrorCode}): {err_buffer.value.decode('ascii')}")
+        raise Strand7Error(ErrorCode, err_buffer.value.decode('ascii'))
+
+# ==============================================================================
+# WORKER PER ELABORAZIONE PARALLELA
+# ==============================================================================
+_worker_files = 0  # File elaborati dall'ultima inizializzazione API del worker
+
+def _init_pool_worker(api_module: str = DEFAULT_API_MODULE):
+    """Inizializza l'API Strand7 nel processo worker (rilasciata all'uscita)"""
+    load_st7_api(api_module)
+    ChkErr(St7API.St7Init())
+    multiprocessing.util.Finalize(None, St7API.St7Release, exitpriority=10)
+
+def _process_file_in_worker(config: dict, iges_path: str) -> Tuple[dict, list]:
+    """
+    Elabora un singolo file IGES all'interno di un processo worker
+    
+    Args:
+        config: Parametri di costruzione del BXSGenerator
+        iges_path: Percorso completo del file IGES
+        
+    Returns:
+        Tupla (record del file, eventi di log e di fase da ripubblicare)
+    """
+    global _worker_files
+    events = []
+    generator = BXSGenerator(**config)
+    generator.subscribe(events.append)
+    record = generator.process_file(iges_path)
+    _worker_files += 1
+    reason = generator._recycle_reason(_worker_files, record["rss"])
+    if reason is not None:
+        generator.log(f"♻ Reinizializzazione API Strand7 nel worker {os.getpid()} ({reason})")
+        ChkErr(St7API.St7Release())
+        ChkErr(St7API.St7Init())
+        _worker_files = 0
+    return record, events
+
+def _supervised_worker_main(config: dict, conn):
+    """
+    Ciclo del processo worker isolato: elabora i file ricevuti dalla pipe
+    
+    Eventi (log, fasi) e inizio di ogni fase vengono inoltrati subito al
+    supervisore, che può così terminare il processo se una fase resta
+    bloccata nella DLL.
+    
+    Args:
+        config: Parametri di costruzione del BXSGenerator
+        conn: Estremità figlia della pipe verso il supervisore
+    """
+    generator = BXSGenerator(**config)
+    generator.subscribe(lambda event: conn.send(("event", event)))
+    generator.stage_callback = lambda stage: conn.send(("stage", stage))
+    load_st7_api(generator.api_module)
+    ChkErr(St7API.St7Init())
+    try:
+        while True:
+            iges_path = conn.recv()
+            if iges_path is None:
+                break
+            conn.send(("done", generator.process_file(iges_path)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        St7API.St7Release()
 
 # ==============================================================================
 # CLASSE PRINCIPALE PER GENERAZIONE BXS
 # ==============================================================================
-class BXSGenerator:
+class BXSGenerator(EventSourceMixin, AsyncEngineMixin):
     """Gestisce la generazione di file BXS da IGES usando Strand7 API"""
     
     def __init__(self, iges_folder: str, output_folder: str, scratch_folder: str, 
-                 log_callback: Optional[Callable[[str], None]] = None):
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 workers: int = 1,
+                 slots: int = 1,
+                 use_cache: bool = True,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 ephemeral_scratch: bool = False,
+                 scratch_quota_bytes: int = DEFAULT_SCRATCH_QUOTA_BYTES,
+                 mesh_profile: str = "balanced",
+                 target_elements: int = DEFAULT_TARGET_ELEMENTS,
+                 preflight: bool = True,
+                 timing_report: Optional[str] = None,
+                 deduplicate: bool = False,
+                 recursive: bool = False,
+                 include_patterns: Optional[List[str]] = None,
+                 exclude_patterns: Optional[List[str]] = None,
+                 export_sections: bool = False,
+                 isolate: bool = False,
+                 stage_timeout: Optional[float] = DEFAULT_STAGE_TIMEOUT,
+                 file_timeout: Optional[float] = None,
+                 resume: bool = False,
+                 recycle_files: Optional[int] = None,
+                 recycle_rss_bytes: Optional[int] = DEFAULT_RECYCLE_RSS_BYTES,
+                 distributed: bool = False,
+                 lease_ttl: float = DEFAULT_LEASE_TTL,
+                 failure_cache: bool = True,
+                 retry_failed: bool = False,
+                 quarantine: bool = False,
+                 prefetch: Optional[str] = None,
+                 prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+                 prefetch_max_bytes: int = DEFAULT_PREFETCH_MAX_BYTES,
+                 api_module: str = DEFAULT_API_MODULE):
         """
         Inizializza il generatore BXS
         
@@ -53,22 +275,138 @@ class BXSGenerator:
             output_folder: Cartella di output per i file BXS
             scratch_folder: Cartella temporanea di lavoro
             log_callback: Funzione callback per i log (opzionale)
+            workers: Numero di processi worker paralleli (default: 1, seriale)
+            slots: Numero di modelli Strand7 (uID) elaborati in parallelo da
+                   thread nello stesso processo (default: 1)
+            use_cache: Riutilizza i BXS già generati per IGES e parametri identici
+            cache_max_bytes: Dimensione massima della cache BXS (eviction LRU)
+            ephemeral_scratch: Chiude i modelli senza salvare il .st7 temporaneo e
+                               usa una sottocartella scratch per ogni worker/slot
+            scratch_quota_bytes: Spazio massimo dei file temporanei lasciati nella
+                                 cartella scratch (i più vecchi vengono eliminati)
+            mesh_profile: Profilo di mesh ("fast", "balanced", "accurate" o
+                          "adaptive" per dimensionare la mesh sul bounding box)
+            target_elements: Numero di elementi plate obiettivo in modalità adattiva
+            preflight: Analizza i file IGES in Python e scarta quelli corrotti
+                       prima di aprire una sessione Strand7
+            timing_report: Percorso .json o .csv in cui esportare i tempi per
+                           fase di ogni file (opzionale)
+            deduplicate: Elabora una sola volta le sezioni con geometria identica
+                         (a meno di traslazioni/rotazioni nel piano) e copia il
+                         BXS sugli altri file
+            recursive: Cerca i file IGES anche nelle sottocartelle
+            include_patterns: Pattern glob dei file IGES da elaborare (es. ["HEA*"])
+            exclude_patterns: Pattern glob di file o sottocartelle da ignorare
+            export_sections: Affianca a ogni BXS un file .bxsx (loop, proprietà,
+                             plate) leggibile senza Strand7 da bxs_format.py
+            isolate: Elabora i file in processi figli sorvegliati: un worker
+                     bloccato o terminato dalla DLL viene sostituito e il file
+                     segnato come fallito (workers processi, almeno uno)
+            stage_timeout: Secondi massimi per una fase in modalità isolata
+                           (None per nessun limite)
+            file_timeout: Secondi massimi per un intero file in modalità isolata
+            resume: Salta i file già completati in un'esecuzione precedente con
+                    lo stesso contenuto IGES e gli stessi parametri (diario
+                    .bxs_journal.log nella cartella di output)
+            recycle_files: Reinizializza l'API Strand7 (o sostituisce il processo
+                           worker) ogni N file, per contenere le perdite di
+                           memoria della DLL (None: nessun limite)
+            recycle_rss_bytes: Reinizializza l'API (o sostituisce il worker) quando
+                               la memoria residente supera questa soglia (None:
+                               nessun limite). I due limiti non si applicano
+                               in modalità slot, dove l'API è condivisa
+            distributed: Condivide i file IGES con altre istanze (processi o
+                         macchine) che usano la stessa cartella di output, tramite
+                         la coda con lease in <output>/.bxs_queue
+            lease_ttl: Secondi di validità di una lease senza heartbeat; le lease
+                       scadute di istanze terminate vengono reclamate
+            failure_cache: Registra i file falliti in import/mesh/generazione
+                           (.bxs_failures.json nella cartella di output) e li
+                           salta finché contenuto IGES o parametri non cambiano
+            retry_failed: Elabora comunque i file registrati come falliti (un
+                          successo li rimuove dalla cache negativa)
+            quarantine: Sposta i file registrati come falliti in
+                        <cartella IGES>/.bxs_quarantine, con la descrizione
+                        dell'errore, invece di lasciarli nella cartella
+            prefetch: Anticipa la lettura dei prossimi file IGES mentre Strand7
+                      elabora quello corrente: "copy" li copia nella cartella
+                      scratch e l'import legge la copia locale, "warm" li legge
+                      soltanto (cache del sistema operativo). None: disattivato.
+                      Usato nell'elaborazione seriale e con gli slot
+            prefetch_depth: Numero di file anticipati oltre a quelli in uso
+            prefetch_max_bytes: Byte massimi dei file anticipati o in uso
+            api_module: Modulo dell'API Strand7, caricato alla prima
+                        elaborazione anche nei processi worker ("st7api_sim"
+                        per il backend simulato)
         """
         self.iges_folder = iges_folder
         self.output_folder = output_folder
         self.scratch_folder = scratch_folder
         self.log_callback = log_callback
+        self.workers = max(1, int(workers))
+        self.slots = max(1, int(slots))
+        self.use_cache = use_cache
+        self.cache_max_bytes = cache_max_bytes
+        self.cache = None
+        self._cache_keys = {}  # {percorso IGES: chiave cache}
+        self.ephemeral_scratch = ephemeral_scratch
+        self.scratch_quota_bytes = scratch_quota_bytes
+        
+        if mesh_profile != ADAPTIVE_MESH_PROFILE and mesh_profile not in MESH_PROFILES:
+            raise ValueError(f"Profilo di mesh sconosciuto: {mesh_profile}")
+        self.mesh_profile = mesh_profile
+        self.target_elements = max(1, int(target_elements))
+        
+        self.preflight = preflight
+        self.preflight_reports = {}  # {percorso IGES: IGESReport}
+        self.timings = None
+        self._iges_hashes = {}  # {percorso IGES: hash contenuto}
+        self.timing_report = timing_report
+        self.file_records = []  # Record per file dell'ultima esecuzione
+        self.deduplicate = deduplicate
+        self._duplicates = {}  # {percorso rappresentante: [percorsi duplicati]}
+        self.dedupe_records = []  # Esito dei duplicati dell'ultima esecuzione
+        self.recursive = recursive
+        self.include_patterns = include_patterns
+        self.exclude_patterns = exclude_patterns
+        self.section_store = None  # Archivio delle proprietà di sezione (SQLite)
+        self.export_sections = export_sections
+        self.isolate = isolate
+        self.stage_timeout = stage_timeout
+        self.file_timeout = file_timeout
+        self.stage_callback = None  # Notificata all'inizio di ogni fase di process_file
+        self.publish_check = None  # Se restituisce False il BXS generato non viene pubblicato
+        self.resume = resume
+        self.journal = None  # Diario degli esiti per file (checkpoint)
+        self.manifest = None  # Registro dei BXS pubblicati (per i consumatori)
+        self.recycle_files = recycle_files
+        self.recycle_rss_bytes = recycle_rss_bytes
+        self.memory = MemoryMonitor()  # Andamento della memoria dei processi
+        self._files_since_init = 0
+        self.distributed = distributed
+        self.lease_ttl = lease_ttl
+        self.failure_cache = failure_cache
+        self.retry_failed = retry_failed
+        self.quarantine = quarantine
+        self.failures = None  # Cache negativa dei file falliti
+        if prefetch is not None and prefetch not in PREFETCH_MODES:
+            raise ValueError(f"Modalità di prefetch sconosciuta: {prefetch}")
+        self.prefetch = prefetch
+        self.prefetch_depth = max(1, int(prefetch_depth))
+        self.prefetch_max_bytes = prefetch_max_bytes
+        self.prefetcher = None  # Lettura anticipata dei file IGES dell'esecuzione
+        self.api_module = api_module
+        self._st7_version = None  # Versione dell'API, letta alla prima richiesta dei parametri
+        self._last_scratch_purge = time.monotonic()
         self.is_running = False
         self.should_stop = False
         
-    def log(self, message: str):
-        """Invia messaggio al log con timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        if self.log_callback:
-            self.log_callback(formatted_message)
-        else:
-            print(formatted_message)
+    def _relay(self, event):
+        """Ripubblica un evento ricevuto da un processo worker"""
+        if isinstance(event, LogEvent):
+            self._emit(event)
+        elif self.subscribers:
+            self.publish(event)
     
     def validate_folders(self) -> bool:
         """Valida le cartelle di input/output"""
@@ -91,13 +429,292 @@ class BXSGenerator:
             self.log(f"❌ ERRORE nella creazione delle cartelle: {e}")
             return False
     
+    def iter_iges_files(self, quiet: bool = False) -> Iterator[str]:
+        """
+        Restituisce i file IGES (.igs/.iges) man mano che vengono trovati
+        
+        In modalità ricorsiva due file con lo stesso nome in sottocartelle
+        diverse produrrebbero lo stesso BXS: viene elaborato solo il primo.
+        
+        Args:
+            quiet: Non segnala nel log i nomi duplicati
+        """
+        seen = set()
+        for iges_path in iter_files(self.iges_folder, IGES_EXTENSIONS,
+                                    recursive=self.recursive,
+                                    include=self.include_patterns,
+                                    exclude=self.exclude_patterns):
+            name = os.path.splitext(os.path.basename(iges_path))[0].lower()
+            if name in seen:
+                if not quiet:
+                    self.log(f"⚠ {iges_path} ignorato: nome già usato da un altro file IGES")
+                continue
+            seen.add(name)
+            yield iges_path
+    
     def get_iges_files(self) -> list:
         """Trova tutti i file IGES nella cartella di input"""
-        pattern = os.path.join(self.iges_folder, "*.igs")
-        files = glob.glob(pattern)
+        files = list(self.iter_iges_files())
         self.log(f"📁 Trovati {len(files)} file(s) IGES")
         return files
     
+    def get_scratch_dir(self, uID: int = 1) -> str:
+        """
+        Restituisce la cartella scratch da usare per un modello
+        
+        In modalità effimera ogni processo/slot ha la propria sottocartella,
+        così i file temporanei Strand7 di worker diversi non collidono.
+        
+        Args:
+            uID: User ID Strand7 del modello
+            
+        Returns:
+            Percorso della cartella scratch (creata se necessario)
+        """
+        if not self.ephemeral_scratch:
+            return self.scratch_folder
+        scratch_dir = os.path.join(self.scratch_folder,
+                                   f"{SCRATCH_WORKER_PREFIX}{os.getpid()}_{uID}")
+        os.makedirs(scratch_dir, exist_ok=True)
+        return scratch_dir
+    
+    def get_partial_path(self, basename: str, pid: Optional[int] = None) -> str:
+        """
+        Percorso temporaneo in cui St7GenerateBXS scrive un BXS
+        
+        La sottocartella nascosta è sullo stesso filesystem dell'output, così
+        il BXS completo viene pubblicato con un rename atomico. Il nome
+        contiene host e PID del processo che scrive: istanze diverse sulla
+        stessa cartella condivisa non scrivono mai lo stesso file.
+        
+        Args:
+            basename: Nome base della sezione
+            pid: PID del processo che scrive (default: processo corrente)
+            
+        Returns:
+            Percorso del BXS in scrittura (cartella creata se necessario)
+        """
+        partial_dir = os.path.join(self.output_folder, PARTIAL_FOLDER_NAME)
+        os.makedirs(partial_dir, exist_ok=True)
+        pid = os.getpid() if pid is None else pid
+        return os.path.join(partial_dir, f"{basename}.{socket.gethostname()}-{pid}.bxs")
+    
+    def purge_scratch(self):
+        """
+        Elimina i file temporanei più vecchi finché la cartella scratch
+        rientra in scratch_quota_bytes
+        
+        Vengono considerati solo i file creati dal generatore (temp_*.st7 e
+        contenuto delle sottocartelle worker_* e prefetch_*). Le sottocartelle
+        di altri processi ancora in esecuzione (altre istanze o job che
+        condividono la cartella scratch, worker attivi) non vengono toccate.
+        Oltre che a inizio e fine esecuzione, la quota viene ricontrollata
+        ogni SCRATCH_PURGE_INTERVAL secondi man mano che i file vengono completati.
+        """
+        self._last_scratch_purge = time.monotonic()
+        owned = []
+        try:
+            entries = list(os.scandir(self.scratch_folder))
+        except OSError:
+            return
+        entries = [entry for entry in entries
+                   if not (entry.is_dir() and self._is_live_scratch_dir(entry.name))]
+        for entry in entries:
+            if entry.is_file() and entry.name.startswith(SCRATCH_TEMP_PREFIX):
+                owned.append(entry.path)
+            elif entry.is_dir() and entry.name.startswith(SCRATCH_OWNED_DIR_PREFIXES):
+                for root, _, files in os.walk(entry.path):
+                    owned.extend(os.path.join(root, name) for name in files)
+        
+        sized = []
+        for path in owned:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            sized.append((st.st_mtime, st.st_size, path))
+        
+        total = sum(size for _, size, _ in sized)
+        removed_bytes = 0
+        for _, size, path in sorted(sized):
+            if total <= self.scratch_quota_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed_bytes += size
+        
+        # Rimuovi le sottocartelle worker e prefetch rimaste vuote
+        for entry in entries:
+            if entry.is_dir() and entry.name.startswith(SCRATCH_OWNED_DIR_PREFIXES):
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass
+        
+        if removed_bytes > 0:
+            self.log(f"🧹 Scratch: liberati {removed_bytes / 1024**2:.1f} MB "
+                     f"(quota {self.scratch_quota_bytes / 1024**2:.0f} MB)")
+    
+    def _is_live_scratch_dir(self, name: str) -> bool:
+        """
+        True se una sottocartella worker_<pid>_* o prefetch_<pid> è in uso da
+        un altro processo attivo (o è il prefetch in corso di questo processo)
+        """
+        if (self.prefetcher is not None
+                and name == os.path.basename(self.prefetcher.local_folder)):
+            return True
+        for prefix in SCRATCH_OWNED_DIR_PREFIXES:
+            if name.startswith(prefix):
+                try:
+                    pid = int(name[len(prefix):].split("_")[0])
+                except ValueError:
+                    return False
+                return pid != os.getpid() and is_process_alive(pid)
+        return False
+    
+    def _maybe_purge_scratch(self):
+        """Ricontrolla la quota della cartella scratch durante un'esecuzione lunga"""
+        if time.monotonic() - self._last_scratch_purge >= SCRATCH_PURGE_INTERVAL:
+            self.purge_scratch()
+    
+    def get_mesh_parameters(self) -> dict:
+        """
+        Restituisce i parametri di import, mesh e pulizia usati per ogni file
+        
+        Include la versione dell'API Strand7: le chiavi di cache, diario e
+        cache negativa cambiano con l'aggiornamento di Strand7, i cui BXS
+        (e fallimenti) possono differire da quelli della versione precedente.
+        """
+        if self._st7_version is None:
+            self._st7_version = get_st7_api_version(self.api_module) or "unknown"
+        return {
+            "strand7_version": self._st7_version,
+            "import_options": IGES_IMPORT_OPTIONS,
+            "import_doubles": IGES_IMPORT_DOUBLES,
+            "mesh_profile": self.mesh_profile,
+            "mesh_select": SURFACE_MESH_SELECT,
+            "mesh_size": MESH_PROFILES.get(self.mesh_profile),
+            "target_elements": (self.target_elements
+                                if self.mesh_profile == ADAPTIVE_MESH_PROFILE else None),
+            "clean_options": CLEAN_MESH_OPTIONS,
+            "clean_tolerance": CLEAN_MESH_TOLERANCE,
+        }
+    
+    def get_adaptive_mesh_size(self, uID: int) -> Optional[tuple]:
+        """
+        Calcola i parametri dimensionali della mesh dal bounding box della sezione
+        
+        La dimensione assoluta dell'elemento è scelta in modo che l'area del
+        bounding box (sulle due dimensioni principali) contenga circa
+        target_elements elementi plate.
+        
+        Args:
+            uID: User ID Strand7 del modello con la geometria importata
+            
+        Returns:
+            Tupla (dimensione elemento, larghezza, altezza) o None se la
+            geometria non ha estensione
+        """
+        n_vertices = ctypes.c_long()
+        ChkErr(St7API.St7GetTotal(uID, St7API.tyVERTEX, ctypes.byref(n_vertices)))
+        if n_vertices.value == 0:
+            return None
+        
+        lower = [math.inf] * 3
+        upper = [-math.inf] * 3
+        xyz = (ctypes.c_double * 3)()
+        for vertex in range(1, n_vertices.value + 1):
+            ChkErr(St7API.St7GetVertexXYZ(uID, vertex, xyz))
+            for axis in range(3):
+                lower[axis] = min(lower[axis], xyz[axis])
+                upper[axis] = max(upper[axis], xyz[axis])
+        
+        # Sezione piana: le due estensioni maggiori definiscono il piano
+        extents = sorted((upper[axis] - lower[axis] for axis in range(3)), reverse=True)
+        width, height = extents[0], extents[1]
+        if width <= 0 or height <= 0:
+            return None
+        
+        return math.sqrt(width * height / self.target_elements), width, height
+    
+    def count_plates(self, uID: int) -> int:
+        """Restituisce il numero di elementi plate nel modello"""
+        total = ctypes.c_long()
+        ChkErr(St7API.St7GetTotal(uID, St7API.tyPLATE, ctypes.byref(total)))
+        return total.value
+    
+    def read_bxs_loops(self, uID: int, bxs_path: str) -> Tuple[list, int]:
+        """
+        Rilegge i loop del contorno di un BXS tramite una proprietà beam temporanea
+        
+        Args:
+            uID: User ID del modello aperto
+            bxs_path: Percorso del file BXS
+            
+        Returns:
+            Tupla (lista di loop [(x, y), ...], numero di plate della sezione)
+        """
+        prop_num = BXS_EXPORT_PROPERTY
+        ChkErr(St7API.St7NewBeamProperty(uID, prop_num, St7API.kBeamTypeBeam, b"BXS_EXPORT"))
+        try:
+            ChkErr(St7API.St7AssignBXS(uID, prop_num, bxs_path.encode('ascii')))
+            n_loops = ctypes.c_long()
+            n_plates = ctypes.c_long()
+            ChkErr(St7API.St7GetNumBXSLoopsAndPlates(uID, prop_num, ctypes.byref(n_loops),
+                                                     ctypes.byref(n_plates)))
+            loops = []
+            for loop_num in range(1, n_loops.value + 1):
+                n_points = ctypes.c_long()
+                ChkErr(St7API.St7GetNumBXSLoopPoints(uID, prop_num, loop_num, ctypes.byref(n_points)))
+                n_read = ctypes.c_long()
+                xy = (ctypes.c_double * (2 * n_points.value))()
+                ChkErr(St7API.St7GetBXSLoop(uID, prop_num, loop_num, n_points.value,
+                                            ctypes.byref(n_read), xy))
+                count = min(n_read.value, n_points.value)
+                loops.append([(xy[2 * i], xy[2 * i + 1]) for i in range(count)])
+            return loops, n_plates.value
+        finally:
+            St7API.St7DeleteProperty(uID, St7API.ptBEAMPROP, prop_num)
+    
+    def export_section_file(self, uID: int, iges_path: str, bxs_path: str, record: dict):
+        """
+        Scrive accanto al BXS il file .bxsx con proprietà, loop e numero di plate
+        
+        Args:
+            uID: User ID del modello aperto
+            iges_path: Percorso del file IGES di origine
+            bxs_path: Percorso del file BXS appena generato
+            record: Record del file (proprietà "section" e "plates")
+        """
+        loops, n_plates = self.read_bxs_loops(uID, bxs_path)
+        basename = os.path.splitext(os.path.basename(bxs_path))[0]
+        header = {
+            "bxs_file": os.path.basename(bxs_path),
+            "iges_file": os.path.basename(iges_path),
+            "mesh_profile": self.mesh_profile,
+        }
+        iges_hash = self.get_iges_hash(iges_path)
+        if iges_hash is not None:
+            header["iges_hash"] = iges_hash
+        section = BXSSection(basename, header=header,
+                             properties=dict(zip(BXS_PROPERTY_NAMES, record["section"] or [])),
+                             loops=loops, plates=n_plates)
+        if NUMPY_AVAILABLE and section.properties:
+            # Verifica indipendente di prop_bxs a partire dai loop del contorno
+            differences = check_properties(section_properties(loops), section.properties)
+            for difference in differences:
+                self.log(f"  ⚠ Verifica sezione {basename}: {difference}")
+        write_bxsx(os.path.join(os.path.dirname(bxs_path), f"{basename}{SECTION_FILE_EXTENSION}"),
+                   [section])
+    
+    def _notify_stage(self, stage: str):
+        """Segnala l'inizio di una fase (watchdog della modalità isolata)"""
+        if self.stage_callback is not None:
+            self.stage_callback(stage)
+    
     def stop(self):
         """Ferma il processo di generazione"""
         self.should_stop = True
@@ -114,9 +731,40 @@ class BXSGenerator:
         Returns:
             True se successo, False altrimenti
         """
+        return self.process_file(iges_path, uID)["success"]
+    
+    def process_file(self, iges_path: str, uID: int = 1) -> dict:
+        """
+        Processa un singolo file IGES misurando la durata di ogni fase
+        
+        Args:
+            iges_path: Percorso completo del file IGES
+            uID: User ID per Strand7
+            
+        Returns:
+            Record strutturato con esito, numero di plate, durate per fase
+            ("stages") e durata totale in secondi
+        """
         basename = os.path.splitext(os.path.basename(iges_path))[0]
-        st7_temp = os.path.join(self.scratch_folder, f"temp_{basename}.st7")
+        scratch_dir = self.get_scratch_dir(uID)
+        st7_temp = os.path.join(scratch_dir, f"{SCRATCH_TEMP_PREFIX}{basename}.st7")
         bxs_output = os.path.join(self.output_folder, f"{basename}.bxs")
+        bxs_partial = self.get_partial_path(basename)
+        record = new_file_record(iges_path)
+        stages = record["stages"]
+        file_start = stage_start = time.perf_counter()
+        
+        def begin_stage(name: str):
+            record["failed_stage"] = name  # Azzerata a fine file se riuscito
+            self._notify_stage(name)
+        
+        def end_stage(name: str):
+            nonlocal stage_start
+            now = time.perf_counter()
+            stages[name] = now - stage_start
+            stage_start = now
+            if self.subscribers:
+                self.publish(StageFinishedEvent(iges_path, name, stages[name]))
         
         # Rimuovi file temporanei precedenti se esistono
         if os.path.exists(st7_temp):
@@ -126,116 +774,1569 @@ class BXSGenerator:
             except:
                 pass
         
+        if self.subscribers:
+            self.publish(FileStartedEvent(iges_path))
+        
         try:
             self.log(f"\n{'='*60}")
             self.log(f"📄 Elaborazione: {basename}")
             self.log(f"{'='*60}")
             
             # 1. New File
+            begin_stage("new_file")
             self.log("  [1/6] Creazione nuovo file Strand7...")
+            stage_start = time.perf_counter()
             ChkErr(St7API.St7NewFile(uID, st7_temp.encode('ascii'), 
-                                     self.scratch_folder.encode('ascii')))
+                                     scratch_dir.encode('ascii')))
+            end_stage("new_file")
             
             # 2. Import IGES
+            begin_stage("import_iges")
             self.log("  [2/6] Importazione IGES...")
-            opts = (ctypes.c_long * 6)(0, 0, 1, 1, 0, 2)
-            d_opts = (ctypes.c_double * 1)(0.0)
-            ChkErr(St7API.St7ImportIGESFile(uID, iges_path.encode('ascii'), 
+            params = self.get_mesh_parameters()
+            opts = (ctypes.c_long * 6)(*params["import_options"])
+            d_opts = (ctypes.c_double * 1)(*params["import_doubles"])
+            import_path = self._acquire_prefetched(iges_path)
+            ChkErr(St7API.St7ImportIGESFile(uID, import_path.encode('ascii'), 
                                             opts, d_opts, 1))
+            end_stage("import_iges")
             
             # 3. Surface Mesh
-            self.log("  [3/6] Generazione mesh superficiale...")
-            m_sel = (ctypes.c_long * 9)(1, 0, 4, -1, 1, 12, 1, 1, 1)
-            m_siz = (ctypes.c_double * 4)(0.5, 0.1, 30.0, 0.0)
+            begin_stage("surface_mesh")
+            self.log(f"  [3/6] Generazione mesh superficiale (profilo {self.mesh_profile})...")
+            mesh_select = list(params["mesh_select"])
+            mesh_size = params["mesh_size"] or MESH_PROFILES["balanced"]
+            if self.mesh_profile == ADAPTIVE_MESH_PROFILE:
+                adaptive = self.get_adaptive_mesh_size(uID)
+                if adaptive is not None:
+                    element_size, width, height = adaptive
+                    mesh_select[St7API.ipSurfaceMeshSizeMode] = St7API.smAbsolute
+                    mesh_size = (element_size,) + tuple(mesh_size[1:])
+                    self.log(f"  📏 Bounding box {width:.4g} x {height:.4g} → "
+                             f"dimensione elemento {element_size:.4g}")
+                else:
+                    self.log("  ⚠ Bounding box non valido, uso del profilo 'balanced'")
+            m_sel = (ctypes.c_long * 9)(*mesh_select)
+            m_siz = (ctypes.c_double * 4)(*mesh_size)
             ChkErr(St7API.St7SurfaceMesh(uID, m_sel, m_siz, 1))
+            end_stage("surface_mesh")
             
             # 4. Clean Mesh
+            begin_stage("clean_mesh")
             self.log("  [4/6] Pulizia mesh...")
-            clean = (ctypes.c_long * 15)(0, 1, 1, 1, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0)
-            tol = ctypes.c_double(0.0001)
+            clean = (ctypes.c_long * 15)(*params["clean_options"])
+            tol = ctypes.c_double(params["clean_tolerance"])
             ChkErr(St7API.St7SetCleanMeshData(uID, clean, ctypes.byref(tol)))
             ChkErr(St7API.St7CleanMesh(uID))
+            end_stage("clean_mesh")
+            mesh_time = stages["surface_mesh"] + stages["clean_mesh"]
+            record["plates"] = n_plates = self.count_plates(uID)
+            target = (f" (obiettivo {self.target_elements})"
+                      if self.mesh_profile == ADAPTIVE_MESH_PROFILE else "")
+            self.log(f"  📐 Mesh: {n_plates} elementi plate{target} in {mesh_time:.2f}s")
             
             # 5. Generate BXS
+            begin_stage("generate_bxs")
             self.log("  [5/6] Generazione file BXS...")
+            stage_start = time.perf_counter()
             prop_bxs = (ctypes.c_double * 34)()
-            ChkErr(St7API.St7GenerateBXS(uID, bxs_output.encode('ascii'), prop_bxs))
+            # Scrittura su un nome temporaneo e rename atomico: chi legge la
+            # cartella di output non vede mai un BXS incompleto (e un hard link
+            # condiviso con i duplicati viene sostituito, non sovrascritto)
+            ChkErr(St7API.St7GenerateBXS(uID, bxs_partial.encode('ascii'), prop_bxs))
+            if self.publish_check is not None and not self.publish_check(iges_path):
+                record["failed_stage"] = "publish"  # Non imputabile al file IGES
+                raise RuntimeError("file riassegnato a un'altra istanza, BXS non pubblicato")
+            os.replace(bxs_partial, bxs_output)
+            end_stage("generate_bxs")
+            record["section"] = list(prop_bxs)
+            self.log(f"  📊 A = {prop_bxs[St7API.ipBXSArea]:.6g}, "
+                     f"I11 = {prop_bxs[St7API.ipBXSI11]:.6g}, "
+                     f"I22 = {prop_bxs[St7API.ipBXSI22]:.6g}, "
+                     f"J = {prop_bxs[St7API.ipBXSJ]:.6g}")
+            
+            if self.export_sections:
+                begin_stage("export_section")
+                self.log(f"  📤 Esportazione {basename}{SECTION_FILE_EXTENSION}...")
+                try:
+                    self.export_section_file(uID, iges_path, bxs_output, record)
+                except Exception as e:
+                    self.log(f"  ⚠ Esportazione {SECTION_FILE_EXTENSION} non riuscita: {e}")
+                end_stage("export_section")
             
             # 6. Salva e Chiudi
-            self.log("  [6/6] Salvataggio e chiusura...")
-            ChkErr(St7API.St7SaveFile(uID))
-            ChkErr(St7API.St7CloseFile(uID))
+            begin_stage("save_close")
+            if self.ephemeral_scratch:
+                self.log("  [6/6] Chiusura modello (senza salvataggio)...")
+                ChkErr(St7API.St7CloseFile(uID))
+            else:
+                self.log("  [6/6] Salvataggio e chiusura...")
+                ChkErr(St7API.St7SaveFile(uID))
+                ChkErr(St7API.St7CloseFile(uID))
+            end_stage("save_close")
             
-            self.log(f"✅ COMPLETATO: {basename}.bxs creato con successo!")
-            return True
+            record["success"] = True
+            record["failed_stage"] = None
+            record["total"] = time.perf_counter() - file_start
+            self.log(f"✅ COMPLETATO: {basename}.bxs creato con successo! "
+                     f"({record['total']:.2f}s)")
+            return record
             
         except Exception as e:
             self.log(f"❌ ERRORE durante elaborazione di {basename}: {e}")
+            record["error"] = str(e)
+            record["error_code"] = getattr(e, "code", None)
+            record["total"] = time.perf_counter() - file_start
             try:
                 # Tenta di chiudere il file in caso di errore
                 St7API.St7CloseFile(uID)
             except:
                 pass
+            return record
+        
+        finally:
+            self._release_prefetched(iges_path)
+            if self.ephemeral_scratch and os.path.exists(st7_temp):
+                try:
+                    os.remove(st7_temp)
+                except OSError:
+                    pass
+            if os.path.exists(bxs_partial):
+                try:
+                    os.remove(bxs_partial)
+                except OSError:
+                    pass
+            record["pid"] = os.getpid()
+            record["rss"] = get_rss_bytes()
+    
+    def _run_serial(self, iges_files: list, stats: dict):
+        """
+        Elabora i file IGES in sequenza nel processo corrente
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+        """
+        self._prefetch_files(iges_files)
+        for idx, iges_path in enumerate(iges_files, 1):
+            if self.should_stop:
+                stats["skipped"] = len(iges_files) - idx + 1
+                self.log(f"\n⏸ Processo interrotto dall'utente")
+                self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
+                break
+            
+            self.log(f"\n📊 Progresso: {idx}/{len(iges_files)}")
+            
+            record = self.process_file(iges_path)
+            self._on_file_done(iges_path, record, stats)
+            self._recycle_api(record)
+    
+    def _run_streaming(self, iges_files: Iterable[str], stats: dict, init_api: Callable[[], None]):
+        """
+        Elabora in sequenza i file IGES man mano che vengono trovati
+        
+        Cache e pre-flight sono applicati file per file, così la generazione
+        inizia senza attendere la scansione completa della cartella. Con il
+        prefetch attivo vengono selezionati in anticipo prefetch_depth file,
+        letti in background mentre Strand7 elabora quello corrente.
+        
+        Args:
+            iges_files: Iteratore dei percorsi IGES
+            stats: Dizionario statistiche da aggiornare
+            init_api: Inizializza l'API Strand7 al primo file da generare
+        """
+        if self.use_cache:
+            self._open_cache()
+        iterator = self._discover_in_background(iges_files)
+        candidates = self._iter_streaming_candidates(iterator, stats)
+        lookahead = deque()
+        depth = self.prefetcher.depth if self.prefetcher is not None else 0
+        
+        while not self.should_stop:
+            while len(lookahead) <= depth and not self.should_stop:
+                iges_path = next(candidates, None)
+                if iges_path is None:
+                    break
+                lookahead.append(iges_path)
+                self._prefetch_files([iges_path])
+            if not lookahead or self.should_stop:
+                break
+            
+            iges_path = lookahead.popleft()
+            init_api()
+            self.log(f"\n📊 Progresso: file {stats['total'] - len(lookahead)}")
+            record = self.process_file(iges_path)
+            self._on_file_done(iges_path, record, stats)
+            self._recycle_api(record)
+        
+        if self.should_stop:
+            remaining = sum(1 for _ in iterator)
+            stats["total"] += remaining
+            stats["skipped"] += len(lookahead) + remaining
+            if stats["skipped"] > 0:
+                self.log(f"\n⏸ Processo interrotto dall'utente")
+                self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
+        
+        if self.cache is not None:
+            self.cache.save()
+        if stats["resumed"] > 0:
+            self.log(f"⏩ Ripresa: {stats['resumed']} file già completati")
+    
+    def _discover_in_background(self, iges_files: Iterable[str]) -> Iterator[str]:
+        """
+        Percorre la ricerca dei file IGES in un thread, in anticipo sull'elaborazione
+        
+        La generazione parte dal primo file trovato, mentre ogni file trovato
+        aumenta il totale usato per l'ETA (progress.total); i file che non
+        richiedono Strand7 (cache, ripresa, scartati) vengono poi sottratti.
+        """
+        found = queue.Queue()
+        self.progress.total = 0
+        
+        def discover():
+            try:
+                for iges_path in iges_files:
+                    self.progress.add_total(1)
+                    found.put(iges_path)
+            except Exception as e:
+                found.put(e)
+            finally:
+                found.put(None)
+        
+        threading.Thread(target=discover, name="bxs-discovery", daemon=True).start()
+        while True:
+            item = found.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    def _iter_streaming_candidates(self, iterator: Iterator[str], stats: dict) -> Iterator[str]:
+        """
+        File trovati che devono essere generati con Strand7
+        
+        I file già completati, ripristinati dalla cache, già falliti o
+        scartati dal pre-flight vengono contati in stats e non restituiti.
+        """
+        parameters = self.get_mesh_parameters()
+        for iges_path in iterator:
+            stats["total"] += 1
+            if self.should_stop:
+                stats["skipped"] += 1
+                return
+            
+            basename = os.path.splitext(os.path.basename(iges_path))[0]
+            if self.resume and self._is_completed(iges_path):
+                stats["success"] += 1
+                stats["resumed"] += 1
+                self.progress.add_total(-1)
+                continue
+            if self.use_cache and self._restore_cached_file(iges_path, parameters):
+                stats["success"] += 1
+                stats["cached"] += 1
+                self.log(f"💾 {basename}: BXS ripristinato dalla cache")
+                self.progress.add_total(-1)
+                continue
+            if (self._is_known_failure(iges_path, stats)
+                    or (self.preflight and not self._check_preflight(iges_path, stats))):
+                self.progress.add_total(-1)
+                continue
+            yield iges_path
+    
+    def _run_distributed(self, iges_files: list, stats: dict, init_api: Callable[[], None]):
+        """
+        Elabora i file IGES condividendoli con altre istanze tramite la coda con lease
+        
+        Ogni file viene elaborato solo dopo averne acquisito la lease; i file
+        già completati (da qualsiasi istanza, con input identici) vengono
+        saltati. Finché restano file in lease ad altre istanze si attende:
+        le lease scadute di istanze terminate vengono reclamate ed elaborate.
+        Gli esiti registrati da altre istanze (o da esecuzioni precedenti)
+        vengono contati come successi o fallimenti; con retry_failed i
+        fallimenti registrati prima di questa esecuzione vengono ritentati.
+        Se la lease di un file viene persa durante l'elaborazione, il BXS non
+        viene pubblicato e l'esito resta all'istanza che l'ha reclamata.
+        
+        Args:
+            iges_files: Lista dei percorsi IGES
+            stats: Dizionario statistiche da aggiornare
+            init_api: Inizializza l'API Strand7 al primo file da generare
+        """
+        queue = LeaseQueue(os.path.join(self.output_folder, QUEUE_FOLDER_NAME), ttl=self.lease_ttl)
+        self.log(f"🌐 Coda distribuita: istanza {queue.owner} (lease {self.lease_ttl:g}s)")
+        parameters = self.get_mesh_parameters()
+        if self.use_cache:
+            self._open_cache()
+        queue.start_heartbeat()
+        self.publish_check = lambda path: os.path.basename(path) in queue.held
+        run_start = time.time()
+        pending = list(iges_files)
+        
+        try:
+            while pending:
+                waiting = []
+                for index, iges_path in enumerate(pending):
+                    if self.should_stop:
+                        waiting.extend(pending[index:])
+                        break
+                    
+                    name = os.path.basename(iges_path)
+                    basename = os.path.splitext(name)[0]
+                    key = self._journal_key(iges_path)
+                    done = queue.result(name, key)
+                    if (done is not None and not done["success"] and self.retry_failed
+                            and done["finished"] < run_start):
+                        queue.clear_result(name)
+                        self.log(f"🔁 {basename}: nuovo tentativo dopo il fallimento registrato "
+                                 f"({done['error']})")
+                        done = None
+                    if done is not None and (not done["success"] or os.path.exists(
+                            os.path.join(self.output_folder, f"{basename}.bxs"))):
+                        if done["success"]:
+                            stats["success"] += 1
+                        else:
+                            stats["failed"] += 1
+                            self.log(f"❌ {basename}: fallito ({done['error']})")
+                        if done["owner"] != queue.owner:
+                            stats["remote"] += 1
+                        continue
+                    if not queue.claim(name, key):
+                        waiting.append(iges_path)
+                        continue
+                    
+                    try:
+                        if self.use_cache and self._restore_cached_file(iges_path, parameters):
+                            stats["success"] += 1
+                            stats["cached"] += 1
+                            self.log(f"💾 {basename}: BXS ripristinato dalla cache")
+                            queue.complete(name, key, True)
+                            continue
+                        if self._is_known_failure(iges_path, stats):
+                            queue.complete(name, key, False, "già fallito con input identici")
+                            continue
+                        if self.preflight and not self._check_preflight(iges_path, stats):
+                            queue.complete(name, key, False, "scartato dal pre-flight")
+                            continue
+                        
+                        init_api()
+                        self.log(f"\n📊 Progresso: {index + 1}/{len(pending)} file in coda")
+                        record = self.process_file(iges_path)
+                        if name not in queue.held:
+                            # Lease scaduta e reclamata: l'esito spetta all'altra istanza
+                            self.log(f"⚠ {basename}: lease persa durante l'elaborazione, "
+                                     f"esito lasciato all'altra istanza")
+                            waiting.append(iges_path)
+                            self._recycle_api(record)
+                            continue
+                        self._on_file_done(iges_path, record, stats)
+                        self._recycle_api(record)
+                        queue.complete(name, key, record["success"], record["error"])
+                    finally:
+                        queue.release(name)
+                
+                if self.should_stop:
+                    stats["skipped"] += len(waiting)
+                    self.log(f"\n⏸ Processo interrotto dall'utente")
+                    self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
+                    break
+                pending = waiting
+                if pending:
+                    self.log(f"⏳ {len(pending)} file in elaborazione su altre istanze, attesa...")
+                    deadline = time.monotonic() + min(5.0, self.lease_ttl / 4)
+                    while not self.should_stop and time.monotonic() < deadline:
+                        time.sleep(0.2)
+        finally:
+            self.publish_check = None
+            queue.stop_heartbeat()
+            queue.release_all()
+            if self.cache is not None:
+                self.cache.save()
+        
+        if queue.lost:
+            self.log(f"⚠ Lease perse (reclamate da altre istanze): {', '.join(queue.lost)}")
+        if stats["remote"] > 0:
+            self.log(f"🌐 {stats['remote']} file completati da altre istanze")
+    
+    def _run_parallel(self, iges_files: list, stats: dict):
+        """
+        Elabora i file IGES su un pool di processi worker
+        
+        Ogni worker esegue St7Init/St7Release per conto proprio; i risultati
+        vengono accumulati in stats. stop() annulla i file non ancora avviati.
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+        """
+        config = self._worker_config()
+        n_workers = min(self.workers, len(iges_files))
+        self.log(f"⚙ Avvio pool di {n_workers} processi worker")
+        
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_pool_worker,
+                                 initargs=(self.api_module,)) as executor:
+            pending = {executor.submit(_process_file_in_worker, config, path): path
+                       for path in iges_files}
+            self._collect_results(pending, stats)
+    
+    def _worker_config(self) -> dict:
+        """Parametri di costruzione del BXSGenerator nei processi worker"""
+        return {
+            "iges_folder": self.iges_folder,
+            "output_folder": self.output_folder,
+            "scratch_folder": self.scratch_folder,
+            "ephemeral_scratch": self.ephemeral_scratch,
+            "mesh_profile": self.mesh_profile,
+            "target_elements": self.target_elements,
+            "export_sections": self.export_sections,
+            "recycle_files": self.recycle_files,
+            "recycle_rss_bytes": self.recycle_rss_bytes,
+            "api_module": self.api_module,
+        }
+    
+    def _recycle_reason(self, n_files: int, rss: Optional[int]) -> Optional[str]:
+        """Motivo per reinizializzare l'API o sostituire il worker (None se non serve)"""
+        if self.recycle_files and n_files >= self.recycle_files:
+            return f"{n_files} file elaborati"
+        if self.recycle_rss_bytes and rss is not None and rss > self.recycle_rss_bytes:
+            return f"RSS {format_bytes(rss)} oltre {format_bytes(self.recycle_rss_bytes)}"
+        return None
+    
+    def _recycle_api(self, record: dict):
+        """
+        Reinizializza l'API Strand7 del processo corrente se necessario
+        
+        St7Release/St7Init libera la memoria accumulata dalla DLL nei cicli
+        St7NewFile/St7CloseFile; va chiamata solo tra un file e l'altro.
+        
+        Args:
+            record: Record del file appena elaborato (RSS a fine file)
+        """
+        self._files_since_init += 1
+        reason = self._recycle_reason(self._files_since_init, record["rss"])
+        if reason is None:
+            return
+        self.log(f"♻ Reinizializzazione API Strand7 ({reason})")
+        ChkErr(St7API.St7Release())
+        ChkErr(St7API.St7Init())
+        self._files_since_init = 0
+        self.memory.reset(os.getpid())
+        self.log(f"   Memoria dopo la reinizializzazione: {format_bytes(get_rss_bytes())}")
+    
+    def _run_supervised(self, iges_files: list, stats: dict):
+        """
+        Elabora i file IGES in processi figli sorvegliati da un watchdog
+        
+        Ogni worker elabora un file alla volta e notifica l'inizio di ogni
+        fase. Se una fase supera stage_timeout (o il file supera file_timeout)
+        o il processo termina per un crash della DLL, il worker viene
+        sostituito e il file registrato come fallito. stop() termina subito i
+        worker: i file in corso vengono conteggiati come saltati.
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+        """
+        config = self._worker_config()
+        n_workers = min(self.workers, len(iges_files))
+        timeouts = []
+        if self.stage_timeout:
+            timeouts.append(f"fase {self.stage_timeout:g}s")
+        if self.file_timeout:
+            timeouts.append(f"file {self.file_timeout:g}s")
+        self.log(f"🛡 Avvio di {n_workers} worker isolati "
+                 f"(timeout: {', '.join(timeouts) or 'nessuno'})")
+        
+        todo = deque(iges_files)
+        total = len(iges_files)
+        completed = 0
+        workers = [SupervisedWorker(_supervised_worker_main, config, index)
+                   for index in range(1, n_workers + 1)]
+        for worker in workers:
+            worker.start()
+        
+        def fail(worker: SupervisedWorker, reason: str):
+            nonlocal completed
+            iges_path = worker.task
+            basename = os.path.splitext(os.path.basename(iges_path))[0]
+            record = new_file_record(iges_path)
+            record["stages"] = dict(worker.stages)
+            record["failed_stage"] = worker.stage
+            record["total"] = worker.elapsed()
+            record["error"] = f"Worker {worker.index} (PID {worker.pid}): {reason}"
+            # File scritti solo in parte dal processo terminato
+            for partial in (self.get_partial_path(basename, worker.pid),
+                            os.path.join(self.output_folder,
+                                         f"{basename}{SECTION_FILE_EXTENSION}{TEMP_SUFFIX}")):
+                try:
+                    os.remove(partial)
+                except OSError:
+                    pass
+            worker.restart()
+            completed += 1
+            self.log(f"💥 {basename}: {reason} - worker {worker.index} riavviato")
+            self.log(f"📊 Progresso: {completed}/{total}")
+            self._on_file_done(iges_path, record, stats)
+        
+        try:
+            while todo or any(worker.busy for worker in workers):
+                if self.should_stop:
+                    in_flight = [worker for worker in workers if worker.busy]
+                    for worker in in_flight:
+                        worker.kill()
+                    stats["skipped"] += len(todo) + len(in_flight)
+                    self.log(f"\n⏸ Processo interrotto dall'utente")
+                    self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
+                    break
+                
+                for worker in workers:
+                    if todo and not worker.busy:
+                        try:
+                            worker.submit(todo[0])
+                        except (OSError, ValueError):
+                            worker.restart()
+                            continue
+                        todo.popleft()
+                
+                busy = [worker for worker in workers if worker.busy]
+                wait_connections([worker.conn for worker in busy] +
+                                 [worker.process.sentinel for worker in busy], timeout=0.5)
+                for worker in busy:
+                    iges_path = worker.task
+                    for kind, payload in worker.receive():
+                        if kind == "event":
+                            self._relay(payload)
+                        elif kind == "done":
+                            completed += 1
+                            self.log(f"📊 Progresso: {completed}/{total}")
+                            self._on_file_done(iges_path, payload, stats)
+                            reason = self._recycle_reason(worker.files, payload["rss"])
+                            if reason is not None:
+                                self.log(f"♻ Sostituzione worker {worker.index} ({reason})")
+                                self.memory.reset(worker.pid)
+                                worker.recycle()
+                    if worker.crashed:
+                        worker.process.join(KILL_TIMEOUT)
+                        code = worker.process.exitcode
+                        fail(worker, f"processo terminato inaspettatamente (codice {code})")
+                        continue
+                    reason = worker.expired(self.stage_timeout, self.file_timeout)
+                    if reason is not None:
+                        fail(worker, reason)
+        finally:
+            for worker in workers:
+                worker.shutdown()
+            restarts = sum(worker.restarts for worker in workers)
+            if restarts:
+                self.log(f"🛡 Worker riavviati dal watchdog: {restarts}")
+    
+    def _run_slots(self, iges_files: list, stats: dict):
+        """
+        Elabora i file IGES su più slot modello (uID) dell'API già inizializzata
+        
+        Un pool di thread preleva un uID libero per ogni file, così più modelli
+        scratch restano aperti contemporaneamente nello stesso processo.
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+        """
+        n_slots = min(self.slots, len(iges_files))
+        free_uids = queue.Queue()
+        for uID in range(1, n_slots + 1):
+            free_uids.put(uID)
+        self.log(f"⚙ Avvio di {n_slots} slot modello Strand7 (uID 1-{n_slots})")
+        
+        def process_with_slot(iges_path: str) -> Tuple[dict, list]:
+            uID = free_uids.get()
+            try:
+                return self.process_file(iges_path, uID), []
+            finally:
+                free_uids.put(uID)
+        
+        self._prefetch_files(iges_files)
+        with ThreadPoolExecutor(max_workers=n_slots) as executor:
+            pending = {executor.submit(process_with_slot, path): path
+                       for path in iges_files}
+            self._collect_results(pending, stats)
+    
+    def _collect_results(self, pending: dict, stats: dict):
+        """
+        Raccoglie i risultati dei file sottomessi a un executor
+        
+        Args:
+            pending: Dizionario {future: percorso IGES}; ogni future restituisce
+                     (record del file, eventi da ripubblicare)
+            stats: Dizionario statistiche da aggiornare
+        """
+        total = len(pending)
+        completed = 0
+        cancelled = False
+        
+        while pending:
+            if self.should_stop and not cancelled:
+                cancelled = True
+                for future in list(pending):
+                    if future.cancel():
+                        del pending[future]
+                        stats["skipped"] += 1
+                self.log(f"\n⏸ Processo interrotto dall'utente")
+                self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
+                if not pending:
+                    break
+            
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                iges_path = pending.pop(future)
+                completed += 1
+                try:
+                    record, events = future.result()
+                except Exception as e:
+                    basename = os.path.splitext(os.path.basename(iges_path))[0]
+                    record, events = new_file_record(iges_path), []
+                    record["error"] = str(e)
+                    self.log(f"❌ ERRORE nel worker durante elaborazione di {basename}: {e}")
+                
+                for event in events:
+                    self._relay(event)
+                self.log(f"📊 Progresso: {completed}/{total}")
+                
+                self._on_file_done(iges_path, record, stats)
+    
+    def _on_file_done(self, iges_path: str, record: dict, stats: dict):
+        """
+        Registra l'esito di un file elaborato da Strand7
+        
+        Args:
+            iges_path: Percorso completo del file IGES
+            record: Record del file restituito da process_file
+            stats: Dizionario statistiche da aggiornare
+        """
+        self.file_records.append(record)
+        self.memory.add(record["pid"], record["rss"])
+        self._maybe_purge_scratch()
+        self._item_done(iges_path, record["success"], record["total"], record["error"])
+        if not record["success"]:
+            stats["failed"] += 1
+            self._journal_outcome(iges_path, STATUS_FAILED, record["total"])
+            self._publish_duplicates(iges_path, record, stats)
+            self._record_failure(iges_path, record)
+            return
+        
+        stats["success"] += 1
+        self._forget_failure(iges_path)
+        self._journal_outcome(iges_path, STATUS_DONE, record["total"])
+        self._publish_manifest(iges_path)
+        self._store_section(iges_path, record["section"], record["plates"])
+        self._publish_duplicates(iges_path, record, stats)
+        iges_hash = self.get_iges_hash(iges_path)
+        if self.timings is not None and iges_hash is not None:
+            report = self.preflight_reports.get(iges_path)
+            try:
+                size = os.path.getsize(iges_path)
+            except OSError:
+                size = 0
+            self.timings.record(iges_hash, record["total"],
+                                report.estimate_cost() if report else None, size)
+        
+        key = self._cache_keys.get(iges_path)
+        if self.cache is not None and key is not None:
+            basename = os.path.splitext(os.path.basename(iges_path))[0]
+            bxs_output = os.path.join(self.output_folder, f"{basename}.bxs")
+            try:
+                self.cache.store(key, bxs_output, os.path.basename(iges_path))
+                self.cache.save()
+            except OSError as e:
+                self.log(f"  ⚠ Impossibile salvare {basename}.bxs in cache: {e}")
+    
+    def _deduplicate(self, iges_files: list) -> list:
+        """
+        Raggruppa i file IGES con la stessa firma geometrica
+        
+        Per ogni gruppo viene elaborato solo il primo file; gli altri sono
+        registrati in _duplicates e ricevono il suo BXS a elaborazione conclusa.
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            
+        Returns:
+            Lista dei file IGES rappresentativi da elaborare
+        """
+        groups = {}  # {firma: [percorsi IGES]}
+        unique = []
+        
+        for iges_path in iges_files:
+            report = self.preflight_reports.get(iges_path)
+            if report is None or report.signature is None:
+                report = analyze_iges(iges_path, signature=True)
+            if report.signature is None:
+                unique.append(iges_path)
+                continue
+            group = groups.setdefault(report.signature, [])
+            if not group:
+                unique.append(iges_path)
+            group.append(iges_path)
+        
+        self._duplicates = {}
+        for signature, paths in groups.items():
+            if len(paths) < 2:
+                continue
+            self._duplicates[paths[0]] = paths[1:]
+            names = ", ".join(os.path.basename(path) for path in paths[1:])
+            self.log(f"🧬 {os.path.basename(paths[0])} → {names}")
+        
+        self.log(f"🧬 Deduplicazione geometrica: {len(unique)} sezioni uniche, "
+                 f"{len(iges_files) - len(unique)} duplicati")
+        return unique
+    
+    def _publish_duplicates(self, iges_path: str, record: dict, stats: dict):
+        """
+        Copia (o collega con hard link) il BXS di un rappresentante sui duplicati
+        
+        Args:
+            iges_path: Percorso IGES del rappresentante appena elaborato
+            record: Record dell'elaborazione del rappresentante
+            stats: Dizionario statistiche da aggiornare
+        """
+        duplicates = self._duplicates.pop(iges_path, [])
+        if not duplicates:
+            return
+        
+        source_name = os.path.splitext(os.path.basename(iges_path))[0]
+        source_bxs = os.path.join(self.output_folder, f"{source_name}.bxs")
+        for duplicate in duplicates:
+            basename = os.path.splitext(os.path.basename(duplicate))[0]
+            bxs_output = os.path.join(self.output_folder, f"{basename}.bxs")
+            entry = {"file": os.path.basename(duplicate),
+                     "source": os.path.basename(iges_path),
+                     "method": None}
+            self.dedupe_records.append(entry)
+            if not record["success"]:
+                stats["failed"] += 1
+                self._journal_outcome(duplicate, STATUS_FAILED)
+                self.log(f"❌ {basename}: non generato (fallito il rappresentante {source_name})")
+                continue
+            
+            try:
+                entry["method"] = publish_copy(source_bxs, bxs_output, link=True)
+            except OSError as e:
+                stats["failed"] += 1
+                self.log(f"❌ Impossibile copiare {source_name}.bxs su {basename}.bxs: {e}")
+                continue
+            
+            stats["success"] += 1
+            stats["deduplicated"] += 1
+            self._journal_outcome(duplicate, STATUS_DONE)
+            self._store_section(duplicate, record["section"], record["plates"])
+            if self.export_sections:
+                self._copy_section_file(iges_path, duplicate)
+            self._publish_manifest(duplicate)
+            key = self._cache_keys.get(duplicate)
+            if self.cache is not None and key is not None:
+                try:
+                    self.cache.store(key, bxs_output, os.path.basename(duplicate))
+                except OSError as e:
+                    self.log(f"  ⚠ Impossibile salvare {basename}.bxs in cache: {e}")
+    
+    def _copy_section_file(self, iges_path: str, duplicate: str):
+        """Scrive il file .bxsx di un duplicato a partire da quello del rappresentante"""
+        source_name = os.path.splitext(os.path.basename(iges_path))[0]
+        basename = os.path.splitext(os.path.basename(duplicate))[0]
+        try:
+            section = read_bxsx(os.path.join(self.output_folder,
+                                             f"{source_name}{SECTION_FILE_EXTENSION}"))
+        except (OSError, BXSFormatError):
+            return
+        section.name = basename
+        section.header["bxs_file"] = f"{basename}.bxs"
+        section.header["iges_file"] = os.path.basename(duplicate)
+        iges_hash = self.get_iges_hash(duplicate)
+        if iges_hash is not None:
+            section.header["iges_hash"] = iges_hash
+        try:
+            write_bxsx(os.path.join(self.output_folder, f"{basename}{SECTION_FILE_EXTENSION}"),
+                       [section])
+        except OSError as e:
+            self.log(f"  ⚠ Impossibile scrivere {basename}{SECTION_FILE_EXTENSION}: {e}")
+    
+    def _write_dedupe_report(self, stats: dict):
+        """Conta come saltati i duplicati non pubblicati e scrive il report JSON"""
+        for iges_path, duplicates in self._duplicates.items():
+            stats["skipped"] += len(duplicates)
+            self.dedupe_records.extend({"file": os.path.basename(duplicate),
+                                        "source": os.path.basename(iges_path),
+                                        "method": None} for duplicate in duplicates)
+        self._duplicates = {}
+        if not self.dedupe_records:
+            return
+        
+        report_path = os.path.join(self.output_folder, DEDUPE_REPORT_NAME)
+        try:
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump({"duplicates": self.dedupe_records}, f, indent=1)
+            self.log(f"💾 Report deduplicazione: {report_path}")
+        except OSError as e:
+            self.log(f"⚠ Impossibile scrivere il report di deduplicazione: {e}")
+    
+    def _open_section_store(self):
+        """
+        Apre l'archivio delle proprietà di sezione nella cartella di output
+        
+        In modalità distribuita l'archivio non viene aperto: il locking di
+        SQLite non è affidabile su filesystem di rete condivisi tra istanze.
+        """
+        if self.section_store is not None:
+            return
+        if self.distributed:
+            self.log("ℹ Archivio delle proprietà di sezione disattivato in modalità distribuita")
+            return
+        try:
+            self.section_store = SectionStore(os.path.join(self.output_folder, SECTION_STORE_NAME))
+        except sqlite3.Error as e:
+            self.log(f"⚠ Archivio delle proprietà di sezione non disponibile: {e}")
+    
+    def _close_section_store(self):
+        """Chiude l'archivio delle proprietà di sezione"""
+        if self.section_store is not None:
+            self.section_store.close()
+            self.section_store = None
+    
+    def _store_section(self, iges_path: str, properties: Optional[list],
+                       plates: Optional[int] = None):
+        """
+        Salva nell'archivio le proprietà di sezione del BXS di un file IGES
+        
+        Args:
+            iges_path: Percorso completo del file IGES
+            properties: Valori prop_bxs restituiti da St7GenerateBXS
+            plates: Numero di elementi plate della mesh
+        """
+        if self.section_store is None or properties is None:
+            return
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        iges_hash = self.get_iges_hash(iges_path)
+        if iges_hash is None:
+            return
+        try:
+            self.section_store.store(basename, iges_hash, properties,
+                                     bxs_file=f"{basename}.bxs",
+                                     mesh_profile=self.mesh_profile, plates=plates)
+        except sqlite3.Error as e:
+            self.log(f"  ⚠ Impossibile archiviare le proprietà di {basename}: {e}")
+    
+    def _store_cached_section(self, iges_path: str):
+        """Registra con il nome corrente le proprietà di un BXS ripristinato dalla cache"""
+        if self.section_store is None:
+            return
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        iges_hash = self.get_iges_hash(iges_path)
+        try:
+            if self.section_store.get(basename, iges_hash) is not None:
+                return
+            section = self.section_store.find_by_hash(iges_hash)
+        except sqlite3.Error:
+            return
+        if section is not None:
+            self._store_section(iges_path, [section[name] for name in BXS_PROPERTY_NAMES],
+                                section["plates"])
+    
+    def _open_journal(self):
+        """
+        Apre il diario degli esiti nella cartella di output
+        
+        In modalità distribuita il diario non viene aperto: gli esiti sono
+        registrati dai file .done della coda, scritti in modo atomico, invece
+        che da righe accodate da più istanze allo stesso file.
+        """
+        if self.distributed:
+            return
+        try:
+            self.journal = RunJournal(os.path.join(self.output_folder, JOURNAL_NAME))
+        except OSError as e:
+            self.journal = None
+            self.log(f"⚠ Diario di esecuzione non disponibile: {e}")
+    
+    def _close_journal(self):
+        """Chiude il diario degli esiti"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+    
+    def _open_manifest(self):
+        """Apre il manifest dei BXS pubblicati nella cartella di output"""
+        try:
+            self.manifest = PublicationManifest(self.output_folder)
+        except OSError as e:
+            self.manifest = None
+            self.log(f"⚠ Manifest dei BXS pubblicati non disponibile: {e}")
+    
+    def _close_manifest(self):
+        """Chiude il manifest dei BXS pubblicati"""
+        if self.manifest is not None:
+            self.manifest.close()
+            self.manifest = None
+    
+    def _publish_manifest(self, iges_path: str):
+        """Registra nel manifest il BXS completato di un file IGES"""
+        if self.manifest is None:
+            return
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        try:
+            self.manifest.publish(os.path.join(self.output_folder, f"{basename}.bxs"))
+        except OSError as e:
+            self.log(f"⚠ Impossibile aggiornare il manifest per {basename}.bxs: {e}")
+    
+    def _journal_key(self, iges_path: str) -> Optional[str]:
+        """Chiave degli input di un file: hash IGES + parametri di mesh"""
+        iges_hash = self.get_iges_hash(iges_path)
+        if iges_hash is None:
+            return None
+        return make_cache_key(iges_hash, self.get_mesh_parameters())
+    
+    def _journal_outcome(self, iges_path: str, status: str, seconds: float = 0.0):
+        """Registra in modo durevole l'esito di un file (se il diario è aperto)"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.record(os.path.basename(iges_path), self._journal_key(iges_path),
+                                status, seconds)
+        except OSError as e:
+            self.log(f"⚠ Impossibile aggiornare il diario di esecuzione: {e}")
+    
+    def _is_completed(self, iges_path: str) -> bool:
+        """True se il diario riporta il file completato con input identici e il BXS esiste"""
+        if self.journal is None:
+            return False
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        if not os.path.exists(os.path.join(self.output_folder, f"{basename}.bxs")):
             return False
+        return self.journal.is_completed(os.path.basename(iges_path), self._journal_key(iges_path))
     
-    def run(self) -> dict:
+    def _skip_completed(self, iges_files: list, stats: dict) -> list:
         """
-        Esegue il processo completo di generazione BXS
+        Esclude i file già completati in un'esecuzione precedente (resume)
         
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+            
         Returns:
-            dict con statistiche di elaborazione
+            Lista dei file IGES ancora da elaborare
+        """
+        remaining = [path for path in iges_files if not self._is_completed(path)]
+        resumed = len(iges_files) - len(remaining)
+        stats["success"] += resumed
+        stats["resumed"] += resumed
+        self.log(f"⏩ Ripresa: {resumed} file già completati, {len(remaining)} da elaborare")
+        return remaining
+    
+    def _open_failures(self):
+        """Apre la cache negativa dei file falliti nella cartella di output"""
+        if self.failure_cache:
+            self.failures = FailureCache(os.path.join(self.output_folder, FAILURES_FILE_NAME))
+    
+    def _close_failures(self):
+        """Salva e chiude la cache negativa"""
+        if self.failures is not None:
+            self._save_failures()
+            self.failures = None
+    
+    def _save_failures(self):
+        try:
+            self.failures.save()
+        except OSError as e:
+            self.log(f"⚠ Impossibile salvare la cache dei file falliti: {e}")
+    
+    def _quarantine_file(self, iges_path: str, entry: dict):
+        """Sposta un file fallito nella cartella di quarantena (se richiesto)"""
+        if not self.quarantine:
+            return
+        basename = os.path.basename(iges_path)
+        try:
+            quarantine_file(iges_path, os.path.join(self.iges_folder, QUARANTINE_FOLDER_NAME), entry)
+            self.log(f"  ☣ {basename} spostato in {QUARANTINE_FOLDER_NAME}")
+        except OSError as e:
+            self.log(f"  ⚠ Impossibile spostare {basename} in quarantena: {e}")
+    
+    def _is_known_failure(self, iges_path: str, stats: dict) -> bool:
+        """
+        Salta un file già fallito con lo stesso contenuto IGES e gli stessi parametri
+        
+        Args:
+            iges_path: Percorso completo del file IGES
+            stats: Dizionario statistiche da aggiornare
+            
+        Returns:
+            True se il file va saltato (registrato come fallito, retry_failed=False)
+        """
+        if self.failures is None or self.retry_failed:
+            return False
+        entry = self.failures.get(self._journal_key(iges_path))
+        if entry is None:
+            return False
+        stats["known_failed"] += 1
+        code = f", codice {entry['error_code']}" if entry.get("error_code") is not None else ""
+        self.log(f"⛔ {os.path.basename(iges_path)}: fallito in precedenza "
+                 f"(fase {entry.get('stage')}{code}), saltato: {entry['error']}")
+        self._quarantine_file(iges_path, entry)
+        return True
+    
+    def _skip_known_failures(self, iges_files: list, stats: dict) -> list:
+        """
+        Esclude i file registrati come falliti con input identici
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+            
+        Returns:
+            Lista dei file IGES ancora da elaborare
+        """
+        if self.failures is None or self.retry_failed or not self.failures.entries:
+            return iges_files
+        remaining = [path for path in iges_files if not self._is_known_failure(path, stats)]
+        skipped = len(iges_files) - len(remaining)
+        if skipped:
+            self.log(f"⛔ {skipped} file saltati perché già falliti con input identici "
+                     f"(retry_failed per riprovarli)")
+        return remaining
+    
+    def _record_failure(self, iges_path: str, record: dict):
+        """Registra nella cache negativa un file fallito per cause legate al suo contenuto"""
+        if self.failures is None or not is_file_dependent(record):
+            return
+        key = self._journal_key(iges_path)
+        if key is None:
+            return
+        entry = self.failures.record(key, record)
+        self._save_failures()
+        self._quarantine_file(iges_path, entry)
+    
+    def _forget_failure(self, iges_path: str):
+        """Rimuove dalla cache negativa un file ora elaborato con successo"""
+        if self.failures is None or not self.failures.entries:
+            return
+        if self.failures.forget(self._journal_key(iges_path)):
+            self._save_failures()
+            self.log(f"  ✓ {os.path.basename(iges_path)} rimosso dalla cache dei file falliti")
+    
+    def _open_prefetcher(self):
+        """
+        Avvia la lettura anticipata dei file IGES (se richiesta)
+        
+        Il prefetch serve i percorsi che importano nel processo corrente
+        (seriale e slot): worker, modalità isolata e coda distribuita aprono
+        i file in altri processi o li acquisiscono uno alla volta.
+        """
+        if (self.prefetch is None or self.distributed or self.isolate
+                or self.workers > 1):
+            return
+        local_folder = os.path.join(self.scratch_folder,
+                                    f"{PREFETCH_FOLDER_NAME}_{os.getpid()}")
+        try:
+            self.prefetcher = IGESPrefetcher(local_folder, mode=self.prefetch,
+                                             depth=self.prefetch_depth,
+                                             max_bytes=self.prefetch_max_bytes)
+        except OSError as e:
+            self.prefetcher = None
+            self.log(f"⚠ Prefetch non disponibile: {e}")
+            return
+        self.log(f"📥 Prefetch IGES ({self.prefetch}): {self.prefetcher.depth} file, "
+                 f"max {format_bytes(self.prefetch_max_bytes)}")
+    
+    def _close_prefetcher(self):
+        """Ferma il prefetch, elimina le copie locali e riporta l'esito"""
+        if self.prefetcher is None:
+            return
+        prefetcher, self.prefetcher = self.prefetcher, None
+        prefetcher.close()
+        p_stats = prefetcher.stats
+        if p_stats["hits"] or p_stats["misses"]:
+            self.log(f"📥 Prefetch: {p_stats['hits']} file letti in anticipo "
+                     f"({format_bytes(p_stats['bytes'])}), {p_stats['misses']} dal percorso "
+                     f"originale, attesa {p_stats['wait_seconds']:.1f}s")
+        if p_stats["errors"]:
+            self.log(f"⚠ Prefetch: {p_stats['errors']} file non letti in anticipo")
+    
+    def _prefetch_files(self, iges_files: list):
+        """Accoda file alla lettura anticipata, nell'ordine di elaborazione"""
+        if self.prefetcher is not None:
+            self.prefetcher.submit(iges_files)
+    
+    def _acquire_prefetched(self, iges_path: str) -> str:
+        """Percorso da cui importare un file IGES (copia locale se anticipato)"""
+        if self.prefetcher is None:
+            return iges_path
+        return self.prefetcher.acquire(iges_path)
+    
+    def _release_prefetched(self, iges_path: str):
+        """Libera la copia locale di un file IGES elaborato"""
+        if self.prefetcher is not None:
+            self.prefetcher.release(iges_path)
+    
+    def _open_cache(self):
+        """Apre la cache BXS nella cartella di output (una sola volta)"""
+        if self.cache is None:
+            self.cache = BXSCache(os.path.join(self.output_folder, CACHE_FOLDER_NAME),
+                                  max_bytes=self.cache_max_bytes)
+    
+    def _restore_cached_file(self, iges_path: str, parameters: dict) -> bool:
+        """
+        Ripristina dalla cache il BXS di un file IGES, se presente
+        
+        Args:
+            iges_path: Percorso completo del file IGES
+            parameters: Parametri di mesh correnti (get_mesh_parameters)
+            
+        Returns:
+            True se il BXS è stato ripristinato
+        """
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        iges_hash = self.get_iges_hash(iges_path)
+        if iges_hash is None:
+            self.log(f"⚠ Impossibile leggere {basename} per la cache")
+            return False
+        key = make_cache_key(iges_hash, parameters)
+        
+        self._cache_keys[iges_path] = key
+        bxs_output = os.path.join(self.output_folder, f"{basename}.bxs")
+        if not self.cache.restore(key, bxs_output):
+            return False
+        self._store_cached_section(iges_path)
+        self._journal_outcome(iges_path, STATUS_CACHED)
+        self._publish_manifest(iges_path)
+        return True
+    
+    def _restore_from_cache(self, iges_files: list, stats: dict) -> list:
+        """
+        Ripristina dalla cache i BXS già generati con input identici
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+            
+        Returns:
+            Lista dei file IGES che richiedono ancora Strand7
+        """
+        self._open_cache()
+        parameters = self.get_mesh_parameters()
+        remaining = []
+        restored = 0
+        
+        for iges_path in iges_files:
+            if self._restore_cached_file(iges_path, parameters):
+                stats["success"] += 1
+                stats["cached"] += 1
+                restored += 1
+            else:
+                remaining.append(iges_path)
+        
+        self.cache.save()
+        self.log(f"💾 Cache BXS: {restored} file riutilizzati, "
+                 f"{len(remaining)} da generare")
+        return remaining
+    
+    def _log_timing_summary(self):
+        """Riporta i percentili per fase, i file più lenti ed esporta i record"""
+        lines = format_summary(self.file_records)
+        if lines:
+            self.log("⏱ TEMPI PER FASE")
+            for line in lines:
+                self.log(line)
+            self.log("="*60)
+        memory = self.memory.format_summary()
+        if memory:
+            self.log(memory)
+        
+        if self.timing_report:
+            try:
+                write_records(self.timing_report, self.file_records)
+                self.log(f"💾 Tempi per file esportati in: {self.timing_report}")
+            except OSError as e:
+                self.log(f"⚠ Impossibile esportare i tempi: {e}")
+    
+    def get_iges_hash(self, iges_path: str) -> Optional[str]:
+        """Restituisce l'hash del contenuto IGES (calcolato una sola volta)"""
+        if iges_path not in self._iges_hashes:
+            try:
+                self._iges_hashes[iges_path] = hash_file(iges_path)
+            except OSError:
+                return None
+        return self._iges_hashes[iges_path]
+    
+    def _schedule_longest_first(self, iges_files: list, n_parallel: int) -> list:
         """
+        Ordina i file per durata stimata decrescente (longest-processing-time)
+        
+        La durata viene presa dallo storico dei tempi; i file mai elaborati
+        sono stimati dal costo del pre-flight o dalla dimensione.
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            n_parallel: Numero di worker/slot paralleli
+            
+        Returns:
+            Lista dei file nell'ordine di invio
+        """
+        def get_cost(iges_path: str) -> Optional[float]:
+            report = self.preflight_reports.get(iges_path)
+            return report.estimate_cost() if report else None
+        
+        estimates, known = estimate_durations(iges_files, self.timings,
+                                              self.get_iges_hash, get_cost)
+        ordered = order_longest_first(estimates)
+        self.log(f"📅 Ordinamento LPT: {known} file con tempi storici, "
+                 f"{len(ordered) - known} stimati")
+        if self.timings.entries:
+            makespan = estimate_makespan([estimates[path] for path in ordered], n_parallel)
+            self.log(f"   Durata stimata del batch: {makespan:.1f}s su {n_parallel} worker")
+        return ordered
+    
+    def _check_preflight(self, iges_path: str, stats: dict) -> bool:
+        """
+        Analizza un file IGES e lo scarta se corrotto
+        
+        I file scartati sono contati come falliti; il report resta in
+        preflight_reports per la stima del costo di elaborazione.
+        
+        Args:
+            iges_path: Percorso completo del file IGES
+            stats: Dizionario statistiche da aggiornare
+            
+        Returns:
+            True se il file può essere elaborato
+        """
+        report = analyze_iges(iges_path, signature=self.deduplicate)
+        self.preflight_reports[iges_path] = report
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        
+        if not report.is_valid:
+            stats["failed"] += 1
+            stats["rejected"] += 1
+            self.log(f"🚫 {basename} scartato: {'; '.join(report.errors)}")
+            return False
+        
+        for warning in report.warnings:
+            self.log(f"  ⚠ {basename}: {warning}")
+        return True
+    
+    def _run_preflight(self, iges_files: list, stats: dict) -> list:
+        """
+        Analizza i file IGES e scarta quelli corrotti prima di Strand7
+        
+        Args:
+            iges_files: Lista dei percorsi IGES da elaborare
+            stats: Dizionario statistiche da aggiornare
+            
+        Returns:
+            Lista dei file IGES validi
+        """
+        valid = [iges_path for iges_path in iges_files
+                 if self._check_preflight(iges_path, stats)]
+        total_cost = sum(self.preflight_reports[iges_path].estimate_cost() for iges_path in valid)
+        
+        self.log(f"🔍 Pre-flight IGES: {len(valid)} validi, "
+                 f"{len(iges_files) - len(valid)} scartati, costo stimato {total_cost:.0f}")
+        return valid
+    
+    def _scan_iges_state(self) -> dict:
+        """
+        Rileva lo stato corrente dei file IGES senza scriverlo nel log
+        
+        Returns:
+            Dizionario {percorso IGES: (dimensione, mtime_ns)}
+        """
+        state = {}
+        for iges_path in self.iter_iges_files(quiet=True):
+            try:
+                st = os.stat(iges_path)
+            except OSError:
+                continue  # File rimosso durante la scansione
+            state[iges_path] = (st.st_size, st.st_mtime_ns)
+        return state
+    
+    def _is_up_to_date(self, iges_path: str) -> bool:
+        """Verifica se esiste già un BXS più recente del file IGES"""
+        basename = os.path.splitext(os.path.basename(iges_path))[0]
+        bxs_output = os.path.join(self.output_folder, f"{basename}.bxs")
+        try:
+            return os.path.getmtime(bxs_output) >= os.path.getmtime(iges_path)
+        except OSError:
+            return False
+    
+    def watch(self, poll_interval: float = 2.0, settle_time: float = 5.0) -> dict:
+        """
+        Sorveglia la cartella IGES e genera i BXS dei file nuovi o modificati
+        
+        L'API Strand7 resta inizializzata fino a stop(). Un file viene elaborato
+        solo quando dimensione e data di modifica restano invariate per
+        settle_time secondi, così le copie ancora in corso vengono ignorate.
+        
+        Args:
+            poll_interval: Intervallo tra due scansioni della cartella (secondi)
+            settle_time: Tempo di stabilità richiesto prima dell'elaborazione (secondi)
+            
+        Returns:
+            dict con statistiche cumulative di elaborazione
+        """
+        result = self._watch(poll_interval, settle_time)
+        self._publish_summary(result)
+        return result
+    
+    def _watch(self, poll_interval: float, settle_time: float) -> dict:
+        """Corpo di watch(): il riepilogo viene pubblicato all'uscita"""
         if self.is_running:
             self.log("⚠ Processo già in esecuzione!")
             return {"status": "already_running"}
         
         self.is_running = True
         self.should_stop = False
+        self.file_records = []
+        self.dedupe_records = []
+        self._start_progress()
         
         stats = {
             "total": 0,
             "success": 0,
             "failed": 0,
-            "skipped": 0
+            "skipped": 0,
+            "cached": 0,
+            "rejected": 0,
+            "deduplicated": 0,
+            "known_failed": 0
         }
+        api_initialized = False
         
         try:
             self.log("\n" + "="*60)
-            self.log("🚀 AVVIO GENERAZIONE BXS")
+            self.log("👁 AVVIO SORVEGLIANZA CARTELLA IGES")
             self.log("="*60)
             
-            # Valida cartelle
             if not self.validate_folders():
                 self.log("❌ Validazione cartelle fallita. Processo interrotto.")
                 return {"status": "validation_failed", **stats}
+            self.purge_scratch()
+            self._open_section_store()
+            self._open_manifest()
+            self._open_failures()
             
-            # Inizializza API Strand7
             self.log("🔧 Inizializzazione Strand7 API...")
+            load_st7_api(self.api_module)
             ChkErr(St7API.St7Init())
+            api_initialized = True
             self.log("✓ API Strand7 inizializzata correttamente")
+            self.timings = TimingDatabase(os.path.join(self.output_folder, TIMINGS_FILE_NAME))
             
-            # Ottieni lista file IGES
-            iges_files = self.get_iges_files()
-            stats["total"] = len(iges_files)
+            # I file con un BXS già aggiornato non vengono rigenerati
+            processed = {path: file_state for path, file_state in self._scan_iges_state().items()
+                         if self._is_up_to_date(path)}
+            pending = {}  # {percorso: (stato, istante ultima variazione)}
+            self.log(f"📁 {len(processed)} file IGES già aggiornati, in attesa di modifiche "
+                     f"(scansione ogni {poll_interval:g}s)")
             
-            if stats["total"] == 0:
-                self.log("⚠ Nessun file IGES trovato nella cartella specificata")
-                return {"status": "no_files", **stats}
+            while not self.should_stop:
+                now = time.monotonic()
+                current = self._scan_iges_state()
+                
+                for path, file_state in current.items():
+                    if processed.get(path) == file_state:
+                        continue
+                    previous = pending.get(path)
+                    if previous is None or previous[0] != file_state:
+                        pending[path] = (file_state, now)
+                
+                for path in list(pending):
+                    if path not in current:
+                        del pending[path]
+                
+                ready = [path for path, (_, changed_at) in pending.items()
+                         if now - changed_at >= settle_time]
+                if ready:
+                    self.log(f"\n🔔 Rilevati {len(ready)} file IGES nuovi o modificati")
+                    for path in ready:
+                        processed[path] = pending.pop(path)[0]
+                    stats["total"] += len(ready)
+                    if self.use_cache:
+                        ready = self._restore_from_cache(ready, stats)
+                    ready = self._skip_known_failures(ready, stats)
+                    if self.preflight:
+                        ready = self._run_preflight(ready, stats)
+                    if self.deduplicate and ready:
+                        ready = self._deduplicate(ready)
+                    self._run_serial(ready, stats)
+                    self._write_dedupe_report(stats)
+                
+                deadline = time.monotonic() + poll_interval
+                while not self.should_stop and time.monotonic() < deadline:
+                    time.sleep(0.2)
             
-            # Processa ogni file
-            for idx, iges_path in enumerate(iges_files, 1):
-                if self.should_stop:
-                    stats["skipped"] = stats["total"] - idx + 1
-                    self.log(f"\n⏸ Processo interrotto dall'utente")
-                    self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
-                    break
+            self.log("\n" + "="*60)
+            self.log("📊 RIEPILOGO SORVEGLIANZA")
+            self.log("="*60)
+            self.log(f"  Totale file:        {stats['total']}")
+            self.log(f"  ✅ Successi:        {stats['success']}")
+            self.log(f"  ❌ Falliti:         {stats['failed']}")
+            if stats['cached'] > 0:
+                self.log(f"  💾 Da cache:        {stats['cached']}")
+            if stats['rejected'] > 0:
+                self.log(f"  🚫 Scartati:        {stats['rejected']}")
+            if stats['known_failed'] > 0:
+                self.log(f"  ⛔ Già falliti:     {stats['known_failed']}")
+            if stats['deduplicated'] > 0:
+                self.log(f"  🧬 Duplicati:       {stats['deduplicated']}")
+            self.log("="*60)
+            self._log_timing_summary()
+            return {"status": "stopped", **stats}
+            
+        except Exception as e:
+            self.log(f"\n❌ ERRORE CRITICO: {e}")
+            return {"status": "error", "error": str(e), **stats}
+        
+        finally:
+            if api_initialized:
+                try:
+                    St7API.St7Release()
+                    self.log("🔌 API Strand7 rilasciata")
+                except:
+                    pass
+            
+            if self.timings is not None:
+                try:
+                    self.timings.save()
+                except OSError as e:
+                    self.log(f"⚠ Impossibile salvare lo storico dei tempi: {e}")
+            self._close_section_store()
+            self._close_manifest()
+            self._close_failures()
+            self.purge_scratch()
+            self.is_running = False
+            self.log("\n✓ Sorveglianza terminata\n")
+    
+    def run(self) -> dict:
+        """
+        Esegue il processo completo di generazione BXS
+        
+        Returns:
+            dict con statistiche di elaborazione
+        """
+        result = self._run()
+        self._publish_summary(result)
+        return result
+    
+    def _run(self) -> dict:
+        """Corpo di run(): il riepilogo viene pubblicato all'uscita"""
+        if self.is_running:
+            self.log("⚠ Processo già in esecuzione!")
+            return {"status": "already_running"}
+        
+        self.is_running = True
+        self.should_stop = False
+        self.file_records = []
+        self.dedupe_records = []
+        self.memory = MemoryMonitor()
+        self._files_since_init = 0
+        self._start_progress()
+        
+        stats = {
+            "total": 0,
+            "success": 0,
+            "failed": 0,
+            "skipped": 0,
+            "cached": 0,
+            "rejected": 0,
+            "deduplicated": 0,
+            "resumed": 0,
+            "remote": 0,
+            "known_failed": 0
+        }
+        api_initialized = False
+        
+        def init_api():
+            nonlocal api_initialized
+            if api_initialized:
+                return
+            self.log("🔧 Inizializzazione Strand7 API...")
+            load_st7_api(self.api_module)
+            ChkErr(St7API.St7Init())
+            api_initialized = True
+            self.log("✓ API Strand7 inizializzata correttamente")
+        
+        try:
+            self.log("\n" + "="*60)
+            self.log("🚀 AVVIO GENERAZIONE BXS")
+            self.log("="*60)
+            
+            # Valida cartelle
+            if not self.validate_folders():
+                self.log("❌ Validazione cartelle fallita. Processo interrotto.")
+                return {"status": "validation_failed", **stats}
+            self.purge_scratch()
+            self._open_section_store()
+            self._open_manifest()
+            self._open_journal()
+            self._open_failures()
+            self._open_prefetcher()
+            
+            self.timings = TimingDatabase(os.path.join(self.output_folder, TIMINGS_FILE_NAME))
+            
+            if self.distributed:
+                # Coda condivisa con altre istanze: elaborazione seriale per istanza
+                iges_files = self.get_iges_files()
+                stats["total"] = len(iges_files)
+                if stats["total"] == 0:
+                    self.log("⚠ Nessun file IGES trovato nella cartella specificata")
+                    return {"status": "no_files", **stats}
+                self._run_distributed(iges_files, stats, init_api)
+            elif (self.workers == 1 and self.slots == 1
+                    and not self.deduplicate and not self.isolate):
+                # Elaborazione seriale: ogni file parte appena trovato
+                self.log("📁 Ricerca ed elaborazione dei file IGES...")
+                self._run_streaming(self.iter_iges_files(), stats, init_api)
+                if stats["total"] == 0:
+                    self.log("⚠ Nessun file IGES trovato nella cartella specificata")
+                    return {"status": "no_files", **stats}
+            else:
+                # Ottieni lista file IGES
+                iges_files = self.get_iges_files()
+                stats["total"] = len(iges_files)
                 
-                self.log(f"\n📊 Progresso: {idx}/{stats['total']}")
+                if stats["total"] == 0:
+                    self.log("⚠ Nessun file IGES trovato nella cartella specificata")
+                    return {"status": "no_files", **stats}
                 
-                if self.process_single_file(iges_path):
-                    stats["success"] += 1
-                else:
-                    stats["failed"] += 1
+                if self.resume:
+                    iges_files = self._skip_completed(iges_files, stats)
+                
+                if self.use_cache and iges_files:
+                    iges_files = self._restore_from_cache(iges_files, stats)
+                
+                iges_files = self._skip_known_failures(iges_files, stats)
+                
+                if self.preflight:
+                    iges_files = self._run_preflight(iges_files, stats)
+                
+                if self.deduplicate and iges_files:
+                    iges_files = self._deduplicate(iges_files)
+                
+                self.progress.total = len(iges_files)  # File da elaborare con Strand7 (ETA)
+                n_parallel = self.workers if self.workers > 1 or self.isolate else self.slots
+                if len(iges_files) > 1 and n_parallel > 1:
+                    iges_files = self._schedule_longest_first(iges_files, n_parallel)
+                
+                if iges_files and self.isolate:
+                    # Processi figli sorvegliati (ogni worker inizializza la propria API)
+                    self._run_supervised(iges_files, stats)
+                elif iges_files and self.workers > 1:
+                    # Processa in parallelo (ogni worker inizializza la propria API)
+                    self._run_parallel(iges_files, stats)
+                elif iges_files:
+                    init_api()
+                    if self.slots > 1:
+                        self._run_slots(iges_files, stats)
+                    else:
+                        self._run_serial(iges_files, stats)
+            
+            self._write_dedupe_report(stats)
             
             # Riepilogo finale
             self.log("\n" + "="*60)
@@ -244,11 +2345,24 @@ class BXSGenerator:
             self.log(f"  Totale file:        {stats['total']}")
             self.log(f"  ✅ Successi:        {stats['success']}")
             self.log(f"  ❌ Falliti:         {stats['failed']}")
+            if stats['cached'] > 0:
+                self.log(f"  💾 Da cache:        {stats['cached']}")
+            if stats['rejected'] > 0:
+                self.log(f"  🚫 Scartati:        {stats['rejected']}")
+            if stats['known_failed'] > 0:
+                self.log(f"  ⛔ Già falliti:     {stats['known_failed']}")
+            if stats['deduplicated'] > 0:
+                self.log(f"  🧬 Duplicati:       {stats['deduplicated']}")
+            if stats['resumed'] > 0:
+                self.log(f"  ⏩ Ripresi:         {stats['resumed']}")
+            if stats['remote'] > 0:
+                self.log(f"  🌐 Altre istanze:   {stats['remote']}")
             if stats['skipped'] > 0:
                 self.log(f"  ⏭ Saltati:          {stats['skipped']}")
             self.log("="*60)
+            self._log_timing_summary()
             
-            if stats['failed'] == 0 and stats['skipped'] == 0:
+            if stats['failed'] == 0 and stats['skipped'] == 0 and stats['known_failed'] == 0:
                 self.log("🎉 Tutti i file elaborati con successo!")
                 return {"status": "success", **stats}
             elif stats['success'] > 0:
@@ -264,11 +2378,23 @@ class BXSGenerator:
         
         finally:
             # Rilascia API Strand7
-            try:
-                St7API.St7Release()
-                self.log("🔌 API Strand7 rilasciata")
-            except:
-                pass
+            if api_initialized:
+                try:
+                    St7API.St7Release()
+                    self.log("🔌 API Strand7 rilasciata")
+                except:
+                    pass
             
+            if self.timings is not None:
+                try:
+                    self.timings.save()
+                except OSError as e:
+                    self.log(f"⚠ Impossibile salvare lo storico dei tempi: {e}")
+            self._close_section_store()
+            self._close_manifest()
+            self._close_journal()
+            self._close_failures()
+            self._close_prefetcher()
+            self.purge_scratch()
             self.is_running = False
             self.log("\n✓ Processo terminato\n")
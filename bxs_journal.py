@@ -0,0 +1,106 @@
+"""
+BXS Journal
+Diario append-only (con fsync) degli esiti per file, per riprendere un batch interrotto
+
+Ogni esito è una riga di testo separata da tabulazioni:
+    <esito>\t<chiave input>\t<nome file IGES>\t<secondi>
+dove la chiave combina hash del contenuto IGES e parametri di mesh
+(bxs_cache.make_cache_key). Vale l'ultima riga di ogni file; una riga
+troncata da un crash viene ignorata. Alla riapertura il diario viene
+compattato se le righe superate sono più di quelle valide.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+JOURNAL_NAME = ".bxs_journal.log"
+STATUS_DONE = "ok"
+STATUS_CACHED = "cached"
+STATUS_FAILED = "failed"
+COMPLETED_STATUSES = (STATUS_DONE, STATUS_CACHED)
+
+# ==============================================================================
+# CLASSE DIARIO
+# ==============================================================================
+class RunJournal:
+    """Esiti per file delle esecuzioni di BXSGenerator, scritti in modo durevole"""
+
+    def __init__(self, journal_path: str):
+        """
+        Apre (o crea) il diario e ne legge gli esiti
+
+        Args:
+            journal_path: Percorso del file di diario
+        """
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self.entries, n_lines = self._load()  # {nome file: (esito, chiave)}
+        if n_lines > 2 * len(self.entries):
+            self.compact()
+        self._file = open(journal_path, "a", encoding="utf-8")
+        if self._file.tell() > 0 and not self._ends_with_newline():
+            self._file.write("\n")  # Chiude la riga troncata prima di aggiungerne altre
+
+    def _ends_with_newline(self) -> bool:
+        """True se il diario termina con una riga completa"""
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self) -> Tuple[Dict[str, Tuple[str, str]], int]:
+        """Legge gli esiti (l'ultima riga di ogni file prevale)"""
+        entries = {}
+        n_lines = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    if len(fields) != 4 or not line.endswith("\n"):
+                        continue  # Riga troncata da un'interruzione
+                    status, key, name, _ = fields
+                    entries[name] = (status, key)
+                    n_lines += 1
+        except OSError:
+            pass
+        return entries, n_lines
+
+    def compact(self):
+        """Riscrive il diario con un solo esito per file (in modo atomico)"""
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for name, (status, key) in self.entries.items():
+                f.write(f"{status}\t{key}\t{name}\t0\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def record(self, name: str, key: Optional[str], status: str, seconds: float = 0.0):
+        """
+        Aggiunge l'esito di un file e lo rende durevole (fsync)
+
+        Args:
+            name: Nome del file IGES
+            key: Chiave degli input (hash IGES + parametri), "-" se non disponibile
+            status: Esito (STATUS_DONE, STATUS_CACHED, STATUS_FAILED)
+            seconds: Durata dell'elaborazione
+        """
+        key = key or "-"
+        with self._lock:
+            self.entries[name] = (status, key)
+            self._file.write(f"{status}\t{key}\t{name}\t{seconds:.3f}\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def is_completed(self, name: str, key: Optional[str]) -> bool:
+        """True se il file è già stato completato con gli stessi input"""
+        entry = self.entries.get(name)
+        return entry is not None and key is not None and \
+            entry[0] in COMPLETED_STATUSES and entry[1] == key
+
+    def close(self):
+        """Chiude il file di diario"""
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,98 @@
+"""
+BXS JSON Store
+Archivi JSON di voci (cache BXS, tempi, file falliti) condivisibili tra istanze
+
+Più istanze del generatore (coda distribuita) usano la stessa cartella di
+output. Ogni salvataggio rilegge il file su disco, applica solo le voci
+aggiunte, modificate o rimosse da questa istanza e lo sostituisce con un
+rename atomico da un file temporaneo con nome univoco (host, PID, thread):
+le voci scritte dalle altre istanze non vengono sovrascritte e due scritture
+contemporanee non condividono mai lo stesso file temporaneo. Resta una
+finestra in cui due salvataggi simultanei si sovrappongono: la voce persa è
+solo un dato di cache, che verrà ricalcolato.
+"""
+import os
+import json
+import socket
+import threading
+from typing import Optional
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def unique_tmp_path(path: str) -> str:
+    """Percorso temporaneo accanto a path, univoco per host, processo e thread"""
+    return f"{path}.{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}.tmp"
+
+def read_json_dict(path: str) -> dict:
+    """Legge un dizionario JSON (vuoto se il file è assente o illeggibile)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def write_json_atomic(path: str, data, indent: Optional[int] = None):
+    """Scrive un file JSON con un file temporaneo univoco e rename atomico"""
+    tmp_path = unique_tmp_path(path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# ==============================================================================
+# CLASSE ARCHIVIO
+# ==============================================================================
+class SharedJSONStore:
+    """Dizionario di voci salvato in JSON, unito al contenuto su disco a ogni salvataggio"""
+    json_indent = None  # Indentazione del file JSON
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Percorso del file JSON
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._changed = set()  # Chiavi scritte da questa istanza dall'ultimo salvataggio
+        self._removed = set()  # Chiavi rimosse da questa istanza dall'ultimo salvataggio
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        """Voci su disco (le sottoclassi possono filtrarle)"""
+        return read_json_dict(self.path)
+
+    def _set(self, key: str, entry: dict):
+        """Scrive una voce (con il lock acquisito)"""
+        self.entries[key] = entry
+        self._changed.add(key)
+        self._removed.discard(key)
+
+    def _pop(self, key: str) -> Optional[dict]:
+        """Rimuove una voce (con il lock acquisito)"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self._removed.add(key)
+            self._changed.discard(key)
+        return entry
+
+    def save(self):
+        """Unisce le modifiche di questa istanza al file su disco e lo sostituisce"""
+        with self._lock:
+            entries = self._load()
+            for key in self._removed:
+                entries.pop(key, None)
+            for key in self._changed:
+                if key in self.entries:
+                    entries[key] = self.entries[key]
+            write_json_atomic(self.path, entries, indent=self.json_indent)
+            self.entries = entries
+            self._changed.clear()
+            self._removed.clear()
@@ -0,0 +1,147 @@
+"""
+BXS Manifest
+Pubblicazione atomica dei file BXS e manifest dei file completati
+
+Il generatore scrive ogni BXS in una sottocartella temporanea della cartella
+di output e lo sposta al nome definitivo con un rename atomico: chi legge la
+cartella non vede mai un BXS scritto a metà. Completato il file (BXS ed
+eventuale .bxsx), una riga del manifest ne registra nome, dimensione e data
+di modifica: un consumatore può così elaborare la cartella mentre la
+generazione è ancora in corso, limitandosi ai file pubblicati.
+
+Formato del manifest (una riga per pubblicazione, l'ultima prevale):
+    <nome file BXS>\t<dimensione>\t<mtime_ns>
+"""
+import os
+import shutil
+import threading
+from typing import Dict, Optional, Tuple
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+MANIFEST_NAME = ".bxs_manifest.log"
+PARTIAL_FOLDER_NAME = ".bxs_partial"  # Sottocartella dei BXS in scrittura
+TEMP_SUFFIX = ".tmp"
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def publish_copy(source_path: str, dest_path: str, link: bool = False) -> str:
+    """
+    Copia (o collega con hard link) un file sul nome definitivo in modo atomico
+
+    Il file viene prima creato con un nome temporaneo nella stessa cartella
+    e poi rinominato: un hard link esistente sulla destinazione viene
+    sostituito, non sovrascritto.
+
+    Args:
+        source_path: File da pubblicare
+        dest_path: Percorso definitivo
+        link: Prova prima un hard link (ripiega sulla copia)
+
+    Returns:
+        "hardlink" o "copy"
+    """
+    tmp_path = dest_path + TEMP_SUFFIX
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    method = "copy"
+    try:
+        if link:
+            try:
+                os.link(source_path, tmp_path)
+                method = "hardlink"
+            except OSError:
+                shutil.copyfile(source_path, tmp_path)
+        else:
+            shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return method
+
+def _file_state(path: str) -> Optional[Tuple[int, int]]:
+    """Dimensione e data di modifica (ns) di un file, None se assente"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def read_manifest(folder: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Legge il manifest di una cartella BXS
+
+    Returns:
+        Dizionario {nome file BXS: (dimensione, mtime_ns)} (vuoto se assente)
+    """
+    entries = {}
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME), "r", encoding="utf-8",
+                  errors="replace") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) != 3 or not line.endswith("\n"):
+                    continue
+                try:
+                    entries[fields[0]] = (int(fields[1]), int(fields[2]))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+def is_published(entries: Dict[str, Tuple[int, int]], bxs_path: str) -> bool:
+    """True se il BXS su disco è quello registrato nel manifest"""
+    state = entries.get(os.path.basename(bxs_path))
+    return state is not None and state == _file_state(bxs_path)
+
+# ==============================================================================
+# CLASSE MANIFEST
+# ==============================================================================
+class PublicationManifest:
+    """Registro append-only (con fsync) dei BXS completati in una cartella"""
+
+    def __init__(self, folder: str):
+        """
+        Args:
+            folder: Cartella di output dei BXS
+        """
+        self.folder = folder
+        self.manifest_path = os.path.join(folder, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._file = open(self.manifest_path, "a", encoding="utf-8")
+        if self._file.tell() > 0 and not self._ends_with_newline():
+            self._file.write("\n")  # Chiude la riga troncata prima di aggiungerne altre
+
+    def _ends_with_newline(self) -> bool:
+        """True se il manifest termina con una riga completa"""
+        with open(self.manifest_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def publish(self, bxs_path: str) -> bool:
+        """
+        Registra un BXS completato con la sua dimensione e data di modifica
+
+        Returns:
+            False se il file non esiste
+        """
+        state = _file_state(bxs_path)
+        if state is None:
+            return False
+        with self._lock:
+            self._file.write(f"{os.path.basename(bxs_path)}\t{state[0]}\t{state[1]}\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        return True
+
+    def close(self):
+        """Chiude il manifest"""
+        with self._lock:
+            self._file.close()
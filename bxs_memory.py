@@ -0,0 +1,179 @@
+"""
+BXS Memory
+Misura della memoria residente (RSS) dei processi e andamento durante un batch
+
+La DLL Strand7 perde un po' di memoria a ogni ciclo St7NewFile/St7CloseFile:
+in un processo a 32 bit lo spazio di indirizzamento si esaurisce dopo
+migliaia di file. Questo modulo misura l'RSS senza dipendenze esterne
+(API Win32 o /proc) e ne stima la crescita per file.
+"""
+import os
+import sys
+import ctypes
+from typing import Dict, List, Optional
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+DEFAULT_RECYCLE_RSS_BYTES = 1200 * 1024**2  # Sotto il limite di 2 GB di un processo a 32 bit
+TREND_WINDOW = 50  # Ultimi campioni usati per stimare la crescita per file
+
+# ==============================================================================
+# LETTURA RSS
+# ==============================================================================
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    class _ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _PROCESS_VM_READ = 0x0010
+    _STILL_ACTIVE = 259
+
+    def is_process_alive(pid: int) -> bool:
+        """True se un processo con questo PID è in esecuzione"""
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = wintypes.DWORD()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    def get_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+        """
+        Memoria residente (working set) di un processo in byte
+
+        Args:
+            pid: PID del processo (None per il processo corrente)
+
+        Returns:
+            Byte residenti, o None se non misurabile
+        """
+        kernel32 = ctypes.windll.kernel32
+        counters = _ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if pid is None or pid == os.getpid():
+            handle, owned = kernel32.GetCurrentProcess(), False
+        else:
+            handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION | _PROCESS_VM_READ,
+                                          False, pid)
+            owned = True
+            if not handle:
+                return None
+        try:
+            if not kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters),
+                                                    counters.cb):
+                return None
+            return counters.WorkingSetSize
+        finally:
+            if owned:
+                kernel32.CloseHandle(handle)
+else:
+    def is_process_alive(pid: int) -> bool:
+        """True se un processo con questo PID è in esecuzione"""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # Processo di un altro utente
+        except OSError:
+            return False
+        return True
+
+    def get_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+        """
+        Memoria residente di un processo in byte (da /proc)
+
+        Args:
+            pid: PID del processo (None per il processo corrente)
+
+        Returns:
+            Byte residenti, o None se non misurabile
+        """
+        try:
+            with open(f"/proc/{pid or 'self'}/statm", "r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+
+def format_bytes(n_bytes: Optional[float]) -> str:
+    """Formatta una quantità di memoria in MB"""
+    return "n/d" if n_bytes is None else f"{n_bytes / 1024**2:.0f} MB"
+
+# ==============================================================================
+# CLASSE MONITOR MEMORIA
+# ==============================================================================
+class MemoryMonitor:
+    """Campioni RSS per processo, con picco e crescita media per file"""
+
+    def __init__(self):
+        self.samples = {}  # {pid: [rss dopo ogni file]} della serie in corso
+        self.closed = []   # Serie chiuse da un riciclo
+        self.recycles = 0
+
+    def add(self, pid: Optional[int], rss: Optional[int]):
+        """Registra l'RSS di un processo dopo un file"""
+        if rss is not None:
+            self.samples.setdefault(pid, []).append(rss)
+
+    def reset(self, pid: Optional[int]):
+        """Segna il riciclo di un processo: la serie successiva riparte da capo"""
+        self.recycles += 1
+        series = self.samples.pop(pid, None)
+        if series:
+            self.closed.append(series)
+
+    @staticmethod
+    def growth_per_file(series: List[int]) -> Optional[float]:
+        """Crescita media in byte per file (regressione lineare sugli ultimi campioni)"""
+        window = series[-TREND_WINDOW:]
+        n = len(window)
+        if n < 3:
+            return None
+        mean_x = (n - 1) / 2.0
+        mean_y = sum(window) / n
+        covariance = sum((i - mean_x) * (y - mean_y) for i, y in enumerate(window))
+        variance = sum((i - mean_x) ** 2 for i in range(n))
+        return covariance / variance
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Picco, ultimo valore e crescita massima per file fra i processi"""
+        series = [values for values in list(self.samples.values()) + self.closed if values]
+        if not series:
+            return {"peak": None, "last": None, "growth_per_file": None}
+        growths = [g for g in map(self.growth_per_file, series) if g is not None]
+        current = [values for values in self.samples.values() if values] or series
+        return {
+            "peak": max(max(values) for values in series),
+            "last": max(values[-1] for values in current),
+            "growth_per_file": max(growths) if growths else None,
+        }
+
+    def format_summary(self) -> Optional[str]:
+        """Riga di log con l'andamento della memoria (None senza campioni)"""
+        summary = self.summary()
+        if summary["peak"] is None:
+            return None
+        growth = summary["growth_per_file"]
+        trend = f", crescita {growth / 1024:+.0f} KB/file" if growth is not None else ""
+        recycles = f", ricicli {self.recycles}" if self.recycles else ""
+        return (f"🧠 Memoria: picco {format_bytes(summary['peak'])}, "
+                f"ultimo {format_bytes(summary['last'])}{trend}{recycles}")
@@ -0,0 +1,246 @@
+"""
+BXS Prefetch
+Lettura anticipata dei file IGES su disco locale mentre Strand7 elabora il file corrente
+
+Quando la cartella IGES è su una condivisione di rete, St7ImportIGESFile
+attende l'I/O prima di iniziare la mesh. Un thread in background copia i
+prossimi file della coda in una sottocartella scratch (modalità "copy"),
+oppure li legge per scaldare la cache del sistema operativo (modalità
+"warm"), così l'import legge da storage locale. Ogni copia conserva il nome
+originale in una propria sottocartella (<local>/<contatore>/<nome>): Strand7
+vede lo stesso nome di file anche se file omonimi di cartelle diverse sono
+anticipati insieme. Il numero di file anticipati (depth) e i byte presenti
+in locale (max_bytes) sono limitati.
+
+    prefetcher = IGESPrefetcher(folder, depth=2)
+    prefetcher.submit(iges_files)
+    for iges_path in iges_files:
+        local_path = prefetcher.acquire(iges_path)
+        ...  # import da local_path
+        prefetcher.release(iges_path)
+    prefetcher.close()
+"""
+import os
+import time
+import shutil
+import threading
+from collections import deque
+from typing import Iterable, Optional
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+PREFETCH_FOLDER_NAME = "prefetch"  # Sottocartella della cartella scratch
+PREFETCH_MODES = ("copy", "warm")
+DEFAULT_PREFETCH_DEPTH = 2                   # File anticipati oltre a quello in uso
+DEFAULT_PREFETCH_MAX_BYTES = 256 * 1024**2   # Byte in locale (256 MB)
+COPY_CHUNK_BYTES = 1024**2
+
+# Stati di un file in coda
+STATE_COPYING = "copying"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+# ==============================================================================
+# CLASSE PREFETCH
+# ==============================================================================
+class IGESPrefetcher:
+    """Copia (o legge) in anticipo i prossimi file IGES con profondità e byte limitati"""
+
+    def __init__(self, local_folder: str, mode: str = "copy",
+                 depth: int = DEFAULT_PREFETCH_DEPTH,
+                 max_bytes: int = DEFAULT_PREFETCH_MAX_BYTES):
+        """
+        Args:
+            local_folder: Cartella locale delle copie (creata se necessario,
+                          eliminata da close())
+            mode: "copy" per copiare i file in local_folder, "warm" per
+                  leggerli soltanto (cache del sistema operativo)
+            depth: File anticipati e non ancora in uso
+            max_bytes: Byte massimi dei file anticipati o in uso; un file più
+                       grande viene comunque anticipato se è l'unico
+        """
+        if mode not in PREFETCH_MODES:
+            raise ValueError(f"Modalità di prefetch sconosciuta: {mode}")
+        self.local_folder = local_folder
+        self.mode = mode
+        self.depth = max(1, int(depth))
+        self.max_bytes = max_bytes
+        self.stats = {"prefetched": 0, "bytes": 0, "hits": 0, "misses": 0,
+                      "errors": 0, "wait_seconds": 0.0}
+        self._plan = deque()  # File da anticipare, in ordine di elaborazione
+        self._entries = {}    # {percorso IGES: stato del file anticipato}
+        self._ahead = 0       # File anticipati (o in copia) non ancora acquisiti
+        self._bytes = 0       # Byte dei file anticipati o in uso
+        self._counter = 0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = None
+        if mode == "copy":
+            os.makedirs(local_folder, exist_ok=True)
+
+    def submit(self, iges_paths: Iterable[str]):
+        """Accoda file da anticipare, nell'ordine in cui verranno acquisiti"""
+        with self._condition:
+            for iges_path in iges_paths:
+                if iges_path not in self._entries and iges_path not in self._plan:
+                    self._plan.append(iges_path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="bxs-prefetch",
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _has_room(self, size: int) -> bool:
+        """True se un file di size byte rientra nei limiti di profondità e byte"""
+        if self._ahead >= self.depth:
+            return False
+        return self._bytes == 0 or self._bytes + size <= self.max_bytes
+
+    def _worker(self):
+        """Thread in background: anticipa i file accodati rispettando i limiti"""
+        while True:
+            with self._condition:
+                while not self._closing:
+                    if self._plan:
+                        try:
+                            size = os.path.getsize(self._plan[0])
+                        except OSError:
+                            size = 0
+                        if self._has_room(size):
+                            break
+                    self._condition.wait()
+                if self._closing:
+                    return
+                iges_path = self._plan.popleft()
+                self._counter += 1
+                local_path = iges_path
+                if self.mode == "copy":
+                    local_path = os.path.join(self.local_folder, f"{self._counter:06d}",
+                                              os.path.basename(iges_path))
+                entry = {"state": STATE_COPYING, "local": local_path, "size": size,
+                         "acquired": False, "abandoned": False}
+                self._entries[iges_path] = entry
+                self._ahead += 1
+                self._bytes += size
+
+            try:
+                self._fetch(iges_path, local_path)
+                state = STATE_READY
+            except OSError:
+                state = STATE_FAILED
+                self._remove_local(entry)
+
+            with self._condition:
+                entry["state"] = state
+                if state == STATE_READY:
+                    self.stats["prefetched"] += 1
+                    self.stats["bytes"] += size
+                else:
+                    self.stats["errors"] += 1
+                abandoned = entry["abandoned"]
+                if abandoned:
+                    self._discard(iges_path, entry)
+                self._condition.notify_all()
+            if abandoned:
+                self._remove_local(entry)
+
+    def _fetch(self, iges_path: str, local_path: str):
+        """Copia (o legge) un file a blocchi, interrompibile da close()"""
+        with open(iges_path, "rb") as src:
+            if self.mode == "warm":
+                while src.read(COPY_CHUNK_BYTES) and not self._closing:
+                    pass
+                return
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, "wb") as dst:
+                while not self._closing:
+                    chunk = src.read(COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+        if self._closing:
+            raise OSError("prefetch interrotto")
+        shutil.copystat(iges_path, local_path)
+
+    def _remove_local(self, entry: dict):
+        """Elimina la copia locale e la sua sottocartella"""
+        if self.mode == "copy":
+            shutil.rmtree(os.path.dirname(entry["local"]), ignore_errors=True)
+
+    def acquire(self, iges_path: str) -> str:
+        """
+        Percorso da cui leggere un file IGES
+
+        Attende la fine della copia se è in corso. Un file non ancora
+        anticipato viene tolto dalla coda e letto dal percorso originale.
+
+        Args:
+            iges_path: Percorso originale del file IGES
+
+        Returns:
+            Copia locale (modalità "copy") o percorso originale
+        """
+        start = time.perf_counter()
+        with self._condition:
+            entry = self._entries.get(iges_path)
+            if entry is None:
+                if iges_path in self._plan:
+                    self._plan.remove(iges_path)
+                self.stats["misses"] += 1
+                return iges_path
+            while entry["state"] == STATE_COPYING:
+                self._condition.wait()
+            self.stats["wait_seconds"] += time.perf_counter() - start
+            if not entry["acquired"]:
+                entry["acquired"] = True
+                self._ahead -= 1
+                self._condition.notify_all()
+            if entry["state"] != STATE_READY:
+                self.stats["misses"] += 1
+                return iges_path
+            self.stats["hits"] += 1
+            return entry["local"]
+
+    def _discard(self, iges_path: str, entry: dict):
+        """Toglie un file dai conteggi di profondità e byte (con il lock acquisito)"""
+        del self._entries[iges_path]
+        if not entry["acquired"]:
+            self._ahead -= 1
+        self._bytes -= entry["size"]
+
+    def release(self, iges_path: str):
+        """
+        Elimina la copia locale di un file già elaborato e libera spazio per i successivi
+
+        Un file rilasciato senza essere acquisito (elaborazione fallita prima
+        dell'import) viene tolto dalla coda; se è in copia, la copia viene
+        eliminata dal thread appena terminata.
+        """
+        with self._condition:
+            entry = self._entries.get(iges_path)
+            if entry is None:
+                if iges_path in self._plan:
+                    self._plan.remove(iges_path)
+                return
+            if entry["state"] == STATE_COPYING:
+                entry["abandoned"] = True
+                return
+            self._discard(iges_path, entry)
+            self._condition.notify_all()
+        self._remove_local(entry)
+
+    def close(self):
+        """Ferma il thread, elimina le copie rimaste e la cartella locale"""
+        with self._condition:
+            self._closing = True
+            self._plan.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for entry in self._entries.values():
+            self._remove_local(entry)
+        self._entries.clear()
+        if self.mode == "copy":
+            shutil.rmtree(self.local_folder, ignore_errors=True)
@@ -5,9 +5,8 @@ Assegna proprietà beam con sezioni BXS a un file Strand7 esistente
 import os
 import sys
 import ctypes
-import glob
-from typing import Callable, Optional, List, Tuple
-from datetime import datetime
+import time
+from typing import Callable, Iterator, Optional, List, Tuple
 
 # ==============================================================================
 # CONFIGURAZIONE STRAND7 API
@@ -27,6 +26,12 @@ try:
 except Exception as e:
     raise ImportError(f"Errore durante l'importazione di St7API: {e}")
 
+from file_discovery import iter_files, BXS_EXTENSIONS
+from section_store import SectionStore, SECTION_STORE_NAME
+from bxs_manifest import read_manifest, is_published
+from bxs_async import AsyncEngineMixin
+from bxs_events import EventSourceMixin, FileStartedEvent, StageFinishedEvent
+
 # ==============================================================================
 # COSTANTI STRAND7
 # ==============================================================================
@@ -60,7 +65,7 @@ def ChkErr(ErrorCode):
 # ==============================================================================
 # CLASSE PER ASSEGNAZIONE PROPRIETÀ BXS
 # ==============================================================================
-class BXSPropertyAssigner:
+class BXSPropertyAssigner(EventSourceMixin, AsyncEngineMixin):
     """Gestisce l'assegnazione di proprietà beam con sezioni BXS"""
     
     def __init__(self, 
@@ -70,7 +75,12 @@ class BXSPropertyAssigner:
                  material_item_id: int = 2,
                  beam_type: int = kBeamTypeBeam,
                  property_name_prefix: str = "BXS_",
-                 log_callback: Optional[Callable[[str], None]] = None):
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 recursive: bool = False,
+                 include_patterns: Optional[List[str]] = None,
+                 exclude_patterns: Optional[List[str]] = None,
+                 sort_files: bool = True,
+                 published_only: bool = False):
         """
         Inizializza l'assegnatore di proprietà BXS
         
@@ -82,6 +92,14 @@ class BXSPropertyAssigner:
             beam_type: Tipo di beam (default: kBeamTypeBeam)
             property_name_prefix: Prefisso per i nomi delle proprietà
             log_callback: Funzione callback per i log
+            recursive: Cerca i file BXS anche nelle sottocartelle
+            include_patterns: Pattern glob dei file BXS da assegnare
+            exclude_patterns: Pattern glob di file o sottocartelle da ignorare
+            sort_files: Assegna i file in ordine alfabetico (False per iniziare
+                        senza attendere la lettura completa della cartella)
+            published_only: Assegna solo i BXS registrati nel manifest del
+                            generatore, così la cartella può essere letta
+                            mentre la generazione è ancora in corso
         """
         self.st7_file_path = st7_file_path
         self.bxs_folder = bxs_folder
@@ -90,20 +108,17 @@ class BXSPropertyAssigner:
         self.beam_type = beam_type
         self.property_name_prefix = property_name_prefix
         self.log_callback = log_callback
+        self.recursive = recursive
+        self.include_patterns = include_patterns
+        self.exclude_patterns = exclude_patterns
+        self.sort_files = sort_files
+        self.published_only = published_only
+        self.section_store = None  # Proprietà di sezione salvate dal generatore BXS
         
         self.uID = 1
         self.is_running = False
         self.should_stop = False
     
-    def log(self, message: str):
-        """Invia messaggio al log con timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        if self.log_callback:
-            self.log_callback(formatted_message)
-        else:
-            print(formatted_message)
-    
     def validate_inputs(self) -> bool:
         """Valida i file e cartelle di input"""
         # Verifica file .st7
@@ -122,6 +137,24 @@ class BXSPropertyAssigner:
         
         return True
     
+    def iter_bxs_files(self) -> Iterator[Tuple[str, str]]:
+        """
+        Restituisce i file BXS man mano che vengono trovati nella cartella
+        
+        Yields:
+            Tuple (nome_base, percorso_completo)
+        """
+        manifest = read_manifest(self.bxs_folder) if self.published_only else None
+        for file_path in iter_files(self.bxs_folder, BXS_EXTENSIONS,
+                                    recursive=self.recursive,
+                                    include=self.include_patterns,
+                                    exclude=self.exclude_patterns,
+                                    sort=self.sort_files):
+            if manifest is not None and not is_published(manifest, file_path):
+                continue
+            basename = os.path.splitext(os.path.basename(file_path))[0]
+            yield basename, file_path
+    
     def get_bxs_files(self) -> List[Tuple[str, str]]:
         """
         Trova tutti i file BXS nella cartella
@@ -129,17 +162,38 @@ class BXSPropertyAssigner:
         Returns:
             Lista di tuple (nome_base, percorso_completo)
         """
-        pattern = os.path.join(self.bxs_folder, "*.bxs")
-        files = glob.glob(pattern)
-        
-        bxs_list = []
-        for file_path in sorted(files):
-            basename = os.path.splitext(os.path.basename(file_path))[0]
-            bxs_list.append((basename, file_path))
-        
+        bxs_list = list(self.iter_bxs_files())
         self.log(f"📁 Trovati {len(bxs_list)} file(s) BXS")
         return bxs_list
     
+    def open_section_store(self):
+        """Apre l'archivio delle proprietà di sezione della cartella BXS, se presente"""
+        db_path = os.path.join(self.bxs_folder, SECTION_STORE_NAME)
+        if not os.path.exists(db_path):
+            return
+        try:
+            self.section_store = SectionStore(db_path)
+            self.log("📚 Archivio proprietà di sezione trovato")
+        except Exception as e:
+            self.log(f"⚠ Archivio proprietà di sezione non leggibile: {e}")
+    
+    def get_section_properties(self, basename: str) -> Optional[dict]:
+        """
+        Restituisce le proprietà di sezione calcolate alla generazione del BXS
+        
+        Args:
+            basename: Nome base del file BXS
+            
+        Returns:
+            Dizionario delle proprietà o None se non archiviate
+        """
+        if self.section_store is None:
+            return None
+        try:
+            return self.section_store.get(basename)
+        except Exception:
+            return None
+    
     def get_total_beam_properties(self) -> Tuple[int, int]:
         """
         Ottiene il numero totale e il numero più alto di proprietà beam
@@ -259,6 +313,17 @@ class BXSPropertyAssigner:
             True se successo
         """
         prop_name = f"{self.property_name_prefix}{basename}"
+        stage_start = time.perf_counter()
+        
+        def end_stage(name: str):
+            nonlocal stage_start
+            now = time.perf_counter()
+            if self.subscribers:
+                self.publish(StageFinishedEvent(bxs_path, name, now - stage_start))
+            stage_start = now
+        
+        if self.subscribers:
+            self.publish(FileStartedEvent(bxs_path))
         
         try:
             self.log(f"\n{'─'*60}")
@@ -274,6 +339,7 @@ class BXSPropertyAssigner:
             
             if not self.save_file():
                 return False
+            end_stage("create_property")
             
             # 2. Assegna materiale
             self.log(f"  [2/4] Assegnazione materiale (Lib:{self.material_library_id}, Item:{self.material_item_id})...")
@@ -282,14 +348,21 @@ class BXSPropertyAssigner:
             
             if not self.save_file():
                 return False
+            end_stage("assign_material")
             
             # 3. Assegna BXS
             self.log(f"  [3/4] Assegnazione sezione BXS...")
             if not self.assign_bxs(prop_num, bxs_path):
                 return False
             
+            section = self.get_section_properties(basename)
+            if section is not None:
+                self.log(f"  📊 A = {section['area']:.6g}, I11 = {section['i11']:.6g}, "
+                         f"I22 = {section['i22']:.6g}, J = {section['j']:.6g}")
+            
             if not self.save_file():
                 return False
+            end_stage("assign_bxs")
             
             # 4. Salvataggio finale
             self.log(f"  [4/4] Salvataggio completato")
@@ -313,12 +386,19 @@ class BXSPropertyAssigner:
         Returns:
             dict con statistiche di elaborazione
         """
+        result = self._run()
+        self._publish_summary(result)
+        return result
+    
+    def _run(self) -> dict:
+        """Corpo di run(): il riepilogo viene pubblicato all'uscita"""
         if self.is_running:
             self.log("⚠ Processo già in esecuzione!")
             return {"status": "already_running"}
         
         self.is_running = True
         self.should_stop = False
+        self._start_progress()
         
         stats = {
             "total": 0,
@@ -349,34 +429,35 @@ class BXSPropertyAssigner:
             
             # Ottieni proprietà beam esistenti
             total_props, last_prop = self.get_total_beam_properties()
-            
-            # Ottieni lista file BXS
-            bxs_files = self.get_bxs_files()
-            stats["total"] = len(bxs_files)
-            
-            if stats["total"] == 0:
-                self.log("⚠ Nessun file BXS trovato nella cartella specificata")
-                return {"status": "no_files", **stats}
+            self.open_section_store()
             
             # Determina il numero di partenza per le nuove proprietà
             start_prop_num = last_prop + 1
-            self.log(f"🔢 Numerazione proprietà: da {start_prop_num} a {start_prop_num + stats['total'] - 1}")
+            self.log(f"🔢 Numerazione proprietà: a partire da {start_prop_num}")
             
-            # Processa ogni file BXS
+            # Processa ogni file BXS man mano che viene trovato
+            bxs_files = self.iter_bxs_files()
             for idx, (basename, bxs_path) in enumerate(bxs_files, 1):
+                stats["total"] = idx
                 if self.should_stop:
-                    stats["skipped"] = stats["total"] - idx + 1
+                    remaining = sum(1 for _ in bxs_files)
+                    stats["total"] += remaining
+                    stats["skipped"] = remaining + 1
                     self.log(f"\n⏸ Processo interrotto dall'utente")
                     self.log(f"   File rimanenti non elaborati: {stats['skipped']}")
                     break
                 
                 prop_num = start_prop_num + idx - 1
-                self.log(f"\n📊 Progresso: {idx}/{stats['total']}")
+                self.log(f"\n📊 Progresso: file {idx}")
                 
-                if self.process_single_bxs(prop_num, basename, bxs_path):
-                    stats["success"] += 1
-                else:
-                    stats["failed"] += 1
+                item_start = time.perf_counter()
+                success = self.process_single_bxs(prop_num, basename, bxs_path)
+                stats["success" if success else "failed"] += 1
+                self._item_done(bxs_path, success, time.perf_counter() - item_start)
+            
+            if stats["total"] == 0:
+                self.log("⚠ Nessun file BXS trovato nella cartella specificata")
+                return {"status": "no_files", **stats}
             
             # Riepilogo finale
             self.log("\n" + "="*60)
@@ -420,6 +501,10 @@ class BXSPropertyAssigner:
             except:
                 pass
             
+            if self.section_store is not None:
+                self.section_store.close()
+                self.section_store = None
+            
             self.is_running = False
             self.log("\n✓ Processo terminato\n")
 
@@ -428,14 +513,16 @@ class BXSPropertyAssigner:
 # ESEMPIO DI UTILIZZO
 # ==============================================================================
 if __name__ == "__main__":
-    # Configurazione
-    st7_file = r"C:\Users\rosso\Desktop\test_model.st7"
-    bxs_folder = r"C:\Users\rosso\Desktop\BXS test\BXS_output"
+    # Uso: python bxs_property_assigner.py <file.st7> <cartella BXS>
+    # (per job pianificati con più motori vedere bxs_cli.py)
+    if len(sys.argv) != 3:
+        print("Uso: python bxs_property_assigner.py <file.st7> <cartella BXS>")
+        sys.exit(2)
     
     # Crea assegnatore
     assigner = BXSPropertyAssigner(
-        st7_file_path=st7_file,
-        bxs_folder=bxs_folder,
+        st7_file_path=sys.argv[1],
+        bxs_folder=sys.argv[2],
         material_library_id=16,
         material_item_id=2,
         beam_type=kBeamTypeBeam,
@@ -446,3 +533,4 @@ if __name__ == "__main__":
     result = assigner.run()
     
     print(f"\nRisultato: {result}")
+    sys.exit(0 if result.get("status") == "success" else 1)
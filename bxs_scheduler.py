@@ -0,0 +1,157 @@
+"""
+BXS Scheduler
+Database dei tempi di elaborazione e ordinamento longest-processing-time-first
+"""
+import os
+import heapq
+import statistics
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bxs_json_store import SharedJSONStore
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+TIMINGS_FILE_NAME = ".bxs_timings.json"
+TIMING_SMOOTHING = 0.5  # Peso della misura più recente nella media esponenziale
+
+# ==============================================================================
+# CLASSE DATABASE TEMPI
+# ==============================================================================
+class TimingDatabase(SharedJSONStore):
+    """
+    Tempi di elaborazione per file IGES, indicizzati per hash del contenuto
+
+    Il salvataggio unisce le voci al file su disco: istanze diverse che
+    condividono la cartella di output non si sovrascrivono i tempi.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Inizializza il database dei tempi
+
+        Args:
+            db_path: Percorso del file JSON del database
+        """
+        super().__init__(db_path)
+        self.db_path = db_path
+
+    def record(self, iges_hash: str, seconds: float, cost: Optional[float], size: int):
+        """
+        Registra la durata di un'elaborazione riuscita
+
+        Args:
+            iges_hash: Hash del contenuto IGES
+            seconds: Durata misurata
+            cost: Costo stimato dal pre-flight (None se non disponibile)
+            size: Dimensione del file IGES in byte
+        """
+        with self._lock:
+            entry = self.entries.get(iges_hash)
+            if entry is not None:
+                seconds = TIMING_SMOOTHING * seconds + (1 - TIMING_SMOOTHING) * entry["seconds"]
+            self._set(iges_hash, {
+                "seconds": seconds,
+                "cost": cost,
+                "size": size,
+                "runs": (entry["runs"] + 1) if entry else 1,
+            })
+
+    def get(self, iges_hash: str) -> Optional[float]:
+        """Restituisce la durata storica di un file, se nota"""
+        entry = self.entries.get(iges_hash)
+        return entry["seconds"] if entry else None
+
+    def rates(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Calcola i secondi per unità di costo e per byte dallo storico
+
+        Returns:
+            Tupla (secondi per unità di costo, secondi per byte), None se
+            lo storico non contiene dati sufficienti
+        """
+        per_cost = [e["seconds"] / e["cost"] for e in self.entries.values() if e.get("cost")]
+        per_byte = [e["seconds"] / e["size"] for e in self.entries.values() if e.get("size")]
+        return (statistics.median(per_cost) if per_cost else None,
+                statistics.median(per_byte) if per_byte else None)
+
+# ==============================================================================
+# ORDINAMENTO
+# ==============================================================================
+def estimate_durations(iges_files: List[str],
+                       timings: TimingDatabase,
+                       get_hash: Callable[[str], Optional[str]],
+                       get_cost: Callable[[str], Optional[float]]) -> Tuple[Dict[str, float], int]:
+    """
+    Stima la durata di ogni file dallo storico, o da costo/dimensione se nuovo
+
+    Con uno storico tutte le stime sono in secondi: il costo e la dimensione
+    dei file nuovi vengono convertiti con i rispettivi tassi (rates()), e un
+    file senza né costo né tasso applicabile riceve la durata mediana.
+    Senza storico le stime sono solo un ordine relativo, calcolato con una
+    sola metrica per tutto il batch: il costo se è noto per ogni file,
+    altrimenti la dimensione.
+
+    Args:
+        iges_files: Lista dei percorsi IGES
+        timings: Database dei tempi
+        get_hash: Funzione che restituisce l'hash IGES di un percorso
+        get_cost: Funzione che restituisce il costo stimato dal pre-flight
+
+    Returns:
+        Tupla ({percorso: stima}, numero di file con storico); la stima è in
+        secondi se il database contiene almeno un tempo
+    """
+    estimates = {}
+    pending = []  # (percorso, costo, dimensione) dei file senza storico
+
+    for iges_path in iges_files:
+        iges_hash = get_hash(iges_path)
+        seconds = timings.get(iges_hash) if iges_hash else None
+        if seconds is not None:
+            estimates[iges_path] = seconds
+            continue
+        try:
+            size = os.path.getsize(iges_path)
+        except OSError:
+            size = 0
+        pending.append((iges_path, get_cost(iges_path), size))
+    known = len(estimates)
+
+    if not timings.entries:
+        # Nessuno storico: ordine relativo con una sola metrica
+        use_cost = all(cost for _, cost, _ in pending)
+        for iges_path, cost, size in pending:
+            estimates[iges_path] = cost if use_cost else size
+        return estimates, known
+
+    rate_cost, rate_byte = timings.rates()
+    typical = statistics.median(entry["seconds"] for entry in timings.entries.values())
+    for iges_path, cost, size in pending:
+        if cost and rate_cost:
+            estimates[iges_path] = cost * rate_cost
+        elif size and rate_byte:
+            estimates[iges_path] = size * rate_byte
+        else:
+            estimates[iges_path] = typical
+    return estimates, known
+
+def order_longest_first(estimates: Dict[str, float]) -> List[str]:
+    """Ordina i file dal più lungo al più breve (LPT)"""
+    return sorted(estimates, key=lambda path: -estimates[path])
+
+def estimate_makespan(durations: List[float], n_workers: int) -> float:
+    """
+    Simula l'assegnazione greedy dei file ai worker nell'ordine dato
+
+    Args:
+        durations: Durate stimate nell'ordine di invio
+        n_workers: Numero di worker paralleli
+
+    Returns:
+        Tempo stimato di completamento dell'intero batch
+    """
+    loads = [0.0] * max(1, n_workers)
+    for duration in durations:
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
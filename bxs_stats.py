@@ -0,0 +1,154 @@
+"""
+BXS Stats
+Statistiche dei tempi per fase di generazione BXS ed esportazione JSON/CSV
+"""
+import os
+import csv
+import json
+import math
+from typing import Dict, List
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+# Fasi di process_single_file nell'ordine di esecuzione
+STAGES = (
+    "new_file",
+    "import_iges",
+    "surface_mesh",
+    "clean_mesh",
+    "generate_bxs",
+    "export_section",
+    "save_close",
+)
+
+STAGE_LABELS = {
+    "new_file": "Nuovo file",
+    "import_iges": "Import IGES",
+    "surface_mesh": "Mesh superficiale",
+    "clean_mesh": "Pulizia mesh",
+    "generate_bxs": "Generazione BXS",
+    "export_section": "Esportazione .bxsx",
+    "save_close": "Salva/chiudi",
+}
+
+PERCENTILES = (50, 90, 99)
+SLOWEST_FILES = 5
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def new_file_record(iges_path: str) -> dict:
+    """Crea il record strutturato di un file da elaborare"""
+    return {
+        "file": os.path.basename(iges_path),
+        "success": False,
+        "error": None,
+        "error_code": None,  # Codice di errore Strand7 (ChkErr), se disponibile
+        "failed_stage": None,  # Fase in cui il file è fallito
+        "plates": None,
+        "section": None,  # Proprietà prop_bxs di St7GenerateBXS
+        "stages": {},
+        "total": 0.0,
+        "pid": None,  # Processo che ha elaborato il file
+        "rss": None,  # Memoria residente del processo a fine file (byte)
+    }
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Percentile con interpolazione lineare (come numpy.percentile)
+
+    Args:
+        values: Valori (anche non ordinati)
+        q: Percentile richiesto (0-100)
+
+    Returns:
+        Valore del percentile, 0 se la lista è vuota
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize_stages(records: List[dict]) -> Dict[str, dict]:
+    """
+    Calcola i percentili per fase sui record completati
+
+    Returns:
+        Dizionario {fase: {"count", "total", "p50", "p90", "p99", "max"}}
+    """
+    summary = {}
+    for stage in STAGES + ("total",):
+        if stage == "total":
+            values = [r["total"] for r in records if r["success"]]
+        else:
+            values = [r["stages"][stage] for r in records if stage in r["stages"]]
+        if not values:
+            continue
+        summary[stage] = {
+            "count": len(values),
+            "total": sum(values),
+            "max": max(values),
+            **{f"p{q}": percentile(values, q) for q in PERCENTILES},
+        }
+    return summary
+
+def format_summary(records: List[dict]) -> List[str]:
+    """
+    Prepara le righe di log con percentili per fase e file più lenti
+
+    Returns:
+        Lista di righe di testo
+    """
+    summary = summarize_stages(records)
+    if not summary:
+        return []
+
+    header = "".join(f"{'p' + str(q):>9}" for q in PERCENTILES)
+    lines = [f"  {'Fase':<19}{header}{'max':>9}{'tot %':>8}"]
+    grand_total = sum(s["total"] for stage, s in summary.items() if stage != "total") or 1.0
+    for stage in STAGES + ("total",):
+        s = summary.get(stage)
+        if s is None:
+            continue
+        label = STAGE_LABELS.get(stage, "Totale file")
+        values = "".join(f"{s[f'p{q}']:>8.2f}s" for q in PERCENTILES)
+        share = f"{100 * s['total'] / grand_total:>7.1f}%" if stage != "total" else ""
+        lines.append(f"  {label:<19}{values}{s['max']:>8.2f}s{share}")
+
+    slowest = sorted((r for r in records if r["success"]), key=lambda r: -r["total"])[:SLOWEST_FILES]
+    if slowest:
+        lines.append("")
+        lines.append("  🐢 File più lenti:")
+        for record in slowest:
+            dominant = max(record["stages"], key=record["stages"].get)
+            lines.append(f"     {record['total']:>8.2f}s  {record['file']}  "
+                         f"(fase principale: {STAGE_LABELS[dominant]})")
+    return lines
+
+def write_records(path: str, records: List[dict]):
+    """
+    Esporta i record per file in JSON o CSV (in base all'estensione)
+
+    Args:
+        path: Percorso del file di destinazione (.json o .csv)
+        records: Record strutturati dei file elaborati
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["file", "success", "error", "plates", *STAGES, "total", "rss",
+                             "error_code", "failed_stage"])
+            for r in records:
+                writer.writerow([r["file"], r["success"], r["error"] or "", r["plates"],
+                                 *(f"{r['stages'][s]:.6f}" if s in r["stages"] else ""
+                                   for s in STAGES),
+                                 f"{r['total']:.6f}", r.get("rss") or "",
+                                 "" if r.get("error_code") is None else r["error_code"],
+                                 r.get("failed_stage") or ""])
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"files": records, "summary": summarize_stages(records)}, f, indent=1)
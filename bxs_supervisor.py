@@ -0,0 +1,179 @@
+"""
+BXS Supervisor
+Processi worker isolati con watchdog per fase, per sopravvivere a blocchi e crash della DLL Strand7
+
+Ogni worker è un processo figlio che riceve un file alla volta tramite pipe
+e notifica al supervisore l'inizio di ogni fase. Se una fase supera il
+timeout o il processo muore, il supervisore lo termina e ne avvia uno nuovo:
+il file risulta fallito e il batch prosegue.
+
+Protocollo della pipe (tuple):
+    supervisore → worker:  percorso IGES da elaborare, None per terminare
+    worker → supervisore:  ("event", evento), ("stage", nome fase), ("done", record)
+"""
+import time
+import multiprocessing
+from typing import Callable, List, Optional, Tuple
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+DEFAULT_STAGE_TIMEOUT = 600.0  # Secondi massimi per una singola fase Strand7
+SHUTDOWN_TIMEOUT = 5.0         # Attesa della chiusura ordinata di un worker
+KILL_TIMEOUT = 2.0             # Attesa dopo terminate() prima di kill()
+
+# ==============================================================================
+# CLASSE WORKER SUPERVISIONATO
+# ==============================================================================
+class SupervisedWorker:
+    """Processo figlio che elabora un file alla volta sotto il controllo di un watchdog"""
+
+    def __init__(self, target: Callable, config: dict, index: int = 1):
+        """
+        Args:
+            target: Funzione eseguita nel processo figlio, target(config, conn)
+            config: Parametri passati al processo figlio
+            index: Numero del worker (solo per i messaggi)
+        """
+        self.target = target
+        self.config = config
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.restarts = 0          # Sostituzioni dopo timeout o crash
+        self.files = 0             # File completati dal processo corrente
+        self.task = None           # File in elaborazione (None se libero)
+        self.stage = None          # Fase corrente del file in elaborazione
+        self.stages = {}           # Durate delle fasi completate {fase: secondi}
+        self.task_start = 0.0
+        self.stage_start = 0.0
+
+    @property
+    def busy(self) -> bool:
+        return self.task is not None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
+
+    def start(self):
+        """Avvia il processo figlio"""
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=self.target,
+                                               args=(self.config, child_conn),
+                                               name=f"bxs-worker-{self.index}",
+                                               daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.files = 0
+
+    def submit(self, task: str):
+        """Affida un file al worker e avvia il watchdog"""
+        self.conn.send(task)
+        self.task = task
+        self.stage = None
+        self.stages = {}
+        self.task_start = self.stage_start = time.monotonic()
+
+    @property
+    def crashed(self) -> bool:
+        """True se il processo è terminato mentre elaborava un file"""
+        return self.busy and (self.conn is None or not self.process.is_alive())
+
+    def receive(self) -> List[Tuple]:
+        """
+        Legge i messaggi disponibili senza bloccare
+
+        Le notifiche di fase aggiornano il watchdog; al messaggio "done" il
+        worker torna libero. Se la pipe è chiusa il worker risulta crashed.
+
+        Returns:
+            Lista di messaggi ricevuti
+        """
+        messages = []
+        try:
+            while self.conn is not None and self.conn.poll():
+                message = self.conn.recv()
+                kind = message[0]
+                if kind == "stage":
+                    self._begin_stage(message[1])
+                elif kind == "done":
+                    self.files += 1
+                    self.task = None
+                    self.stage = None
+                messages.append(message)
+        except (EOFError, OSError):
+            self.conn.close()
+            self.conn = None
+        return messages
+
+    def _begin_stage(self, stage: str):
+        """Registra l'inizio di una fase e la durata della precedente"""
+        now = time.monotonic()
+        if self.stage is not None:
+            self.stages[self.stage] = now - self.stage_start
+        self.stage = stage
+        self.stage_start = now
+
+    def expired(self, stage_timeout: Optional[float],
+                file_timeout: Optional[float]) -> Optional[str]:
+        """
+        Controlla i timeout del file in elaborazione
+
+        Returns:
+            Motivo del timeout, o None se il worker è nei tempi
+        """
+        if not self.busy:
+            return None
+        now = time.monotonic()
+        if stage_timeout and now - self.stage_start > stage_timeout:
+            return f"timeout fase {self.stage or 'avvio'} (> {stage_timeout:g}s)"
+        if file_timeout and now - self.task_start > file_timeout:
+            return f"timeout file (> {file_timeout:g}s)"
+        return None
+
+    def elapsed(self) -> float:
+        """Secondi trascorsi dall'invio del file corrente"""
+        return time.monotonic() - self.task_start if self.busy else 0.0
+
+    def kill(self):
+        """Termina il processo figlio (anche se bloccato nella DLL) e lo libera"""
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(KILL_TIMEOUT)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(KILL_TIMEOUT)
+        self._close()
+
+    def restart(self):
+        """Termina il processo figlio e ne avvia uno nuovo"""
+        self.kill()
+        self.restarts += 1
+        self.start()
+
+    def recycle(self):
+        """Chiude il processo in modo ordinato e ne avvia uno nuovo (limite di memoria)"""
+        self.shutdown()
+        self.start()
+
+    def shutdown(self):
+        """Chiede la chiusura ordinata del processo (rilascio API) e attende"""
+        if self.process is None:
+            return
+        try:
+            if self.conn is not None:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(SHUTDOWN_TIMEOUT)
+        self.kill()
+
+    def _close(self):
+        """Chiude la pipe e libera il worker"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        self.task = None
+        self.stage = None
@@ -0,0 +1,347 @@
+"""
+BXS Work Queue
+Coda di lavoro con lease su filesystem condiviso, per più istanze di BXSGenerator
+
+Più generatori (processi o macchine diverse con licenza Strand7) che puntano
+alla stessa cartella condivisa si spartiscono i file IGES tramite file di
+lease creati in modo esclusivo (O_CREAT | O_EXCL), operazione atomica anche
+su condivisioni SMB/NFS. SQLite non viene usato perché il suo locking (e il
+WAL) non è affidabile su filesystem di rete.
+
+Per ogni file IGES la cartella della coda contiene:
+    <nome>.lease   proprietario e scadenza (rinnovata dal heartbeat)
+    <nome>.done    esito finale e chiave degli input (hash IGES + parametri)
+Una lease scaduta (istanza terminata o bloccata) viene rinominata in modo
+atomico da una sola delle istanze che la reclamano e poi ricreata. Un file
+le cui lease scadono più volte (ad esempio perché fa terminare Strand7)
+viene registrato come fallito invece di bloccare a turno tutte le istanze.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import threading
+from typing import Dict, List, Optional
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+QUEUE_FOLDER_NAME = ".bxs_queue"
+LEASE_SUFFIX = ".lease"
+DONE_SUFFIX = ".done"
+DEFAULT_LEASE_TTL = 120.0  # Secondi di validità di una lease senza heartbeat
+HEARTBEAT_FRACTION = 0.3   # Rinnovo ogni ttl * HEARTBEAT_FRACTION secondi
+DEFAULT_MAX_ATTEMPTS = 3   # Lease scadute dopo le quali il file è considerato fallito
+DEFAULT_CLOCK_SKEW = 30.0  # Secondi di tolleranza tra gli orologi delle macchine
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def make_owner_id() -> str:
+    """Identificativo univoco dell'istanza: host, PID e suffisso casuale"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+def _read_json(path: str) -> Optional[dict]:
+    """Legge un file JSON (None se assente, in scrittura o non valido)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# ==============================================================================
+# CLASSE CODA CON LEASE
+# ==============================================================================
+class LeaseQueue:
+    """Assegnazione esclusiva dei file IGES tra istanze tramite lease su file"""
+
+    def __init__(self, queue_folder: str, owner: Optional[str] = None,
+                 ttl: float = DEFAULT_LEASE_TTL,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 clock_skew: float = DEFAULT_CLOCK_SKEW):
+        """
+        Args:
+            queue_folder: Cartella condivisa della coda (creata se necessario)
+            owner: Identificativo dell'istanza (generato se None)
+            ttl: Secondi di validità di una lease senza rinnovo
+            max_attempts: Tentativi (lease acquisite) oltre i quali un file
+                          con lease scaduta viene registrato come fallito
+            clock_skew: Secondi oltre la scadenza prima di reclamare una lease:
+                        la scadenza è scritta con l'orologio di un'altra
+                        macchina, che può essere indietro rispetto a questa
+        """
+        self.queue_folder = queue_folder
+        self.owner = owner or make_owner_id()
+        self.ttl = ttl
+        self.max_attempts = max(1, int(max_attempts))
+        self.clock_skew = max(0.0, clock_skew)
+        self.held = {}  # {nome file: (chiave, tentativo)} delle lease possedute
+        self.lost = []  # Lease perse (scadute e reclamate da altre istanze)
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        self._stop_heartbeat = threading.Event()
+        os.makedirs(queue_folder, exist_ok=True)
+
+    def _lease_path(self, name: str) -> str:
+        return os.path.join(self.queue_folder, name + LEASE_SUFFIX)
+
+    def _done_path(self, name: str) -> str:
+        return os.path.join(self.queue_folder, name + DONE_SUFFIX)
+
+    def _write_atomic(self, path: str, data: dict):
+        """Scrive un file JSON con nome temporaneo dell'istanza e rename atomico"""
+        tmp_path = f"{path}.{self.owner}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _lease_data(self, key: Optional[str], attempt: int) -> dict:
+        return {
+            "owner": self.owner,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "key": key,
+            "attempt": attempt,
+            "expires": time.time() + self.ttl,
+        }
+
+    def result(self, name: str, key: Optional[str]) -> Optional[dict]:
+        """
+        Esito registrato per un file con gli stessi input
+
+        Returns:
+            Dizionario {"key", "success", "owner", "error", "finished"} o None
+        """
+        done = _read_json(self._done_path(name))
+        if done is None or done.get("key") != key:
+            return None
+        return done
+
+    def _is_expired(self, path: str) -> bool:
+        """
+        True se la lease è scaduta da più di clock_skew secondi (o illeggibile
+        da più di ttl + clock_skew secondi)
+        """
+        lease = _read_json(path)
+        if lease is not None:
+            return lease.get("expires", 0) + self.clock_skew < time.time()
+        try:
+            # Lease appena creata e non ancora scritta, oppure corrotta
+            # (mtime assegnata dal file server, anch'esso con un altro orologio)
+            return time.time() - os.path.getmtime(path) > self.ttl + self.clock_skew
+        except OSError:
+            return True
+
+    def claim(self, name: str, key: Optional[str]) -> bool:
+        """
+        Prova ad acquisire la lease di un file
+
+        Args:
+            name: Nome del file IGES
+            key: Chiave degli input (hash IGES + parametri)
+
+        Returns:
+            True se la lease è ora di questa istanza
+        """
+        path = self._lease_path(name)
+        attempt = 1
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._is_expired(path):
+                    return False
+                # Lease scaduta: solo un'istanza riesce a spostarla
+                stale = f"{path}.{self.owner}.stale"
+                try:
+                    os.rename(path, stale)
+                except OSError:
+                    return False
+                if not self._is_expired(stale):
+                    # Un'altra istanza ha già reclamato la lease e ne ha creata
+                    # una nuova dopo il controllo: la si rimette al suo posto
+                    self._restore_lease(stale, path)
+                    return False
+                previous = _read_json(stale) or {}
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+                attempt = previous.get("attempt", 1) + 1
+                if attempt > self.max_attempts:
+                    self._write_atomic(self._done_path(name), self._done_data(
+                        key, False, f"abbandonato dopo {self.max_attempts} lease scadute "
+                                    f"(ultima istanza: {previous.get('owner')})"))
+                    return False
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._lease_data(key, attempt), f)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                self.held[name] = (key, attempt)
+            return True
+        return False
+
+    def _restore_lease(self, stale: str, path: str):
+        """
+        Ripristina una lease valida spostata per errore
+
+        Il link fallisce se nel frattempo è stata creata un'altra lease: in
+        quel caso (o se il filesystem non supporta i link) la lease spostata
+        viene eliminata e il suo proprietario la vedrà persa al prossimo
+        rinnovo, senza pubblicarne l'esito.
+        """
+        try:
+            os.link(stale, path)
+        except OSError:
+            pass
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+    def renew(self) -> List[str]:
+        """
+        Rinnova la scadenza di tutte le lease possedute
+
+        Returns:
+            Nomi delle lease perse (reclamate da altre istanze)
+        """
+        lost = []
+        with self._lock:
+            for name, (key, attempt) in list(self.held.items()):
+                path = self._lease_path(name)
+                lease = _read_json(path)
+                if lease is None or lease.get("owner") != self.owner:
+                    del self.held[name]
+                    lost.append(name)
+                    continue
+                try:
+                    self._write_atomic(path, self._lease_data(key, attempt))
+                except OSError:
+                    pass  # Nuovo tentativo al prossimo heartbeat
+            self.lost.extend(lost)
+        return lost
+
+    def _done_data(self, key: Optional[str], success: bool, error: Optional[str]) -> dict:
+        return {
+            "key": key,
+            "success": success,
+            "owner": self.owner,
+            "error": error,
+            "finished": time.time(),
+        }
+
+    def complete(self, name: str, key: Optional[str], success: bool,
+                 error: Optional[str] = None):
+        """Registra l'esito finale di un file e rilascia la lease"""
+        self._write_atomic(self._done_path(name), self._done_data(key, success, error))
+        self.release(name)
+
+    def clear_result(self, name: str):
+        """Elimina l'esito registrato di un file (che torna da elaborare)"""
+        try:
+            os.remove(self._done_path(name))
+        except OSError:
+            pass
+
+    def release(self, name: str):
+        """Rilascia una lease posseduta (il file torna disponibile)"""
+        with self._lock:
+            self.held.pop(name, None)
+            path = self._lease_path(name)
+            lease = _read_json(path)
+            if lease is not None and lease.get("owner") == self.owner:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def release_all(self):
+        """Rilascia tutte le lease possedute"""
+        for name in list(self.held):
+            self.release(name)
+
+    def start_heartbeat(self):
+        """Avvia il thread che rinnova periodicamente le lease"""
+        if self._heartbeat is not None:
+            return
+        self._stop_heartbeat.clear()
+
+        def beat():
+            while not self._stop_heartbeat.wait(self.ttl * HEARTBEAT_FRACTION):
+                self.renew()
+
+        self._heartbeat = threading.Thread(target=beat, name="bxs-lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def stop_heartbeat(self):
+        """Ferma il thread di heartbeat"""
+        if self._heartbeat is not None:
+            self._stop_heartbeat.set()
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    def pending_leases(self) -> Dict[str, dict]:
+        """Lease attive di tutte le istanze {nome file: dati lease}"""
+        leases = {}
+        try:
+            entries = list(os.scandir(self.queue_folder))
+        except OSError:
+            return leases
+        for entry in entries:
+            if entry.name.endswith(LEASE_SUFFIX):
+                lease = _read_json(entry.path)
+                if lease is not None:
+                    leases[entry.name[:-len(LEASE_SUFFIX)]] = lease
+        return leases
+
+
+# ==============================================================================
+# ESEMPIO DI UTILIZZO (backend simulato, più processi locali)
+# ==============================================================================
+def _simulated_instance(queue_folder: str, names: List[str], seconds: float, crash_after: int):
+    """Istanza simulata: elabora i file con una pausa al posto di Strand7"""
+    queue = LeaseQueue(queue_folder, ttl=2.0, clock_skew=0.5)
+    queue.start_heartbeat()
+    processed = 0
+    pending = list(names)
+    while pending:
+        waiting = []
+        for name in pending:
+            if queue.result(name, "sim") is not None:
+                continue
+            if not queue.claim(name, "sim"):
+                waiting.append(name)
+                continue
+            time.sleep(seconds)
+            if processed == crash_after:
+                os._exit(1)  # Crash con lease in mano: verrà reclamata alla scadenza
+            queue.complete(name, "sim", True)
+            processed += 1
+        pending = waiting
+        if pending:
+            time.sleep(0.5)
+    queue.stop_heartbeat()
+    print(f"{queue.owner}: {processed} file")
+
+if __name__ == "__main__":
+    import tempfile
+    import multiprocessing
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp(prefix="bxs_queue_")
+    names = [f"section_{i:03d}.igs" for i in range(40)]
+    processes = [multiprocessing.Process(target=_simulated_instance,
+                                         args=(folder, names, 0.05, 3 if i == 0 else -1))
+                 for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    done = [name for name in names if _read_json(os.path.join(folder, name + DONE_SUFFIX))]
+    print(f"Completati {len(done)}/{len(names)} file in {folder}")
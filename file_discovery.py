@@ -0,0 +1,95 @@
+"""
+File Discovery
+Ricerca incrementale dei file IGES/BXS basata su os.scandir
+"""
+import os
+import fnmatch
+from typing import Iterable, Iterator, Optional
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+IGES_EXTENSIONS = (".igs", ".iges")
+BXS_EXTENSIONS = (".bxs",)
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def _matches(rel_path: str, patterns: Iterable[str]) -> bool:
+    """
+    Verifica se un percorso relativo soddisfa almeno un pattern (senza maiuscole)
+
+    I pattern senza "/" vengono confrontati con il solo nome del file,
+    quelli con "/" con il percorso relativo alla cartella di partenza.
+    """
+    rel_path = rel_path.lower()
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        pattern = pattern.replace("\\", "/").lower()
+        if fnmatch.fnmatchcase(rel_path if "/" in pattern else name, pattern):
+            return True
+    return False
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def iter_files(folder: str,
+               extensions: Iterable[str],
+               recursive: bool = False,
+               include: Optional[Iterable[str]] = None,
+               exclude: Optional[Iterable[str]] = None,
+               sort: bool = False) -> Iterator[str]:
+    """
+    Restituisce in modo lazy i file di una cartella con le estensioni richieste
+
+    I file vengono prodotti man mano che le voci sono lette da os.scandir,
+    così l'elaborazione può iniziare prima che la scansione sia completa.
+    Le estensioni sono confrontate senza distinzione fra maiuscole e
+    minuscole; le sottocartelle nascoste (es. .bxs_cache) vengono ignorate.
+
+    Args:
+        folder: Cartella di partenza
+        extensions: Estensioni ammesse (es. (".igs", ".iges"))
+        recursive: Scende anche nelle sottocartelle
+        include: Pattern glob dei file da includere (tutti se None)
+        exclude: Pattern glob di file o sottocartelle da escludere
+        sort: Ordina alfabeticamente le voci di ogni cartella (richiede di
+              leggere l'intera cartella prima di restituire il primo file)
+
+    Yields:
+        Percorsi completi dei file trovati
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    include = list(include or [])
+    exclude = list(exclude or [])
+    pending = [(folder, "")]
+
+    while pending:
+        directory, rel_dir = pending.pop()
+        subfolders = []
+        try:
+            with os.scandir(directory) as entries:
+                if sort:
+                    entries = sorted(entries, key=lambda e: e.name.lower())
+                for entry in entries:
+                    rel_path = f"{rel_dir}{entry.name}"
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if (recursive and not entry.name.startswith(".")
+                                and not _matches(rel_path, exclude)):
+                            subfolders.append((entry.path, rel_path + "/"))
+                        continue
+                    if not entry.name.lower().endswith(extensions):
+                        continue
+                    if include and not _matches(rel_path, include):
+                        continue
+                    if exclude and _matches(rel_path, exclude):
+                        continue
+                    yield entry.path
+        except OSError:
+            pass  # Cartella non leggibile o rimossa durante la scansione
+        # Visita in profondità mantenendo l'ordine delle sottocartelle
+        pending.extend(reversed(subfolders))
@@ -0,0 +1,656 @@
+"""
+IGES Analyzer
+Lettore IGES in puro Python per il controllo preliminare dei file prima di Strand7
+"""
+import os
+import sys
+import mmap
+import math
+import hashlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# ==============================================================================
+# COSTANTI IGES
+# ==============================================================================
+RECORD_LENGTH = 80
+SECTION_ORDER = "SGDPT"
+
+# Unità di misura (parametro globale 14)
+UNIT_NAMES = {
+    1: "INCH",
+    2: "MM",
+    4: "FT",
+    5: "MI",
+    6: "M",
+    7: "KM",
+    8: "MIL",
+    9: "UM",
+    10: "CM",
+    11: "UIN",
+}
+
+# Nomi delle entità più comuni
+ENTITY_NAMES = {
+    100: "Circular Arc",
+    102: "Composite Curve",
+    104: "Conic Arc",
+    106: "Copious Data",
+    108: "Plane",
+    110: "Line",
+    112: "Parametric Spline Curve",
+    114: "Parametric Spline Surface",
+    116: "Point",
+    118: "Ruled Surface",
+    120: "Surface of Revolution",
+    122: "Tabulated Cylinder",
+    124: "Transformation Matrix",
+    126: "Rational B-Spline Curve",
+    128: "Rational B-Spline Surface",
+    141: "Boundary",
+    142: "Curve on Parametric Surface",
+    143: "Bounded Surface",
+    144: "Trimmed Surface",
+    186: "Manifold Solid B-Rep",
+    308: "Subfigure Definition",
+    314: "Color Definition",
+    402: "Associativity Instance",
+    406: "Property",
+    408: "Singular Subfigure Instance",
+    502: "Vertex List",
+    504: "Edge List",
+    508: "Loop",
+    510: "Face",
+    514: "Shell",
+}
+
+# Entità geometriche utili per la generazione BXS
+GEOMETRY_ENTITIES = {100, 102, 104, 106, 108, 110, 112, 114, 116, 118, 120, 122,
+                     126, 128, 141, 142, 143, 144, 186, 502, 504, 508, 510, 514}
+
+# Entità campionate per la firma geometrica e entità di solo riferimento
+SIGNATURE_ENTITIES = {100, 106, 110, 116, 126, 128}
+REFERENCE_ENTITIES = {102, 141, 142, 143, 144}
+SIGNATURE_RELATIVE_TOLERANCE = 1e-6
+MAX_SIGNATURE_ORIENTATIONS = 16
+
+# Peso relativo delle entità nella stima del costo di import/mesh
+ENTITY_COST_WEIGHTS = {
+    128: 10.0,
+    144: 8.0,
+    143: 8.0,
+    114: 8.0,
+    142: 3.0,
+    126: 2.0,
+    102: 2.0,
+}
+
+# ==============================================================================
+# CLASSE REPORT
+# ==============================================================================
+class IGESReport:
+    """Risultato dell'analisi preliminare di un file IGES"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file_size = 0
+        self.section_counts = {letter: 0 for letter in SECTION_ORDER}
+        self.entity_counts = {}  # {tipo entità: numero}
+        self.unit_flag = None
+        self.units = None
+        self.model_scale = 1.0
+        self.bounding_box = None  # ((xmin, ymin, zmin), (xmax, ymax, zmax))
+        self.signature = None  # Firma geometrica canonica (se richiesta)
+        self.errors = []
+        self.warnings = []
+
+    @property
+    def is_valid(self) -> bool:
+        """True se il file non presenta errori bloccanti"""
+        return not self.errors
+
+    @property
+    def entity_total(self) -> int:
+        """Numero totale di entità nella sezione Directory"""
+        return sum(self.entity_counts.values())
+
+    @property
+    def extents(self) -> Optional[Tuple[float, float, float]]:
+        """Estensione del bounding box lungo X, Y, Z"""
+        if self.bounding_box is None:
+            return None
+        lower, upper = self.bounding_box
+        return tuple(upper[axis] - lower[axis] for axis in range(3))
+
+    def estimate_cost(self) -> float:
+        """
+        Stima il costo relativo di import e mesh in Strand7
+
+        Returns:
+            Somma delle entità geometriche pesate per complessità
+        """
+        return sum(ENTITY_COST_WEIGHTS.get(entity_type, 1.0) * count
+                   for entity_type, count in self.entity_counts.items()
+                   if entity_type in GEOMETRY_ENTITIES)
+
+    def entity_summary(self) -> str:
+        """Riepilogo testuale delle entità più frequenti"""
+        ranked = sorted(self.entity_counts.items(), key=lambda item: -item[1])
+        return ", ".join(f"{ENTITY_NAMES.get(entity_type, entity_type)}: {count}"
+                         for entity_type, count in ranked)
+
+    def to_dict(self) -> dict:
+        """Esporta il report come dizionario serializzabile"""
+        return {
+            "path": self.path,
+            "file_size": self.file_size,
+            "section_counts": self.section_counts,
+            "entity_counts": self.entity_counts,
+            "units": self.units,
+            "model_scale": self.model_scale,
+            "bounding_box": self.bounding_box,
+            "signature": self.signature,
+            "estimated_cost": self.estimate_cost(),
+            "errors": self.errors,
+            "warnings": self.warnings,
+        }
+
+# ==============================================================================
+# FUNZIONI DI PARSING
+# ==============================================================================
+def _iter_records(mm: mmap.mmap) -> Iterator[bytes]:
+    """
+    Scorre i record di un file IGES senza caricarlo in memoria
+
+    Supporta sia file con terminatori di riga (LF/CRLF) sia record
+    a lunghezza fissa di 80 caratteri senza separatori.
+    """
+    if mm.find(b"\n", 0, RECORD_LENGTH + 2) == -1:
+        for offset in range(0, len(mm), RECORD_LENGTH):
+            yield mm[offset:offset + RECORD_LENGTH]
+        return
+
+    for line in iter(mm.readline, b""):
+        line = line.rstrip(b"\r\n")
+        if line:
+            yield line
+
+def _split_parameters(text: str, param_delim: str, record_delim: str) -> List[str]:
+    """
+    Suddivide un blocco di parametri IGES gestendo le stringhe Hollerith (nH...)
+
+    Args:
+        text: Testo dei parametri concatenato
+        param_delim: Delimitatore di parametro
+        record_delim: Delimitatore di fine record
+
+    Returns:
+        Lista dei parametri come stringhe (senza spazi esterni)
+    """
+    params = []
+    i = 0
+    length = len(text)
+    while i < length:
+        # Stringa Hollerith: cifre seguite da 'H' e da n caratteri
+        j = i
+        while j < length and text[j] == " ":
+            j += 1
+        k = j
+        while k < length and text[k].isdigit():
+            k += 1
+        if k > j and k < length and text[k] == "H":
+            n_chars = int(text[j:k])
+            params.append(text[k + 1:k + 1 + n_chars])
+            i = k + 1 + n_chars
+            while i < length and text[i] == " ":
+                i += 1
+            if i < length and text[i] == record_delim:
+                break
+            i += 1  # Salta il delimitatore
+            continue
+
+        end = i
+        while end < length and text[end] not in (param_delim, record_delim):
+            end += 1
+        params.append(text[i:end].strip())
+        if end >= length or text[end] == record_delim:
+            break
+        i = end + 1
+    return params
+
+def _to_float(value: str) -> float:
+    """Converte un reale IGES (anche con esponente 'D') in float"""
+    value = value.strip()
+    if not value:
+        return 0.0
+    return float(value.replace("D", "E").replace("d", "e"))
+
+def _to_int(value: str) -> int:
+    """Converte un intero IGES (campo vuoto = 0)"""
+    value = value.strip()
+    return int(value) if value else 0
+
+def _points_from_parameters(entity_type: int, form: int, params: List[str]) -> List[Tuple[float, float, float]]:
+    """
+    Estrae i punti significativi per il bounding box da un'entità geometrica
+
+    Args:
+        entity_type: Tipo di entità IGES
+        form: Numero di forma dell'entità
+        params: Parametri dell'entità (il primo è il tipo)
+
+    Returns:
+        Lista di punti (x, y, z) nello spazio di definizione dell'entità
+    """
+    values = params[1:]
+    if entity_type == 116:
+        x, y, z = (_to_float(v) for v in values[:3])
+        return [(x, y, z)]
+
+    if entity_type == 110:
+        c = [_to_float(v) for v in values[:6]]
+        return [(c[0], c[1], c[2]), (c[3], c[4], c[5])]
+
+    if entity_type == 100:
+        zt, xc, yc, x1, y1, x2, y2 = (_to_float(v) for v in values[:7])
+        radius = math.hypot(x1 - xc, y1 - yc)
+        return [(xc - radius, yc - radius, zt), (xc + radius, yc + radius, zt),
+                (x1, y1, zt), (x2, y2, zt)]
+
+    if entity_type == 106:
+        n_points = _to_int(values[1])
+        if form in (1, 11, 63):
+            zt = _to_float(values[2])
+            coords = [_to_float(v) for v in values[3:3 + 2 * n_points]]
+            return [(coords[i], coords[i + 1], zt) for i in range(0, len(coords) - 1, 2)]
+        if form in (2, 12):
+            coords = [_to_float(v) for v in values[2:2 + 3 * n_points]]
+            return [tuple(coords[i:i + 3]) for i in range(0, len(coords) - 2, 3)]
+        return []
+
+    if entity_type == 126:
+        k, m = _to_int(values[0]), _to_int(values[1])
+        start = 6 + (k + m + 2) + (k + 1)
+        coords = [_to_float(v) for v in values[start:start + 3 * (k + 1)]]
+        return [tuple(coords[i:i + 3]) for i in range(0, len(coords) - 2, 3)]
+
+    if entity_type == 128:
+        k1, k2, m1, m2 = (_to_int(v) for v in values[:4])
+        n_ctrl = (k1 + 1) * (k2 + 1)
+        start = 9 + (k1 + m1 + 2) + (k2 + m2 + 2) + n_ctrl
+        coords = [_to_float(v) for v in values[start:start + 3 * n_ctrl]]
+        return [tuple(coords[i:i + 3]) for i in range(0, len(coords) - 2, 3)]
+
+    return []
+
+def _shape_points(entity_type: int, form: int, params: List[str]) -> List[Tuple[float, float, float]]:
+    """
+    Punti che definiscono la forma di un'entità per la firma geometrica
+
+    A differenza del bounding box, i punti devono essere invarianti per
+    rotazione: gli archi sono descritti da centro, inizio e fine.
+    """
+    if entity_type == 100:
+        zt, xc, yc, x1, y1, x2, y2 = (_to_float(v) for v in params[1:8])
+        return [(xc, yc, zt), (x1, y1, zt), (x2, y2, zt)]
+    return _points_from_parameters(entity_type, form, params)
+
+def _geometry_signature(shapes: List[Tuple[int, List[Tuple[float, float, float]]]],
+                        units: Optional[str]) -> Optional[str]:
+    """
+    Calcola una firma della geometria indipendente da traslazione e rotazione nel piano
+
+    I punti vengono proiettati sul piano della sezione (scartando l'asse di
+    estensione minima), centrati sul baricentro dei punti e ruotati sugli
+    assi principali; fra le orientazioni candidate viene scelta quella con
+    l'impronta minore, così sezioni congruenti producono la stessa firma.
+
+    Args:
+        shapes: Lista di (tipo entità, punti nello spazio modello)
+        units: Unità di misura del file
+
+    Returns:
+        Firma esadecimale o None se la geometria è insufficiente
+    """
+    all_points = [point for _, points in shapes for point in points]
+    if len(all_points) < 2:
+        return None
+
+    extents = [max(p[axis] for p in all_points) - min(p[axis] for p in all_points)
+               for axis in range(3)]
+    normal = extents.index(min(extents))
+    u_axis, v_axis = [axis for axis in range(3) if axis != normal]
+
+    n_points = len(all_points)
+    cu = sum(p[u_axis] for p in all_points) / n_points
+    cv = sum(p[v_axis] for p in all_points) / n_points
+    planar = [(etype, [(p[u_axis] - cu, p[v_axis] - cv) for p in points])
+              for etype, points in shapes]
+
+    # Tolleranza relativa al raggio massimo (invariante per rotazione)
+    radii = [math.hypot(x, y) for _, points in planar for x, y in points]
+    size = float(f"{max(radii):.3g}")
+    if size <= 0:
+        return None
+    tolerance = size * SIGNATURE_RELATIVE_TOLERANCE
+
+    suu = sum((p[u_axis] - cu) ** 2 for p in all_points)
+    svv = sum((p[v_axis] - cv) ** 2 for p in all_points)
+    suv = sum((p[u_axis] - cu) * (p[v_axis] - cv) for p in all_points)
+
+    # Orientazioni candidate: asse principale (a meno di 180°) oppure, se
+    # gli assi principali sono indeterminati, i punti più lontani dal centro
+    if math.hypot(suu - svv, 2 * suv) > 1e-9 * (suu + svv):
+        theta = 0.5 * math.atan2(2 * suv, suu - svv)
+        angles = [theta, theta + math.pi]
+    else:
+        r_max = max(radii)
+        far = [(x, y) for _, points in planar for x, y in points
+               if r_max - math.hypot(x, y) <= tolerance]
+        angles = sorted({math.atan2(y, x) for x, y in far})[:MAX_SIGNATURE_ORIENTATIONS]
+
+    best = None
+    for angle in angles:
+        c, s = math.cos(-angle), math.sin(-angle)
+        items = []
+        for etype, points in planar:
+            quantized = tuple((round((x * c - y * s) / tolerance), round((x * s + y * c) / tolerance))
+                              for x, y in points)
+            items.append((etype, min(quantized, quantized[::-1])))
+        items.sort()
+        digest = hashlib.sha256(repr((units, items)).encode("ascii")).hexdigest()
+        if best is None or digest < best:
+            best = digest
+    return best
+
+def _merge_box(box: Optional[list], points) -> Optional[list]:
+    """Estende un bounding box [lower, upper] con una serie di punti"""
+    for point in points:
+        if box is None:
+            box = [list(point), list(point)]
+            continue
+        for axis in range(3):
+            box[0][axis] = min(box[0][axis], point[axis])
+            box[1][axis] = max(box[1][axis], point[axis])
+    return box
+
+def _box_corners(box: list) -> List[Tuple[float, float, float]]:
+    """Restituisce gli 8 vertici di un bounding box"""
+    lower, upper = box
+    return [(x, y, z) for x in (lower[0], upper[0])
+            for y in (lower[1], upper[1])
+            for z in (lower[2], upper[2])]
+
+def _apply_transform(matrix: List[float], point: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Applica una matrice di trasformazione IGES 124 (R11..R34) a un punto"""
+    x, y, z = point
+    return tuple(matrix[4 * row] * x + matrix[4 * row + 1] * y + matrix[4 * row + 2] * z
+                 + matrix[4 * row + 3] for row in range(3))
+
+def _resolve_transforms(points: list, transform_ptr: int, transforms: dict) -> list:
+    """Applica la catena di trasformazioni 124 di un'entità ai suoi punti"""
+    for _ in range(16):  # Limita catene di trasformazioni annidate
+        if not transform_ptr or transform_ptr not in transforms:
+            break
+        matrix, transform_ptr = transforms[transform_ptr]
+        points = [_apply_transform(matrix, point) for point in points]
+    return points
+
+# ==============================================================================
+# ANALISI
+# ==============================================================================
+def analyze_iges(iges_path: str, signature: bool = False) -> IGESReport:
+    """
+    Analizza un file IGES leggendo in streaming le sezioni S/G/D/P/T
+
+    Il file viene mappato in memoria e scorso una sola volta: vengono
+    contate le entità, lette le unità dalla sezione Global, calcolato il
+    bounding box delle entità geometriche (con le trasformazioni 124) e
+    segnalate le incoerenze strutturali.
+
+    Args:
+        iges_path: Percorso completo del file IGES
+        signature: Calcola anche la firma geometrica canonica (report.signature)
+
+    Returns:
+        IGESReport con i risultati dell'analisi
+    """
+    report = IGESReport(iges_path)
+    try:
+        report.file_size = os.path.getsize(iges_path)
+        if report.file_size == 0:
+            report.errors.append("File vuoto")
+            return report
+        with open(iges_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _analyze_records(_iter_records(mm), report, signature)
+    except OSError as e:
+        report.errors.append(f"Impossibile leggere il file: {e}")
+    return report
+
+def _analyze_records(records: Iterator[bytes], report: IGESReport, signature: bool = False):
+    """Esegue l'analisi dei record aggiornando il report"""
+    global_text = []
+    terminate = None
+    directory = {}       # {puntatore DE: (tipo, forma, puntatore trasformazione)}
+    last_param_line = 0  # Ultima riga P referenziata dalla Directory
+    pending_line1 = None
+    section_index = 0
+    expected_seq = {letter: 1 for letter in SECTION_ORDER}
+
+    # Bounding box per entità con trasformazione, risolti a fine lettura
+    local_boxes = {}     # {puntatore DE: box}
+    transforms = {}      # {puntatore DE entità 124: (matrice, puntatore trasformazione)}
+    global_box = None
+
+    # Punti di forma per la firma geometrica: (tipo, punti, puntatore trasformazione)
+    shapes = []
+    signature_supported = True
+
+    param_delim, record_delim = ",", ";"
+    current_de = None
+    current_text = []
+
+    def flush_entity():
+        nonlocal global_box, signature_supported
+        if current_de is None:
+            return
+        entry = directory.get(current_de)
+        if entry is None:
+            report.errors.append(f"Parametri riferiti al DE inesistente {current_de}")
+            return
+        entity_type, form, transform_ptr = entry
+        if entity_type not in GEOMETRY_ENTITIES and entity_type != 124:
+            return
+        try:
+            params = _split_parameters("".join(current_text), param_delim, record_delim)
+            if entity_type == 124:
+                matrix = [_to_float(v) for v in params[1:13]]
+                if len(matrix) == 12:
+                    transforms[current_de] = (matrix, transform_ptr)
+                return
+            points = _points_from_parameters(entity_type, form, params)
+            if signature:
+                if entity_type in SIGNATURE_ENTITIES:
+                    shapes.append((entity_type, _shape_points(entity_type, form, params), transform_ptr))
+                elif entity_type not in REFERENCE_ENTITIES:
+                    signature_supported = False
+        except (ValueError, IndexError):
+            report.warnings.append(f"Parametri non leggibili per l'entità {entity_type} (DE {current_de})")
+            signature_supported = False
+            return
+        if not points:
+            return
+        if transform_ptr:
+            local_boxes[current_de] = _merge_box(local_boxes.get(current_de), points)
+        else:
+            global_box = _merge_box(global_box, points)
+
+    for record in records:
+        if len(record) != RECORD_LENGTH:
+            report.errors.append(f"Record di lunghezza {len(record)} invece di {RECORD_LENGTH}")
+            return
+        try:
+            letter = chr(record[72])
+            sequence = int(record[73:80])
+        except ValueError:
+            report.errors.append("Numero di sequenza non valido")
+            return
+        if letter not in SECTION_ORDER:
+            report.errors.append(f"Lettera di sezione non valida '{letter}'")
+            return
+
+        # Le sezioni devono comparire in ordine S, G, D, P, T
+        position = SECTION_ORDER.index(letter)
+        if position < section_index:
+            report.errors.append(f"Sezione '{letter}' fuori ordine")
+            return
+        section_index = position
+
+        if sequence != expected_seq[letter]:
+            report.errors.append(f"Sequenza interrotta nella sezione '{letter}' "
+                                 f"(atteso {expected_seq[letter]}, trovato {sequence})")
+            return
+        expected_seq[letter] += 1
+        report.section_counts[letter] += 1
+
+        if letter == "G":
+            global_text.append(record[:72].decode("latin-1"))
+        elif letter == "D":
+            if pending_line1 is None:
+                pending_line1 = record
+                continue
+            line1, line2 = pending_line1, record
+            pending_line1 = None
+            try:
+                entity_type = int(line1[0:8])
+                param_ptr = _to_int(line1[8:16].decode("ascii"))
+                param_lines = _to_int(line2[24:32].decode("ascii"))
+                transform_ptr = _to_int(line1[48:56].decode("ascii"))
+                form = _to_int(line2[32:40].decode("ascii"))
+            except ValueError:
+                report.errors.append(f"Voce Directory non valida alla riga D{sequence - 1}")
+                return
+            directory[sequence - 1] = (entity_type, form, transform_ptr)
+            last_param_line = max(last_param_line, param_ptr + param_lines - 1)
+            report.entity_counts[entity_type] = report.entity_counts.get(entity_type, 0) + 1
+        elif letter == "P":
+            if current_de is None and global_text:
+                param_delim, record_delim = _parse_global(global_text, report)
+                global_text = []
+            try:
+                de_pointer = int(record[64:72])
+            except ValueError:
+                report.errors.append(f"Puntatore DE non valido alla riga P{sequence}")
+                return
+            if de_pointer != current_de:
+                flush_entity()
+                current_de = de_pointer
+                current_text = []
+            current_text.append(record[:64].decode("latin-1"))
+        elif letter == "T":
+            terminate = record
+
+    flush_entity()
+    if global_text:
+        _parse_global(global_text, report)
+
+    # Controlli strutturali
+    if report.section_counts["G"] == 0:
+        report.errors.append("Sezione Global mancante")
+    if report.section_counts["D"] == 0:
+        report.errors.append("Sezione Directory mancante")
+    if pending_line1 is not None:
+        report.errors.append("Sezione Directory con numero di righe dispari")
+    if last_param_line > report.section_counts["P"]:
+        report.errors.append(f"La Directory punta alla riga P{last_param_line} "
+                             f"ma la sezione Parameter ha {report.section_counts['P']} righe")
+    if terminate is None:
+        report.errors.append("Sezione Terminate mancante (file troncato?)")
+    else:
+        _check_terminate(terminate, report)
+    if report.section_counts["D"] and not any(t in GEOMETRY_ENTITIES for t in report.entity_counts):
+        report.errors.append("Nessuna entità geometrica nel file")
+
+    # Applica le trasformazioni ai bounding box locali
+    for de_pointer, box in local_boxes.items():
+        points = _resolve_transforms(_box_corners(box), directory[de_pointer][2], transforms)
+        global_box = _merge_box(global_box, points)
+
+    if global_box is not None:
+        report.bounding_box = (tuple(global_box[0]), tuple(global_box[1]))
+
+    if signature and signature_supported and not report.errors:
+        report.signature = _geometry_signature(
+            [(etype, _resolve_transforms(points, transform_ptr, transforms))
+             for etype, points, transform_ptr in shapes if points],
+            report.units)
+
+def _parse_global(global_text: List[str], report: IGESReport) -> Tuple[str, str]:
+    """
+    Interpreta la sezione Global (delimitatori, unità, scala)
+
+    Returns:
+        Tupla (delimitatore parametri, delimitatore record)
+    """
+    text = "".join(global_text)
+    param_delim, record_delim = ",", ";"
+    if text.startswith("1H"):
+        param_delim = text[2]
+        rest = text[4:]
+    else:
+        rest = text[1:] if text.startswith(",") else text
+    if rest.startswith("1H"):
+        record_delim = rest[2]
+
+    params = _split_parameters(text, param_delim, record_delim)
+    try:
+        if len(params) > 12 and params[12]:
+            report.model_scale = _to_float(params[12])
+        if len(params) > 13 and params[13]:
+            report.unit_flag = _to_int(params[13])
+            report.units = UNIT_NAMES.get(report.unit_flag)
+        if report.unit_flag == 3 and len(params) > 14:
+            report.units = params[14]
+    except ValueError:
+        report.warnings.append("Parametri della sezione Global non leggibili")
+    if report.unit_flag is None:
+        report.warnings.append("Unità di misura non specificate")
+    return param_delim, record_delim
+
+def _check_terminate(record: bytes, report: IGESReport):
+    """Confronta i conteggi della sezione Terminate con le righe lette"""
+    text = record[:32].decode("latin-1")
+    for index, letter in enumerate("SGDP"):
+        field = text[index * 8:index * 8 + 8]
+        try:
+            declared = int(field[1:])
+        except ValueError:
+            report.errors.append("Sezione Terminate non leggibile")
+            return
+        if field[0] != letter or declared != report.section_counts[letter]:
+            report.errors.append(f"Conteggio righe '{letter}' incoerente "
+                                 f"(Terminate {declared}, lette {report.section_counts[letter]})")
+
+def analyze_folder(iges_files: Iterable[str]) -> Iterator[IGESReport]:
+    """Analizza in sequenza i file IGES di una lista o di un iteratore"""
+    for iges_path in iges_files:
+        yield analyze_iges(iges_path)
+
+
+# ==============================================================================
+# ESEMPIO DI UTILIZZO
+# ==============================================================================
+if __name__ == "__main__":
+    from file_discovery import iter_files, IGES_EXTENSIONS
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    for report in analyze_folder(iter_files(folder, IGES_EXTENSIONS, sort=True)):
+        status = "✅" if report.is_valid else "❌"
+        print(f"{status} {os.path.basename(report.path)}: {report.entity_total} entità, "
+              f"unità {report.units}, costo stimato {report.estimate_cost():.0f}")
+        if report.bounding_box:
+            print(f"   Bounding box: {report.bounding_box}")
+        for error in report.errors:
+            print(f"   ❌ {error}")
+        for warning in report.warnings:
+            print(f"   ⚠ {warning}")
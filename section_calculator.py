@@ -0,0 +1,266 @@
+"""
+Section Calculator
+Calcolo vettoriale NumPy delle proprietà geometriche di sezione dai loop BXS
+
+Le proprietà sono integrate in forma chiusa sui lati dei poligoni (teorema
+di Green): tutte le sezioni vengono impilate in un unico array di lati e
+ridotte per sezione, così migliaia di sezioni si calcolano in pochi
+millisecondi senza Strand7. NumPy è una dipendenza opzionale.
+"""
+import sys
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+NUMPY_AVAILABLE = np is not None
+
+# Proprietà calcolate (stessi nomi di section_store.BXS_PROPERTY_NAMES)
+COMPUTED_PROPERTIES = (
+    "x_bar", "y_bar", "area",
+    "i11", "i22", "angle",
+    "z11_plus", "z11_minus", "z22_plus", "z22_minus",
+    "r1", "r2",
+    "ixx", "iyy", "ixy",
+    "zxx_plus", "zxx_minus", "zyy_plus", "zyy_minus",
+    "rx", "ry",
+)
+
+# Proprietà confrontate con prop_bxs di Strand7 (indipendenti dalle convenzioni di segno)
+CHECKED_PROPERTIES = ("area", "x_bar", "y_bar", "i11", "i22", "ixx", "iyy")
+DEFAULT_CHECK_TOLERANCE = 1e-3
+
+Loop = Sequence[Tuple[float, float]]
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def _require_numpy():
+    """Verifica che NumPy sia installato"""
+    if np is None:
+        raise ImportError("NumPy non installato: eseguire 'pip install numpy'")
+
+def _point_in_polygon(point, polygon) -> bool:
+    """Test pari/dispari di un punto rispetto a un poligono"""
+    px, py = point
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    crosses = (y1 > py) != (y2 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+    return bool(np.count_nonzero(crosses & (px < x_cross)) % 2)
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def stack_sections(sections: Sequence[Sequence[Loop]]):
+    """
+    Impila i loop di più sezioni in un unico array di lati
+
+    L'orientamento dei loop non è richiesto: ogni lato riceve un peso +1/-1
+    tale che i contorni esterni contino come antiorari e i fori come orari.
+    Un loop è un foro se il suo primo punto cade all'interno di un numero
+    dispari di altri loop della stessa sezione.
+
+    Args:
+        sections: Per ogni sezione, la lista dei suoi loop [(x, y), ...]
+
+    Returns:
+        Tupla (lati (E, 4) [x1, y1, x2, y2], peso di ogni lato (E,),
+        sezione di ogni lato (E,))
+    """
+    _require_numpy()
+    arrays, loop_owner = [], []
+    for section_index, loops in enumerate(sections):
+        for loop in loops:
+            if len(loop) >= 3:
+                arrays.append(np.asarray(loop, dtype=float).reshape(-1, 2))
+                loop_owner.append(section_index)
+    if not arrays:
+        return np.empty((0, 4)), np.empty(0), np.empty(0, dtype=int)
+
+    lengths = np.array([len(points) for points in arrays])
+    vertices = np.concatenate(arrays)
+    loop_id = np.repeat(np.arange(len(arrays)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    following = np.arange(len(vertices)) + 1
+    following[starts + lengths - 1] = starts  # Chiusura di ogni loop
+    edges = np.hstack([vertices, vertices[following]])
+
+    x1, y1, x2, y2 = edges.T
+    loop_area = np.bincount(loop_id, weights=x1 * y2 - x2 * y1) / 2.0
+
+    # Fori: solo le sezioni con più loop richiedono il test di contenimento
+    desired = np.ones(len(arrays))
+    loop_owner = np.array(loop_owner)
+    multi = np.flatnonzero(np.bincount(loop_owner) > 1)
+    for section_index in multi:
+        members = np.flatnonzero(loop_owner == section_index)
+        for index in members:
+            depth = sum(_point_in_polygon(arrays[index][0], arrays[other])
+                        for other in members if other != index)
+            if depth % 2 == 1:
+                desired[index] = -1.0
+
+    weight = desired * np.sign(loop_area)
+    return edges, weight[loop_id], loop_owner[loop_id]
+
+def compute_properties(sections: Sequence[Sequence[Loop]]) -> Dict[str, "np.ndarray"]:
+    """
+    Calcola area, baricentro, momenti d'inerzia, assi principali e moduli di resistenza
+
+    Args:
+        sections: Per ogni sezione, la lista dei suoi loop [(x, y), ...]
+
+    Returns:
+        Dizionario {proprietà: array di lunghezza len(sections)}; l'angolo
+        principale è in gradi, le sezioni senza area valgono NaN
+    """
+    _require_numpy()
+    n = len(sections)
+    edges, weight, owner = stack_sections(sections)
+    x1, y1, x2, y2 = edges.T
+
+    def per_section(values):
+        return np.bincount(owner, weights=values * weight, minlength=n)
+
+    cross = x1 * y2 - x2 * y1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        area = per_section(cross) / 2.0
+        x_bar = per_section((x1 + x2) * cross) / 6.0 / area
+        y_bar = per_section((y1 + y2) * cross) / 6.0 / area
+        ixx = per_section((y1 * y1 + y1 * y2 + y2 * y2) * cross) / 12.0 - area * y_bar ** 2
+        iyy = per_section((x1 * x1 + x1 * x2 + x2 * x2) * cross) / 12.0 - area * x_bar ** 2
+        ixy = (per_section((x1 * y2 + 2 * x1 * y1 + 2 * x2 * y2 + x2 * y1) * cross) / 24.0
+               - area * x_bar * y_bar)
+
+        mean = (ixx + iyy) / 2.0
+        radius = np.hypot((ixx - iyy) / 2.0, ixy)
+        i11 = mean + radius
+        i22 = mean - radius
+        theta = 0.5 * np.arctan2(-2.0 * ixy, ixx - iyy)
+
+        # Distanze delle fibre estreme dagli assi baricentrici e principali
+        dx = x1 - x_bar[owner]
+        dy = y1 - y_bar[owner]
+        cos_t, sin_t = np.cos(theta)[owner], np.sin(theta)[owner]
+        u = dx * cos_t + dy * sin_t      # Coordinata lungo l'asse 1
+        v = -dx * sin_t + dy * cos_t     # Coordinata lungo l'asse 2
+
+        def extreme(values, ufunc, start):
+            result = np.full(n, start)
+            ufunc.at(result, owner, values)
+            return np.abs(result)
+
+        properties = {
+            "x_bar": x_bar,
+            "y_bar": y_bar,
+            "area": area,
+            "i11": i11,
+            "i22": i22,
+            "angle": np.degrees(theta),
+            "z11_plus": i11 / extreme(v, np.maximum, -np.inf),
+            "z11_minus": i11 / extreme(v, np.minimum, np.inf),
+            "z22_plus": i22 / extreme(u, np.maximum, -np.inf),
+            "z22_minus": i22 / extreme(u, np.minimum, np.inf),
+            "r1": np.sqrt(i11 / area),
+            "r2": np.sqrt(i22 / area),
+            "ixx": ixx,
+            "iyy": iyy,
+            "ixy": ixy,
+            "zxx_plus": ixx / extreme(dy, np.maximum, -np.inf),
+            "zxx_minus": ixx / extreme(dy, np.minimum, np.inf),
+            "zyy_plus": iyy / extreme(dx, np.maximum, -np.inf),
+            "zyy_minus": iyy / extreme(dx, np.minimum, np.inf),
+            "rx": np.sqrt(ixx / area),
+            "ry": np.sqrt(iyy / area),
+        }
+    invalid = ~(area > 0)
+    for values in properties.values():
+        values[invalid] = np.nan
+    return properties
+
+def section_properties(loops: Sequence[Loop]) -> Dict[str, float]:
+    """Proprietà di una singola sezione come dizionario di float"""
+    return {name: float(values[0]) for name, values in compute_properties([loops]).items()}
+
+def check_properties(computed: Dict[str, float], reported: Dict[str, float],
+                     rel_tol: float = DEFAULT_CHECK_TOLERANCE) -> List[str]:
+    """
+    Confronta le proprietà calcolate con quelle riportate da Strand7 (prop_bxs)
+
+    Le coordinate del baricentro sono confrontate rispetto al raggio d'inerzia
+    polare della sezione, le altre grandezze in modo relativo.
+
+    Returns:
+        Lista di discrepanze (vuota se entro tolleranza)
+    """
+    differences = []
+    area = computed.get("area") or 0.0
+    polar_radius = (math.sqrt((computed["ixx"] + computed["iyy"]) / area)
+                    if area > 0 else 0.0)
+    for name in CHECKED_PROPERTIES:
+        ours, theirs = computed.get(name), reported.get(name)
+        if ours is None or theirs is None or math.isnan(ours):
+            continue
+        if name in ("x_bar", "y_bar"):
+            close = abs(ours - theirs) <= rel_tol * polar_radius
+        else:
+            close = math.isclose(ours, theirs, rel_tol=rel_tol, abs_tol=1e-12)
+        if not close:
+            differences.append(f"{name}: calcolato {ours:.6g}, Strand7 {theirs:.6g}")
+    return differences
+
+def rank_sections(names: Sequence[str], properties: Dict[str, "np.ndarray"], key: str,
+                  descending: bool = True, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    Ordina le sezioni per una proprietà calcolata
+
+    Args:
+        names: Nomi delle sezioni, nello stesso ordine degli array
+        properties: Risultato di compute_properties
+        key: Proprietà di ordinamento (es. "i11")
+        descending: Ordine decrescente
+        limit: Numero massimo di risultati
+
+    Returns:
+        Lista di tuple (nome, valore)
+    """
+    values = properties[key]
+    order = np.argsort(-values if descending else values, kind="stable")
+    order = order[~np.isnan(values[order])]
+    if limit is not None:
+        order = order[:limit]
+    return [(names[i], float(values[i])) for i in order]
+
+
+# ==============================================================================
+# ESEMPIO DI UTILIZZO
+# ==============================================================================
+if __name__ == "__main__":
+    from file_discovery import iter_files
+    from bxs_format import SECTION_FILE_EXTENSION, iter_bxsx
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    sections = [section
+                for path in iter_files(folder, (SECTION_FILE_EXTENSION,), recursive=True, sort=True)
+                for section in iter_bxsx(path)]
+    names = [section.name for section in sections]
+    computed = compute_properties([section.loops for section in sections])
+
+    n_mismatch = 0
+    for index, section in enumerate(sections):
+        ours = {name: float(values[index]) for name, values in computed.items()}
+        differences = check_properties(ours, section.properties)
+        if differences:
+            n_mismatch += 1
+            print(f"⚠ {section.name}: {'; '.join(differences)}")
+    print(f"Sezioni verificate: {len(sections)}, discrepanze: {n_mismatch}")
+    for name, value in rank_sections(names, computed, "i11", limit=10):
+        print(f"   {name:<30} I11 = {value:.6g}")
@@ -0,0 +1,213 @@
+"""
+Section Store
+Archivio SQLite delle proprietà di sezione calcolate da St7GenerateBXS
+"""
+import os
+import csv
+import sys
+import time
+import sqlite3
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+SECTION_STORE_NAME = ".bxs_sections.sqlite"
+
+# Proprietà restituite da St7GenerateBXS, nell'ordine degli indici ipBXS* di St7API
+BXS_PROPERTY_NAMES = (
+    "x_bar",       # ipBXSXBar
+    "y_bar",       # ipBXSYBar
+    "area",        # ipBXSArea
+    "i11",         # ipBXSI11
+    "i22",         # ipBXSI22
+    "angle",       # ipBXSAngle
+    "z11_plus",    # ipBXSZ11Plus
+    "z11_minus",   # ipBXSZ11Minus
+    "z22_plus",    # ipBXSZ22Plus
+    "z22_minus",   # ipBXSZ22Minus
+    "s11",         # ipBXSS11
+    "s22",         # ipBXSS22
+    "r1",          # ipBXSr1
+    "r2",          # ipBXSr2
+    "sa1",         # ipBXSSA1
+    "sa2",         # ipBXSSA2
+    "sl1",         # ipBXSSL1
+    "sl2",         # ipBXSSL2
+    "ixx",         # ipBXSIXX
+    "iyy",         # ipBXSIYY
+    "ixy",         # ipBXSIXY
+    "ixx_l",       # ipBXSIxxL
+    "iyy_l",       # ipBXSIyyL
+    "ixy_l",       # ipBXSIxyL
+    "zxx_plus",    # ipBXSZxxPlus
+    "zxx_minus",   # ipBXSZxxMinus
+    "zyy_plus",    # ipBXSZyyPlus
+    "zyy_minus",   # ipBXSZyyMinus
+    "sxx",         # ipBXSSxx
+    "syy",         # ipBXSSyy
+    "rx",          # ipBXSrx
+    "ry",          # ipBXSry
+    "j",           # ipBXSJ
+    "iw",          # ipBXSIw
+)
+
+INFO_COLUMNS = ("name", "iges_hash", "bxs_file", "mesh_profile", "plates", "created")
+ALL_COLUMNS = INFO_COLUMNS + BXS_PROPERTY_NAMES
+
+# ==============================================================================
+# CLASSE ARCHIVIO SEZIONI
+# ==============================================================================
+class SectionStore:
+    """Proprietà di sezione indicizzate per nome della sezione e hash IGES"""
+
+    def __init__(self, db_path: str):
+        """
+        Apre (o crea) l'archivio delle sezioni
+
+        Args:
+            db_path: Percorso del database SQLite
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        columns = ", ".join(f"{name} REAL" for name in BXS_PROPERTY_NAMES)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sections ("
+                "name TEXT NOT NULL, iges_hash TEXT NOT NULL, bxs_file TEXT, "
+                "mesh_profile TEXT, plates INTEGER, created REAL, "
+                f"{columns}, PRIMARY KEY (name, iges_hash))")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sections_hash ON sections (iges_hash)")
+
+    def close(self):
+        """Chiude la connessione al database"""
+        with self._lock:
+            self._conn.close()
+
+    def store(self, name: str, iges_hash: str, properties: Sequence[float],
+              bxs_file: Optional[str] = None,
+              mesh_profile: Optional[str] = None,
+              plates: Optional[int] = None):
+        """
+        Salva (o sostituisce) le proprietà di una sezione
+
+        Args:
+            name: Nome della sezione (nome base del file BXS)
+            iges_hash: Hash del contenuto IGES di origine
+            properties: 34 valori prop_bxs restituiti da St7GenerateBXS
+            bxs_file: Nome del file BXS generato
+            mesh_profile: Profilo di mesh usato per la generazione
+            plates: Numero di elementi plate della mesh
+        """
+        if len(properties) != len(BXS_PROPERTY_NAMES):
+            raise ValueError(f"Attesi {len(BXS_PROPERTY_NAMES)} valori di sezione, "
+                             f"ricevuti {len(properties)}")
+        values = (name, iges_hash, bxs_file, mesh_profile, plates, time.time(),
+                  *(float(v) for v in properties))
+        placeholders = ", ".join("?" for _ in ALL_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO sections ({', '.join(ALL_COLUMNS)}) "
+                f"VALUES ({placeholders})", values)
+
+    def get(self, name: str, iges_hash: Optional[str] = None) -> Optional[dict]:
+        """
+        Restituisce le proprietà di una sezione
+
+        Args:
+            name: Nome della sezione
+            iges_hash: Hash IGES; se None restituisce la versione più recente
+
+        Returns:
+            Dizionario {colonna: valore} o None se assente
+        """
+        if iges_hash is None:
+            sql, args = "SELECT * FROM sections WHERE name = ? ORDER BY created DESC LIMIT 1", (name,)
+        else:
+            sql, args = "SELECT * FROM sections WHERE name = ? AND iges_hash = ?", (name, iges_hash)
+        with self._lock:
+            row = self._conn.execute(sql, args).fetchone()
+        return dict(row) if row is not None else None
+
+    def find_by_hash(self, iges_hash: str) -> Optional[dict]:
+        """Restituisce la sezione più recente generata da un contenuto IGES"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM sections WHERE iges_hash = ? ORDER BY created DESC LIMIT 1",
+                (iges_hash,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def query(self, name_like: Optional[str] = None,
+              order_by: str = "name",
+              limit: Optional[int] = None,
+              **ranges: Tuple[Optional[float], Optional[float]]) -> List[dict]:
+        """
+        Cerca le sezioni per nome e intervalli di proprietà
+
+        Esempio: query(name_like="HEA%", area=(1000, None), order_by="j")
+
+        Args:
+            name_like: Pattern SQL LIKE sul nome (es. "HEA%")
+            order_by: Colonna di ordinamento (prefisso "-" per ordine decrescente)
+            limit: Numero massimo di risultati
+            **ranges: Colonna=(minimo, massimo), None per un estremo aperto
+
+        Returns:
+            Lista di dizionari {colonna: valore}
+        """
+        conditions, args = [], []
+        if name_like is not None:
+            conditions.append("name LIKE ?")
+            args.append(name_like)
+        for column, (low, high) in ranges.items():
+            if column not in BXS_PROPERTY_NAMES and column != "plates":
+                raise ValueError(f"Proprietà di sezione sconosciuta: {column}")
+            if low is not None:
+                conditions.append(f"{column} >= ?")
+                args.append(low)
+            if high is not None:
+                conditions.append(f"{column} <= ?")
+                args.append(high)
+
+        descending = order_by.startswith("-")
+        order_column = order_by.lstrip("-")
+        if order_column not in ALL_COLUMNS:
+            raise ValueError(f"Colonna di ordinamento sconosciuta: {order_column}")
+
+        sql = "SELECT * FROM sections"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_column} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [dict(row) for row in rows]
+
+    def export_csv(self, path: str):
+        """Esporta tutte le sezioni in un file CSV"""
+        rows = self.query()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(ALL_COLUMNS)
+            for row in rows:
+                writer.writerow([row[column] for column in ALL_COLUMNS])
+
+
+# ==============================================================================
+# ESEMPIO DI UTILIZZO
+# ==============================================================================
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    db_path = os.path.join(folder, SECTION_STORE_NAME)
+    if not os.path.exists(db_path):
+        sys.exit(f"Archivio sezioni non trovato: {db_path}")
+    store = SectionStore(db_path)
+    for section in store.query():
+        print(f"{section['name']:<30} A={section['area']:<12.6g} I11={section['i11']:<12.6g} "
+              f"I22={section['i22']:<12.6g} J={section['j']:<12.6g}")
+    store.close()
@@ -0,0 +1,188 @@
+"""
+St7API Simulato
+Backend con la stessa interfaccia di St7API per eseguire il generatore senza Strand7
+
+Implementa solo le funzioni usate da bxs_generator, senza DLL: i modelli
+sono tenuti in memoria per uID, i file BXS generati contengono il percorso
+dell'IGES importato e le proprietà di sezione sono valori fissi. Serve per
+provare le modalità di esecuzione (seriale, worker, slot, isolate, coda
+distribuita) su Linux e nei test:
+
+    generator = BXSGenerator(iges_folder, output_folder, api_module="st7api_sim")
+
+Il nome del file IGES attiva i casi di errore: "bad" fa fallire l'import,
+"hang" lo blocca, "crash" termina il processo. La variabile d'ambiente
+ST7API_SIM_DELAY imposta la durata simulata (secondi) di import, mesh e
+generazione BXS.
+"""
+import os
+import time
+import threading
+
+# ==============================================================================
+# COSTANTI (stessi valori di St7API)
+# ==============================================================================
+kMaxStrLen = 255
+
+tyPLATE = 2
+tyVERTEX = 5
+
+ipSurfaceMeshSizeMode = 1
+smAbsolute = 1
+
+ipBXSArea = 2
+ipBXSI11 = 3
+ipBXSI22 = 4
+ipBXSJ = 32
+
+kBeamTypeBeam = 6
+ptBEAMPROP = 1
+
+# Codici di errore restituiti dal simulatore
+ERR_NO_ERROR = 0
+ERR_UID_IN_USE = 5
+ERR_FILE_NOT_OPEN = 7
+ERR_IGES_IMPORT = 42
+ERR_BXS_NOT_FOUND = 87
+
+_ERROR_STRINGS = {
+    ERR_UID_IN_USE: "uID già in uso",
+    ERR_FILE_NOT_OPEN: "Nessun modello aperto per questo uID",
+    ERR_IGES_IMPORT: "Import IGES fallito (simulato)",
+    ERR_BXS_NOT_FOUND: "File BXS non trovato",
+}
+
+SIM_VERSION = (0, 0, 0)  # Versione riportata da St7APIVersion
+SIM_VERTICES = [(0.0, 0.0, 0.0), (100.0, 0.0, 0.0), (100.0, 40.0, 0.0), (0.0, 40.0, 0.0)]
+SIM_PLATES = 321
+SIM_LOOPS = [
+    [(0.0, 0.0), (100.0, 0.0), (100.0, 40.0), (0.0, 40.0)],   # Contorno esterno
+    [(10.0, 10.0), (10.0, 20.0), (20.0, 20.0), (20.0, 10.0)],  # Foro
+]
+
+DELAY = float(os.environ.get("ST7API_SIM_DELAY", "0.01"))
+
+_models = {}  # {uID: stato del modello aperto}
+_lock = threading.Lock()
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def _set_ref(ref, value):
+    """Scrive in un argomento passato con ctypes.byref()"""
+    ref._obj.value = value
+
+def _model(uID: int) -> dict:
+    with _lock:
+        return _models.get(uID)
+
+# ==============================================================================
+# API
+# ==============================================================================
+def St7Init():
+    return ERR_NO_ERROR
+
+def St7Release():
+    with _lock:
+        _models.clear()
+    return ERR_NO_ERROR
+
+def St7APIVersion(major, minor, point):
+    for ref, value in zip((major, minor, point), SIM_VERSION):
+        _set_ref(ref, value)
+    return ERR_NO_ERROR
+
+def St7GetAPIErrorString(error_code, buffer, size):
+    message = _ERROR_STRINGS.get(error_code, f"Errore simulato {error_code}")
+    buffer.value = message.encode("utf-8")[:size]
+    return ERR_NO_ERROR
+
+def St7NewFile(uID, file_name, scratch_path):
+    with _lock:
+        if uID in _models:
+            return ERR_UID_IN_USE
+        _models[uID] = {"path": file_name, "iges": None}
+    return ERR_NO_ERROR
+
+def St7CloseFile(uID):
+    with _lock:
+        return ERR_NO_ERROR if _models.pop(uID, None) is not None else ERR_FILE_NOT_OPEN
+
+def St7SaveFile(uID):
+    model = _model(uID)
+    if model is None:
+        return ERR_FILE_NOT_OPEN
+    with open(model["path"], "wb") as f:
+        f.write(b"ST7SIM")
+    return ERR_NO_ERROR
+
+def St7ImportIGESFile(uID, file_name, *options):
+    model = _model(uID)
+    if model is None:
+        return ERR_FILE_NOT_OPEN
+    time.sleep(DELAY)
+    name = os.path.basename(file_name)
+    if b"bad" in name:
+        return ERR_IGES_IMPORT
+    if b"hang" in name:
+        time.sleep(3600)
+    if b"crash" in name:
+        os._exit(3)
+    model["iges"] = file_name
+    return ERR_NO_ERROR
+
+def St7SurfaceMesh(uID, mesh_select, mesh_size, n_targets):
+    time.sleep(DELAY)
+    return ERR_NO_ERROR if _model(uID) is not None else ERR_FILE_NOT_OPEN
+
+def St7SetCleanMeshData(uID, clean, tolerance):
+    return ERR_NO_ERROR if _model(uID) is not None else ERR_FILE_NOT_OPEN
+
+def St7CleanMesh(uID):
+    return ERR_NO_ERROR if _model(uID) is not None else ERR_FILE_NOT_OPEN
+
+def St7GenerateBXS(uID, file_name, section_data):
+    model = _model(uID)
+    if model is None:
+        return ERR_FILE_NOT_OPEN
+    time.sleep(DELAY)
+    with open(file_name, "wb") as f:
+        f.write(b"BXSSIM " + (model["iges"] or b""))
+    for i in range(len(section_data)):
+        section_data[i] = i + 1.0
+    return ERR_NO_ERROR
+
+def St7GetTotal(uID, entity, total):
+    _set_ref(total, {tyVERTEX: len(SIM_VERTICES), tyPLATE: SIM_PLATES}.get(entity, 0))
+    return ERR_NO_ERROR
+
+def St7GetVertexXYZ(uID, vertex, xyz):
+    for i, value in enumerate(SIM_VERTICES[vertex - 1]):
+        xyz[i] = value
+    return ERR_NO_ERROR
+
+def St7NewBeamProperty(uID, prop_num, beam_type, name):
+    return ERR_NO_ERROR if _model(uID) is not None else ERR_FILE_NOT_OPEN
+
+def St7AssignBXS(uID, prop_num, file_name):
+    return ERR_NO_ERROR if os.path.exists(file_name) else ERR_BXS_NOT_FOUND
+
+def St7GetNumBXSLoopsAndPlates(uID, prop_num, n_loops, n_plates):
+    _set_ref(n_loops, len(SIM_LOOPS))
+    _set_ref(n_plates, SIM_PLATES)
+    return ERR_NO_ERROR
+
+def St7GetNumBXSLoopPoints(uID, prop_num, loop_num, n_points):
+    _set_ref(n_points, len(SIM_LOOPS[loop_num - 1]))
+    return ERR_NO_ERROR
+
+def St7GetBXSLoop(uID, prop_num, loop_num, max_points, n_points, xy):
+    points = SIM_LOOPS[loop_num - 1][:max_points]
+    for i, (x, y) in enumerate(points):
+        xy[2 * i] = x
+        xy[2 * i + 1] = y
+    _set_ref(n_points, len(points))
+    return ERR_NO_ERROR
+
+def St7DeleteProperty(uID, entity, prop_num):
+    return ERR_NO_ERROR
@@ -0,0 +1,7 @@
+"""Configurazione comune dei test: i moduli del progetto sono nella radice del repository"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,64 @@
+"""Generatore di file IGES minimi (linee 110) per i test"""
+import math
+
+L_SECTION = [(0.0, 0.0), (60.0, 0.0), (60.0, 10.0), (10.0, 10.0), (10.0, 40.0), (0.0, 40.0)]
+
+GLOBAL_PARAMETERS = "1H,,1H;,4Hprod,8Htest.igs,3Hsim,3H1.0,32,38,6,308,15,4Hprod,1.0,2,2HMM;"
+
+
+def _record(text: str, letter: str, sequence: int, width: int = 72) -> str:
+    return f"{text:<{width}}"[:width] + f"{letter}{sequence:7d}"
+
+
+def _parameter_chunks(values, width: int = 64):
+    """Divide i parametri in righe da width caratteri senza spezzare i valori"""
+    tokens = [f"{value}," for value in values[:-1]] + [f"{values[-1]};"]
+    chunks, current = [], ""
+    for token in tokens:
+        if current and len(current) + len(token) > width:
+            chunks.append(current)
+            current = ""
+        current += token
+    chunks.append(current)
+    return chunks
+
+
+def polygon_lines(points, z: float = 0.0):
+    """Segmenti (x1, y1, z, x2, y2, z) di un poligono chiuso"""
+    return [(x1, y1, z, x2, y2, z)
+            for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])]
+
+
+def transform_points(points, angle_deg: float = 0.0, dx: float = 0.0, dy: float = 0.0,
+                     scale: float = 1.0):
+    """Ruota, trasla e scala una lista di punti 2D"""
+    c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+    return [(scale * (x * c - y * s) + dx, scale * (x * s + y * c) + dy) for x, y in points]
+
+
+def iges_text(lines, newline: str = "\n", terminate: bool = True) -> str:
+    """Testo IGES con una entità 110 per ogni segmento"""
+    start = [_record("Sezione di prova", "S", 1)]
+    global_records = [_record(GLOBAL_PARAMETERS, "G", 1)]
+    directory, parameters = [], []
+    for index, segment in enumerate(lines):
+        de_pointer = 2 * index + 1
+        chunks = _parameter_chunks(["110"] + [repr(float(v)) for v in segment])
+        first_line = len(parameters) + 1
+        for chunk in chunks:
+            parameters.append(_record(f"{chunk:<64}{de_pointer:8d}", "P", len(parameters) + 1))
+        line1 = f"{110:8d}{first_line:8d}{0:8d}{0:8d}{0:8d}{0:8d}{0:8d}{0:8d}{'00000000':>8}"
+        line2 = f"{110:8d}{0:8d}{0:8d}{len(chunks):8d}{0:8d}"
+        directory.append(_record(line1, "D", de_pointer))
+        directory.append(_record(line2, "D", de_pointer + 1))
+    records = start + global_records + directory + parameters
+    if terminate:
+        counts = f"S{1:7d}G{len(global_records):7d}D{len(directory):7d}P{len(parameters):7d}"
+        records.append(_record(counts, "T", 1))
+    return newline.join(records) + newline
+
+
+def write_iges(path, lines, **options):
+    """Scrive un file IGES e ne restituisce il percorso come stringa"""
+    path.write_text(iges_text(lines, **options), encoding="latin-1")
+    return str(path)
@@ -0,0 +1,98 @@
+"""Facciata asyncio: eventi, cancellazione e serializzazione dei job"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bxs_async import AsyncEngineMixin
+from bxs_events import EventSourceMixin
+
+
+class FakeEngine(EventSourceMixin, AsyncEngineMixin):
+    """Motore che completa n elementi, interrompibile con stop()"""
+    log_callback = None
+
+    def __init__(self, n_items=3, seconds=0.01, started=None):
+        self.n_items = n_items
+        self.seconds = seconds
+        self.started = started
+        self.should_stop = False
+        self.intervals = []
+
+    def stop(self):
+        self.should_stop = True
+
+    def run(self):
+        start = time.monotonic()
+        if self.started is not None:
+            self.started.set()
+        self.should_stop = False
+        self._start_progress(self.n_items)
+        done = 0
+        for index in range(self.n_items):
+            if self.should_stop:
+                break
+            time.sleep(self.seconds)
+            self._item_done(f"item{index}", True)
+            done += 1
+        self.intervals.append((start, time.monotonic()))
+        return {"status": "stopped" if self.should_stop else "success", "done": done}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_events_then_result():
+    async def main():
+        job = FakeEngine(n_items=3).start_async()
+        items = [event.item async for event in job]
+        return items, await job
+
+    items, result = run(main())
+    assert items == ["item0", "item1", "item2"]
+    assert result == {"status": "success", "done": 3}
+
+
+def test_default_executor_runs_jobs_one_at_a_time():
+    async def main():
+        first, second = FakeEngine(seconds=0.03), FakeEngine(seconds=0.03)
+        await asyncio.gather(first.run_async(), second.run_async())
+        return first.intervals[0], second.intervals[0]
+
+    (start_a, end_a), (start_b, end_b) = run(main())
+    assert end_a <= start_b or end_b <= start_a
+
+
+def test_cancelled_task_stops_the_engine_cleanly():
+    async def main():
+        started = threading.Event()
+        engine = FakeEngine(n_items=1000, seconds=0.01, started=started)
+        task = asyncio.ensure_future(engine.run_async())
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return engine
+
+    engine = run(main())
+    assert engine.intervals and engine.progress.done < 1000
+
+
+def test_queued_job_cancelled_twice_ends_its_events_once():
+    async def main():
+        blocker = FakeEngine(n_items=5, seconds=0.02).start_async()
+        queued = FakeEngine().start_async()
+        queued.cancel()
+        queued.cancel()
+        events = [event async for event in queued]
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await blocker
+        await asyncio.sleep(0)
+        return events, queued._events.qsize()
+
+    events, leftover = run(main())
+    assert events == []
+    assert leftover == 0  # Nessun secondo END_OF_EVENTS in coda
@@ -0,0 +1,84 @@
+"""Cache BXS: chiavi, copia atomica, eviction LRU e unione del manifest tra istanze"""
+import itertools
+import os
+import types
+
+import pytest
+
+import bxs_cache
+from bxs_cache import BXSCache, hash_file, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Orologio che avanza di un secondo a ogni lettura (ordine LRU deterministico)"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(bxs_cache, "time", types.SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def write_bxs(folder, name, size):
+    path = folder / f"{name}.bxs"
+    path.write_bytes(name.encode() * (size // len(name)))
+    return str(path)
+
+
+def test_cache_key_ignores_parameter_order_but_not_values():
+    key = make_cache_key("abc", {"mesh": [1, 2], "tol": 0.1})
+    assert key == make_cache_key("abc", {"tol": 0.1, "mesh": [1, 2]})
+    assert key != make_cache_key("abc", {"mesh": [1, 2], "tol": 0.2})
+    assert key != make_cache_key("abd", {"mesh": [1, 2], "tol": 0.1})
+
+
+def test_hash_file_depends_on_content_only(tmp_path):
+    (tmp_path / "a.igs").write_bytes(b"stesso contenuto")
+    (tmp_path / "b.igs").write_bytes(b"stesso contenuto")
+    (tmp_path / "c.igs").write_bytes(b"altro contenuto")
+    assert hash_file(str(tmp_path / "a.igs")) == hash_file(str(tmp_path / "b.igs"))
+    assert hash_file(str(tmp_path / "a.igs")) != hash_file(str(tmp_path / "c.igs"))
+
+
+def test_store_and_restore_round_trip(tmp_path, clock):
+    cache = BXSCache(str(tmp_path / "cache"))
+    cache.store("k1", write_bxs(tmp_path, "uno", 100), "uno.igs")
+
+    dest = tmp_path / "restored.bxs"
+    assert cache.restore("k1", str(dest))
+    assert dest.read_bytes() == (tmp_path / "uno.bxs").read_bytes()
+    assert not cache.restore("assente", str(tmp_path / "x.bxs"))
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path, clock):
+    cache = BXSCache(str(tmp_path / "cache"), max_bytes=300)
+    cache.store("a", write_bxs(tmp_path, "a", 100), "a.igs")
+    cache.store("b", write_bxs(tmp_path, "b", 100), "b.igs")
+    cache.store("c", write_bxs(tmp_path, "c", 100), "c.igs")
+    assert cache.restore("a", str(tmp_path / "out_a.bxs"))  # "b" diventa il meno recente
+
+    cache.store("d", write_bxs(tmp_path, "d", 100), "d.igs")
+
+    assert set(cache.entries) == {"a", "c", "d"}
+    assert cache.total_bytes <= 300
+    assert not os.path.exists(cache._blob_path("b"))
+
+
+def test_missing_blob_is_treated_as_absent(tmp_path, clock):
+    cache = BXSCache(str(tmp_path / "cache"))
+    cache.store("k1", write_bxs(tmp_path, "uno", 100), "uno.igs")
+    os.remove(cache._blob_path("k1"))
+
+    assert not cache.restore("k1", str(tmp_path / "restored.bxs"))
+    assert "k1" not in cache.entries
+    assert not os.path.exists(tmp_path / "restored.bxs")
+
+
+def test_save_merges_entries_of_other_instances(tmp_path, clock):
+    folder = str(tmp_path / "cache")
+    first, second = BXSCache(folder), BXSCache(folder)
+    first.store("a", write_bxs(tmp_path, "a", 100), "a.igs")
+    second.store("b", write_bxs(tmp_path, "b", 100), "b.igs")
+
+    first.save()
+    second.save()
+
+    assert set(BXSCache(folder).entries) == {"a", "b"}
@@ -0,0 +1,102 @@
+"""Eventi di avanzamento, throughput EWMA ed ETA"""
+import threading
+
+import pytest
+
+import bxs_events
+from bxs_events import (EventSourceMixin, ItemDoneEvent, LogEvent, ThroughputTracker,
+                        format_duration)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(bxs_events.time, "monotonic", fake)
+    return fake
+
+
+class Engine(EventSourceMixin):
+    log_callback = None
+
+
+def test_ewma_interval_and_eta(clock):
+    tracker = ThroughputTracker(total=10, alpha=0.5)
+    assert tracker.eta is None and tracker.rate is None
+
+    clock.now += 2.0
+    tracker.update()
+    clock.now += 4.0
+    tracker.update()
+
+    assert tracker.interval == pytest.approx(3.0)   # 0.5 * 4 + 0.5 * 2
+    assert tracker.eta == pytest.approx(8 * 3.0)
+    assert tracker.rate == pytest.approx(2 / 6.0)
+    assert tracker.snapshot() == (2, 10, pytest.approx(2 / 6.0), pytest.approx(24.0))
+
+
+def test_batch_update_and_growing_total(clock):
+    tracker = ThroughputTracker()
+    clock.now += 6.0
+    tracker.update(3)
+    assert tracker.eta is None  # Totale non noto
+
+    tracker.add_total(5)
+    tracker.add_total(2)
+    assert tracker.total == 7
+    assert tracker.eta == pytest.approx(4 * 2.0)
+
+
+def test_concurrent_updates_are_not_lost():
+    tracker = ThroughputTracker()
+    n_threads, n_updates = 8, 2000
+    barrier = threading.Barrier(n_threads)
+
+    def work():
+        barrier.wait()
+        for _ in range(n_updates):
+            tracker.update()
+            tracker.add_total(1)
+
+    threads = [threading.Thread(target=work) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracker.done == tracker.total == n_threads * n_updates
+    assert tracker.eta == 0
+
+
+def test_engine_publishes_typed_events_and_text_to_callbacks(clock):
+    engine = Engine()
+    events, lines = [], []
+    engine.subscribe(events.append)
+    engine.log_callback = lines.append
+    engine._start_progress(total=2)
+
+    engine.log("messaggio")
+    clock.now += 1.0
+    engine._item_done("a.igs", True, seconds=1.0)
+    engine.unsubscribe(events.append)
+    engine._item_done("b.igs", False, error="errore")
+
+    assert [type(event) for event in events] == [LogEvent, ItemDoneEvent]
+    assert lines[0].endswith("] messaggio")
+    done = events[1]
+    assert (done.item, done.done, done.total, done.eta) == ("a.igs", 1, 2, pytest.approx(1.0))
+    assert done.to_dict()["kind"] == "item_done"
+    assert engine.progress.done == 2
+
+
+@pytest.mark.parametrize("seconds, text", [(None, "n/d"), (12.4, "12s"), (185, "3m 05s"),
+                                           (3720, "1h 02m")])
+def test_format_duration(seconds, text):
+    assert format_duration(seconds) == text
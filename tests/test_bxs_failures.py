@@ -0,0 +1,71 @@
+"""Cache negativa dei file IGES falliti e quarantena"""
+import json
+import os
+
+from bxs_failures import (QUARANTINE_INFO_SUFFIX, FailureCache, is_file_dependent,
+                          quarantine_file)
+from tests.test_generator_sim import make_generator
+
+
+def failed_record(stage="import_iges"):
+    return {"file": "bad.igs", "success": False, "error": "Import IGES fallito",
+            "error_code": 42, "failed_stage": stage, "total": 0.5}
+
+
+def test_only_content_dependent_stages_are_cached():
+    assert is_file_dependent(failed_record("surface_mesh"))
+    assert not is_file_dependent(failed_record("new_file"))
+    assert not is_file_dependent(dict(failed_record(), success=True))
+
+
+def test_repeated_failures_are_counted_and_forgotten(tmp_path):
+    cache = FailureCache(str(tmp_path / "failures.json"))
+    cache.record("k", failed_record())
+    entry = cache.record("k", failed_record())
+
+    assert entry["failures"] == 2 and entry["error_code"] == 42
+    assert entry["first"] <= entry["last"]
+    assert cache.get(None) is None
+    assert cache.forget("k") and not cache.forget("k")
+    assert cache.get("k") is None
+
+
+def test_forget_is_kept_when_merging_with_other_instances(tmp_path):
+    path = str(tmp_path / "failures.json")
+    first = FailureCache(path)
+    first.record("a", failed_record())
+    first.record("b", failed_record())
+    first.save()
+
+    second = FailureCache(path)
+    second.forget("a")
+    first.record("c", failed_record())
+    second.save()
+    first.save()  # Non deve far ricomparire "a"
+
+    assert set(FailureCache(path).entries) == {"b", "c"}
+
+
+def test_quarantine_moves_the_file_with_its_error(tmp_path):
+    iges = tmp_path / "bad.igs"
+    iges.write_text("contenuto")
+
+    dest = quarantine_file(str(iges), str(tmp_path / "quarantena"), {"error": "rotto"})
+
+    assert not iges.exists() and os.path.exists(dest)
+    with open(dest + QUARANTINE_INFO_SUFFIX, encoding="utf-8") as f:
+        assert json.load(f) == {"source": str(iges), "error": "rotto"}
+
+
+def test_known_failure_is_skipped_until_retry_is_requested(tmp_path):
+    generator, output_folder, logs = make_generator(tmp_path, ["buona", "bad_sezione"])
+    first = generator.run()
+    assert (first["success"], first["failed"]) == (1, 1), "\n".join(logs)
+    (output_folder / "buona.bxs").unlink()
+
+    second = generator.run()
+    assert second["known_failed"] == 1 and second["failed"] == 0, "\n".join(logs)
+
+    generator.retry_failed = True
+    third = generator.run()
+    assert third["failed"] == 1 and third["known_failed"] == 0, "\n".join(logs)
@@ -0,0 +1,108 @@
+"""Formato .bxsx: round-trip, librerie, errori di formato e confronto di sezioni"""
+import os
+
+import pytest
+
+from bxs_format import (BXSFormatError, BXSSection, diff_sections, iter_bxsx, read_bxsx,
+                        write_bxsx)
+
+RECTANGLE = [(0.0, 0.0), (100.0, 0.0), (100.0, 40.0), (0.0, 40.0)]
+HOLE = [(10.0, 10.0), (10.0, 20.0), (20.0, 20.0), (20.0, 10.0)]
+
+
+def make_section(name="HEA200", **overrides):
+    options = dict(header={"bxs_file": f"{name}.bxs", "note": "riga 1\nriga  2 "},
+                   properties={"area": 3900.0, "i11": 1.0 / 3.0, "j": 1e-17},
+                   loops=[list(RECTANGLE), list(HOLE)], plates=321)
+    options.update(overrides)
+    return BXSSection(name, **options)
+
+
+def test_round_trip_is_lossless(tmp_path):
+    section = make_section("Sezione con spazi")
+    path = str(tmp_path / "s.bxsx")
+
+    assert write_bxsx(path, [section]) == 1
+    restored = read_bxsx(path)
+
+    assert restored.to_dict() == section.to_dict()
+    assert diff_sections(section, restored, rel_tol=0.0) == []
+
+
+def test_library_is_streamed_in_order(tmp_path):
+    path = str(tmp_path / "lib.bxsx")
+    write_bxsx(path, (make_section(f"S{i}") for i in range(5)))
+
+    assert [section.name for section in iter_bxsx(path)] == [f"S{i}" for i in range(5)]
+
+
+def test_version_1_header_values_are_read(tmp_path):
+    path = tmp_path / "v1.bxsx"
+    path.write_text("BXSX 1\nSECTION A\nHEADER note due parole\nLOOP 3\n0 0\n1 0\n0 1\nEND\n")
+
+    assert read_bxsx(str(path)).header == {"note": "due parole"}
+
+
+@pytest.mark.parametrize("text, message", [
+    ("non un bxsx\n", "intestazione"),
+    ("BXSX 99\n", "versione"),
+    ("BXSX 2\nPROP area 1\n", "fuori da una sezione"),
+    ("BXSX 2\nSECTION A\nPROP area uno\nEND\n", "record non valido"),
+    ("BXSX 2\nSECTION A\nLOOP 2\n0 0\n", "troncato"),
+    ("BXSX 2\nSECTION A\nSECTION B\n", "END mancante"),
+])
+def test_malformed_files_raise_with_line_number(tmp_path, text, message):
+    path = tmp_path / "bad.bxsx"
+    path.write_text(text)
+
+    with pytest.raises(BXSFormatError, match=message) as info:
+        list(iter_bxsx(str(path)))
+    assert info.value.line_number >= 1
+
+
+def test_native_bxs_is_rejected(tmp_path):
+    path = tmp_path / "HEA200.bxs"
+    path.write_bytes(b"\x00\x01\xffbinario")
+
+    with pytest.raises(BXSFormatError, match="non è supportato"):
+        read_bxsx(str(path))
+
+
+@pytest.mark.parametrize("overrides", [
+    {"header": {"chiave con spazi": "x"}},
+    {"header": {"": "x"}},
+    {"properties": {"i 11": 1.0}},
+], ids=["header-space", "header-empty", "property-space"])
+def test_unparseable_keys_are_rejected_without_touching_target(tmp_path, overrides):
+    path = tmp_path / "s.bxsx"
+    write_bxsx(str(path), [make_section()])
+    before = path.read_bytes()
+
+    with pytest.raises(ValueError):
+        write_bxsx(str(path), [make_section("B", **overrides)])
+
+    assert path.read_bytes() == before
+    assert os.listdir(tmp_path) == ["s.bxsx"]
+
+
+def test_validate_reports_geometric_problems():
+    assert make_section().validate() == []
+    errors = make_section(loops=[[(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)], [(0.0, 0.0)]],
+                          properties={"area": -1.0}).validate()
+    assert any("area nulla" in error for error in errors)
+    assert any("solo 1 punti" in error for error in errors)
+    assert any("Area non positiva" in error for error in errors)
+
+
+def test_diff_sections_uses_relative_tolerance():
+    a = make_section()
+    b = make_section(properties={"area": 3900.0 * (1 + 1e-9), "i11": 0.5, "j": 1e-17})
+
+    differences = diff_sections(a, b)
+
+    assert differences == [f"Proprietà i11: {1 / 3:.6g} ≠ {0.5:.6g}"]
+
+
+def test_loop_area_sign():
+    assert BXSSection.loop_area(RECTANGLE) == pytest.approx(4000.0)
+    assert BXSSection.loop_area(HOLE) == pytest.approx(-100.0)
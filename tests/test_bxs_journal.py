@@ -0,0 +1,56 @@
+"""Diario di ripresa: ultimo esito per file, righe troncate e compattazione"""
+from bxs_journal import STATUS_CACHED, STATUS_DONE, STATUS_FAILED, RunJournal
+
+
+def test_last_outcome_wins_and_survives_reopen(tmp_path):
+    path = str(tmp_path / "journal.log")
+    journal = RunJournal(path)
+    journal.record("a.igs", "k1", STATUS_FAILED)
+    journal.record("a.igs", "k1", STATUS_DONE, 1.5)
+    journal.record("b.igs", "k2", STATUS_CACHED)
+    journal.record("c.igs", None, STATUS_FAILED)
+    journal.close()
+
+    reopened = RunJournal(path)
+    assert reopened.is_completed("a.igs", "k1")
+    assert reopened.is_completed("b.igs", "k2")
+    assert not reopened.is_completed("a.igs", "k-diversa")  # Input modificati
+    assert not reopened.is_completed("c.igs", "-")
+    assert not reopened.is_completed("assente.igs", "k1")
+    reopened.close()
+
+
+def test_torn_last_line_is_ignored_and_not_glued_to_the_next(tmp_path):
+    path = tmp_path / "journal.log"
+    journal = RunJournal(str(path))
+    journal.record("a.igs", "k1", STATUS_DONE)
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"{STATUS_DONE}\tk2\tb.i")  # Crash durante la scrittura
+
+    journal = RunJournal(str(path))
+    assert "b.i" not in journal.entries and not journal.is_completed("b.igs", "k2")
+    journal.record("c.igs", "k3", STATUS_DONE)
+    journal.close()
+
+    reopened = RunJournal(str(path))
+    assert set(reopened.entries) == {"a.igs", "c.igs"}
+    assert reopened.is_completed("c.igs", "k3")
+    reopened.close()
+
+
+def test_superseded_lines_are_compacted_on_open(tmp_path):
+    path = tmp_path / "journal.log"
+    journal = RunJournal(str(path))
+    for _ in range(5):
+        journal.record("a.igs", "k1", STATUS_FAILED)
+    journal.record("a.igs", "k1", STATUS_DONE)
+    journal.close()
+
+    reopened = RunJournal(str(path))
+    reopened.close()
+
+    assert path.read_text(encoding="utf-8").splitlines() == [f"{STATUS_DONE}\tk1\ta.igs\t0"]
+    reopened = RunJournal(str(path))
+    assert reopened.is_completed("a.igs", "k1")
+    reopened.close()
@@ -0,0 +1,65 @@
+"""Pubblicazione atomica dei BXS e lettura del manifest"""
+import os
+
+from bxs_manifest import (MANIFEST_NAME, PublicationManifest, is_published, publish_copy,
+                          read_manifest)
+
+
+def test_publish_copy_replaces_hard_links_instead_of_writing_through(tmp_path):
+    source = tmp_path / "source.bxs"
+    source.write_bytes(b"originale")
+    first = tmp_path / "a.bxs"
+    second = tmp_path / "b.bxs"
+    publish_copy(str(source), str(first))
+    method = publish_copy(str(first), str(second), link=True)
+
+    replacement = tmp_path / "nuovo.bxs"
+    replacement.write_bytes(b"rigenerato")
+    publish_copy(str(replacement), str(first))
+
+    assert method in ("hardlink", "copy")
+    assert first.read_bytes() == b"rigenerato"
+    assert second.read_bytes() == b"originale"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_published_files_are_recognised_until_modified(tmp_path):
+    bxs = tmp_path / "a.bxs"
+    bxs.write_bytes(b"bxs")
+    manifest = PublicationManifest(str(tmp_path))
+    assert manifest.publish(str(bxs))
+    assert not manifest.publish(str(tmp_path / "assente.bxs"))
+    manifest.close()
+
+    entries = read_manifest(str(tmp_path))
+    assert is_published(entries, str(bxs))
+    assert not is_published(entries, str(tmp_path / "assente.bxs"))
+
+    bxs.write_bytes(b"bxs riscritto")
+    assert not is_published(read_manifest(str(tmp_path)), str(bxs))
+
+
+def test_torn_line_is_ignored_and_closed_before_appending(tmp_path):
+    bxs = tmp_path / "a.bxs"
+    bxs.write_bytes(b"bxs")
+    with open(tmp_path / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        f.write("rotto.bxs\t12")  # Crash durante la scrittura
+
+    assert read_manifest(str(tmp_path)) == {}
+    manifest = PublicationManifest(str(tmp_path))
+    manifest.publish(str(bxs))
+    manifest.close()
+
+    assert set(read_manifest(str(tmp_path))) == {"a.bxs"}
+
+
+def test_last_publication_wins(tmp_path):
+    bxs = tmp_path / "a.bxs"
+    bxs.write_bytes(b"prima")
+    manifest = PublicationManifest(str(tmp_path))
+    manifest.publish(str(bxs))
+    bxs.write_bytes(b"seconda versione")
+    manifest.publish(str(bxs))
+    manifest.close()
+
+    assert is_published(read_manifest(str(tmp_path)), str(bxs))
@@ -0,0 +1,88 @@
+"""Prefetch dei file IGES: nomi originali, limiti di profondità e pulizia"""
+import os
+
+from bxs_prefetch import IGESPrefetcher
+
+
+def make_files(folder, names, size=1000):
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        path = folder / name
+        path.write_bytes(name.encode() + b"x" * (size - len(name)))
+        paths.append(str(path))
+    return paths
+
+
+def wait_prefetched(prefetcher, count):
+    """Attende che il thread abbia anticipato count file (acquire non aspetta i file in coda)"""
+    with prefetcher._condition:
+        assert prefetcher._condition.wait_for(
+            lambda: prefetcher.stats["prefetched"] >= count, timeout=5)
+
+
+def test_copies_keep_the_original_name_even_for_homonyms(tmp_path):
+    files = make_files(tmp_path / "a", ["trave.igs"]) + make_files(tmp_path / "b", ["trave.igs"])
+    prefetcher = IGESPrefetcher(str(tmp_path / "local"), depth=2)
+    prefetcher.submit(files)
+    wait_prefetched(prefetcher, 2)
+
+    local_paths = [prefetcher.acquire(path) for path in files]
+
+    assert all(os.path.basename(path) == "trave.igs" for path in local_paths)
+    assert local_paths[0] != local_paths[1]
+    for original, local in zip(files, local_paths):
+        assert os.path.dirname(os.path.dirname(local)) == str(tmp_path / "local")
+        with open(original, "rb") as a, open(local, "rb") as b:
+            assert a.read() == b.read()
+    prefetcher.close()
+
+
+def test_release_removes_the_copy_and_its_folder(tmp_path):
+    files = make_files(tmp_path / "iges", ["a.igs", "b.igs", "c.igs"])
+    local_folder = tmp_path / "local"
+    prefetcher = IGESPrefetcher(str(local_folder), depth=1)
+    prefetcher.submit(files)
+
+    for count, path in enumerate(files, 1):
+        wait_prefetched(prefetcher, count)
+        local = prefetcher.acquire(path)
+        assert os.path.exists(local)
+        prefetcher.release(path)
+        assert not os.path.exists(os.path.dirname(local))
+
+    assert prefetcher.stats["hits"] == len(files)
+    prefetcher.close()
+    assert not local_folder.exists()
+
+
+def test_depth_and_byte_limits(tmp_path):
+    files = make_files(tmp_path / "iges", [f"f{i}.igs" for i in range(5)], size=1000)
+    prefetcher = IGESPrefetcher(str(tmp_path / "local"), depth=3, max_bytes=2500)
+    prefetcher.submit(files)
+    wait_prefetched(prefetcher, 2)
+
+    with prefetcher._condition:
+        assert prefetcher.stats["prefetched"] == 2  # Il terzo supererebbe max_bytes
+        assert prefetcher._bytes == 2000
+    prefetcher.close()
+
+
+def test_unprefetched_file_is_read_from_its_original_path(tmp_path):
+    files = make_files(tmp_path / "iges", ["a.igs"])
+    prefetcher = IGESPrefetcher(str(tmp_path / "local"))
+
+    assert prefetcher.acquire(files[0]) == files[0]
+    assert prefetcher.stats["misses"] == 1
+    prefetcher.close()
+
+
+def test_warm_mode_returns_the_original_path(tmp_path):
+    files = make_files(tmp_path / "iges", ["a.igs"])
+    prefetcher = IGESPrefetcher(str(tmp_path / "local"), mode="warm")
+    prefetcher.submit(files)
+
+    assert prefetcher.acquire(files[0]) == files[0]
+    prefetcher.release(files[0])
+    prefetcher.close()
+    assert not (tmp_path / "local").exists()
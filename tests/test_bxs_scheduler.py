@@ -0,0 +1,92 @@
+"""Storico dei tempi, stime di durata e ordinamento longest-first"""
+import pytest
+
+from bxs_scheduler import (TimingDatabase, estimate_durations, estimate_makespan,
+                           order_longest_first)
+
+
+def make_files(tmp_path, sizes):
+    paths = []
+    for name, size in sizes.items():
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        paths.append(str(path))
+    return paths
+
+
+def test_record_smooths_repeated_timings(tmp_path):
+    db = TimingDatabase(str(tmp_path / "t.json"))
+    db.record("h", 10.0, 5.0, 100)
+    db.record("h", 20.0, 5.0, 100)
+
+    assert db.get("h") == pytest.approx(15.0)
+    assert db.entries["h"]["runs"] == 2
+    assert db.get("assente") is None
+
+
+def test_rates_are_medians(tmp_path):
+    db = TimingDatabase(str(tmp_path / "t.json"))
+    db.record("a", 10.0, 10.0, 1000)
+    db.record("b", 40.0, 20.0, 1000)
+    db.record("c", 30.0, None, 3000)
+
+    rate_cost, rate_byte = db.rates()
+    assert rate_cost == pytest.approx(1.5)
+    assert rate_byte == pytest.approx(0.01)
+
+
+def test_without_history_a_single_metric_orders_the_batch(tmp_path):
+    files = make_files(tmp_path, {"grande.igs": 5000, "piccolo.igs": 10, "medio.igs": 100})
+    db = TimingDatabase(str(tmp_path / "t.json"))
+    costs = {files[0]: 1.0, files[1]: 50.0}  # Il file medio non ha costo
+
+    estimates, known = estimate_durations(files, db, lambda path: None, costs.get)
+
+    # Costo non noto per tutti: ordine per dimensione, senza mescolare le unità
+    assert known == 0
+    assert order_longest_first(estimates) == [files[0], files[2], files[1]]
+
+
+def test_without_history_cost_is_used_when_known_for_every_file(tmp_path):
+    files = make_files(tmp_path, {"a.igs": 5000, "b.igs": 10})
+    db = TimingDatabase(str(tmp_path / "t.json"))
+    costs = {files[0]: 1.0, files[1]: 50.0}
+
+    estimates, _ = estimate_durations(files, db, lambda path: None, costs.get)
+
+    assert order_longest_first(estimates) == [files[1], files[0]]
+
+
+def test_with_history_every_estimate_is_in_seconds(tmp_path):
+    files = make_files(tmp_path, {"noto.igs": 100, "con_costo.igs": 100,
+                                  "senza_costo.igs": 2000, "vuoto.igs": 0})
+    db = TimingDatabase(str(tmp_path / "t.json"))
+    db.record("hash-noto", 12.0, 4.0, 1000)   # 3 s per unità di costo, 0.012 s per byte
+    hashes = {files[0]: "hash-noto"}
+    costs = {files[1]: 2.0}
+
+    estimates, known = estimate_durations(files, db, hashes.get, costs.get)
+
+    assert known == 1
+    assert estimates[files[0]] == pytest.approx(12.0)
+    assert estimates[files[1]] == pytest.approx(6.0)
+    assert estimates[files[2]] == pytest.approx(24.0)
+    assert estimates[files[3]] == pytest.approx(12.0)  # Durata mediana
+
+
+def test_makespan_of_longest_first_order():
+    durations = [7.0, 5.0, 4.0, 3.0, 3.0, 2.0]
+    assert estimate_makespan(durations, 2) == pytest.approx(12.0)
+    assert estimate_makespan(durations, 1) == pytest.approx(sum(durations))
+
+
+def test_timings_survive_reload_and_merge(tmp_path):
+    path = str(tmp_path / "t.json")
+    first, second = TimingDatabase(path), TimingDatabase(path)
+    first.record("a", 1.0, None, 10)
+    second.record("b", 2.0, None, 20)
+    first.save()
+    second.save()
+
+    reloaded = TimingDatabase(path)
+    assert (reloaded.get("a"), reloaded.get("b")) == (1.0, 2.0)
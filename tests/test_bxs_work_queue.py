@@ -0,0 +1,107 @@
+"""Coda con lease: esclusività, recupero delle lease scadute e gara tra istanze"""
+import json
+import os
+import threading
+
+import pytest
+
+from bxs_work_queue import LEASE_SUFFIX, LeaseQueue
+
+
+@pytest.fixture
+def folder(tmp_path):
+    return str(tmp_path / "queue")
+
+
+def expired_lease(folder, name):
+    """Lease di un'istanza terminata, scaduta da dieci secondi"""
+    dead = LeaseQueue(folder, owner="morta", ttl=-10.0, clock_skew=0.0)
+    assert dead.claim(name, "k")
+    return dead
+
+
+def read_lease(folder, name):
+    with open(os.path.join(folder, name + LEASE_SUFFIX), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_claim_is_exclusive_until_released(folder):
+    a, b = LeaseQueue(folder, owner="a"), LeaseQueue(folder, owner="b")
+
+    assert a.claim("s.igs", "k")
+    assert not b.claim("s.igs", "k")
+    b.release("s.igs")  # Non è sua: la lease di "a" resta
+    assert not b.claim("s.igs", "k")
+
+    a.release("s.igs")
+    assert b.claim("s.igs", "k")
+
+
+def test_completed_result_is_tied_to_the_input_key(folder):
+    a = LeaseQueue(folder, owner="a")
+    assert a.claim("s.igs", "k1")
+    a.complete("s.igs", "k1", success=True)
+
+    assert a.result("s.igs", "k1")["success"] is True
+    assert a.result("s.igs", "k2") is None
+    assert "s.igs" not in a.pending_leases()
+    a.clear_result("s.igs")
+    assert a.result("s.igs", "k1") is None
+
+
+def test_expired_lease_is_reclaimed_and_the_old_owner_sees_it_lost(folder):
+    dead = expired_lease(folder, "s.igs")
+    b = LeaseQueue(folder, owner="b", clock_skew=0.0)
+
+    assert b.claim("s.igs", "k")
+    assert read_lease(folder, "s.igs")["owner"] == "b"
+    assert read_lease(folder, "s.igs")["attempt"] == 2
+    assert dead.renew() == ["s.igs"]
+
+
+def test_clock_skew_delays_reclaim(folder):
+    expired_lease(folder, "s.igs")  # Scaduta da 10 s
+    assert not LeaseQueue(folder, owner="b", clock_skew=60.0).claim("s.igs", "k")
+    assert LeaseQueue(folder, owner="c", clock_skew=5.0).claim("s.igs", "k")
+
+
+def test_file_is_failed_after_max_attempts(folder):
+    dead = LeaseQueue(folder, owner="morta", ttl=-10.0, clock_skew=0.0, max_attempts=2)
+    assert dead.claim("s.igs", "k")       # Tentativo 1
+    assert dead.claim("s.igs", "k")       # Tentativo 2 (la propria lease è già scaduta)
+
+    other = LeaseQueue(folder, owner="b", clock_skew=0.0, max_attempts=2)
+    assert not other.claim("s.igs", "k")
+
+    result = other.result("s.igs", "k")
+    assert result["success"] is False
+    assert "2 lease scadute" in result["error"]
+
+
+def test_only_one_instance_keeps_an_expired_lease_after_the_race(folder):
+    n_instances, n_rounds = 8, 25
+    queues = [LeaseQueue(folder, owner=f"i{i}", clock_skew=0.0) for i in range(n_instances)]
+    for round_index in range(n_rounds):
+        name = f"s{round_index}.igs"
+        expired_lease(folder, name)
+        barrier = threading.Barrier(n_instances)
+        winners = []
+
+        def contend(queue):
+            barrier.wait()
+            if queue.claim(name, "k"):
+                winners.append(queue.owner)
+
+        threads = [threading.Thread(target=contend, args=(queue,)) for queue in queues]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Una lease spostata da chi ha perso la gara può lasciar vincere
+        # brevemente due istanze: al rinnovo ne resta una sola, la proprietaria
+        assert winners
+        holders = [queue.owner for queue in queues
+                   if name not in queue.renew() and name in queue.held]
+        assert holders == [read_lease(folder, name)["owner"]], (name, winners)
+    assert not [entry for entry in os.listdir(folder) if entry.endswith((".stale", ".tmp"))]
@@ -0,0 +1,64 @@
+"""Ricerca lazy dei file IGES: estensioni, ricorsione, pattern e ordinamento"""
+import os
+
+from file_discovery import IGES_EXTENSIONS, iter_files
+
+
+def make_tree(root, paths):
+    for rel_path in paths:
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+def relative(root, paths):
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in paths]
+
+
+def test_extensions_are_case_insensitive_and_top_level_only(tmp_path):
+    make_tree(tmp_path, ["a.igs", "B.IGES", "c.txt", "d.bxs", "sub/e.igs"])
+
+    found = relative(tmp_path, iter_files(str(tmp_path), IGES_EXTENSIONS, sort=True))
+
+    assert found == ["a.igs", "B.IGES"]
+
+
+def test_recursive_depth_first_sorted_and_hidden_folders_skipped(tmp_path):
+    make_tree(tmp_path, ["z.igs", "b/2.igs", "b/1.igs", "a/x/3.igs", ".bxs_cache/h.igs"])
+
+    found = relative(tmp_path, iter_files(str(tmp_path), IGES_EXTENSIONS,
+                                          recursive=True, sort=True))
+
+    assert found == ["z.igs", "a/x/3.igs", "b/1.igs", "b/2.igs"]
+
+
+def test_include_and_exclude_patterns(tmp_path):
+    make_tree(tmp_path, ["trave_1.igs", "trave_2.igs", "pilastro.igs",
+                         "vecchi/trave_3.igs", "nuovi/trave_4.igs"])
+
+    found = relative(tmp_path, iter_files(str(tmp_path), IGES_EXTENSIONS, recursive=True,
+                                          include=["TRAVE_*"], exclude=["vecchi", "*_2.igs"],
+                                          sort=True))
+
+    assert found == ["trave_1.igs", "nuovi/trave_4.igs"]
+
+
+def test_patterns_with_slash_match_relative_paths(tmp_path):
+    make_tree(tmp_path, ["a/s.igs", "b/s.igs"])
+
+    found = relative(tmp_path, iter_files(str(tmp_path), IGES_EXTENSIONS, recursive=True,
+                                          include=["b/*"]))
+
+    assert found == ["b/s.igs"]
+
+
+def test_discovery_is_lazy(tmp_path):
+    make_tree(tmp_path, ["a.igs"])
+    files = iter_files(str(tmp_path), IGES_EXTENSIONS, sort=True)
+    make_tree(tmp_path, ["b.igs"])  # Creato dopo la chiamata, prima della scansione
+
+    assert relative(tmp_path, files) == ["a.igs", "b.igs"]
+
+
+def test_missing_folder_yields_nothing(tmp_path):
+    assert list(iter_files(str(tmp_path / "assente"), IGES_EXTENSIONS)) == []
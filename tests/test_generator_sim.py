@@ -0,0 +1,119 @@
+"""Pipeline completa del generatore con il backend simulato (st7api_sim) nelle varie modalità"""
+import os
+
+import pytest
+
+from bxs_generator import BXSGenerator
+
+
+def make_iges_folder(folder, names):
+    """Crea file IGES fittizi con contenuti distinti (la cache non li unisce)"""
+    folder.mkdir()
+    for i, name in enumerate(names):
+        (folder / f"{name}.igs").write_text(f"S      1\nfile {name} {i}\n")
+    return str(folder)
+
+
+def make_generator(tmp_path, names, **options):
+    iges_folder = make_iges_folder(tmp_path / "iges", names)
+    output_folder = tmp_path / "out"
+    output_folder.mkdir()
+    logs = []
+    options.setdefault("preflight", False)
+    generator = BXSGenerator(iges_folder, str(output_folder), str(tmp_path / "scratch"),
+                             log_callback=logs.append, api_module="st7api_sim", **options)
+    return generator, output_folder, logs
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"workers": 2},
+    {"slots": 2},
+    {"isolate": True},
+    {"prefetch": "copy"},
+    {"slots": 2, "prefetch": "copy"},
+], ids=["serial", "workers", "slots", "isolate", "prefetch", "slots-prefetch"])
+def test_all_files_generated(tmp_path, options):
+    names = [f"sezione_{i}" for i in range(4)]
+    generator, output_folder, logs = make_generator(tmp_path, names, **options)
+
+    result = generator.run()
+
+    assert result["status"] == "success", "\n".join(logs)
+    assert result["success"] == len(names)
+    for name in names:
+        bxs = output_folder / f"{name}.bxs"
+        assert bxs.read_bytes().startswith(b"BXSSIM ")
+        assert name.encode() in bxs.read_bytes()
+    assert not [f for f in os.listdir(output_folder) if f.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("options", [{}, {"workers": 2}, {"slots": 2}],
+                         ids=["serial", "workers", "slots"])
+def test_failed_import_does_not_stop_batch(tmp_path, options):
+    generator, output_folder, logs = make_generator(
+        tmp_path, ["buona_1", "bad_sezione", "buona_2"], **options)
+
+    result = generator.run()
+
+    assert result["status"] == "partial_success", "\n".join(logs)
+    assert (result["success"], result["failed"]) == (2, 1)
+    assert (output_folder / "buona_1.bxs").exists()
+    assert not (output_folder / "bad_sezione.bxs").exists()
+
+
+def test_isolated_crash_is_contained(tmp_path):
+    generator, output_folder, logs = make_generator(
+        tmp_path, ["buona_1", "crash_sezione", "buona_2"], isolate=True)
+
+    result = generator.run()
+
+    assert (result["success"], result["failed"]) == (2, 1), "\n".join(logs)
+    assert (output_folder / "buona_2.bxs").exists()
+
+
+def test_second_run_uses_cache(tmp_path):
+    names = ["sezione_a", "sezione_b"]
+    generator, output_folder, logs = make_generator(tmp_path, names)
+    assert generator.run()["status"] == "success"
+    for name in names:
+        (output_folder / f"{name}.bxs").unlink()
+
+    result = generator.run()
+
+    assert result["cached"] == len(names), "\n".join(logs)
+    assert all((output_folder / f"{name}.bxs").exists() for name in names)
+
+
+def test_strand7_upgrade_invalidates_the_cache(tmp_path, monkeypatch):
+    import st7api_sim
+    names = ["sezione_a", "sezione_b"]
+    generator, output_folder, logs = make_generator(tmp_path, names)
+    assert generator.run()["status"] == "success"
+    for name in names:
+        (output_folder / f"{name}.bxs").unlink()
+
+    monkeypatch.setattr(st7api_sim, "SIM_VERSION", (99, 1, 0))
+    upgraded = BXSGenerator(generator.iges_folder, generator.output_folder,
+                            generator.scratch_folder, log_callback=logs.append,
+                            api_module="st7api_sim", preflight=False)
+    result = upgraded.run()
+
+    assert upgraded.get_mesh_parameters()["strand7_version"] == "99.1.0"
+    assert (result["success"], result["cached"]) == (len(names), 0), "\n".join(logs)
+
+
+def test_stop_during_first_file_skips_the_rest(tmp_path):
+    generator, output_folder, logs = make_generator(
+        tmp_path, ["sezione_a", "sezione_b", "sezione_c"])
+
+    def log_and_stop(message):
+        logs.append(message)
+        if "[1/6]" in message and not generator.should_stop:
+            generator.stop()
+    generator.log_callback = log_and_stop
+
+    result = generator.run()
+
+    assert result["status"] != "success", "\n".join(logs)
+    assert result["success"] + result["failed"] < 3
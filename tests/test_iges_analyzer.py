@@ -0,0 +1,69 @@
+"""Analisi preliminare IGES: struttura, unità, bounding box e firma geometrica"""
+import pytest
+
+from iges_analyzer import analyze_iges
+from tests.iges_samples import L_SECTION, polygon_lines, transform_points, write_iges
+
+
+def test_valid_file_report(tmp_path):
+    report = analyze_iges(write_iges(tmp_path / "l.igs", polygon_lines(L_SECTION)))
+
+    assert report.is_valid, report.errors
+    assert report.entity_counts == {110: len(L_SECTION)}
+    assert report.units == "MM"
+    assert report.bounding_box == ((0.0, 0.0, 0.0), (60.0, 40.0, 0.0))
+    assert report.estimate_cost() == len(L_SECTION)
+
+
+def test_fixed_length_records_without_newlines(tmp_path):
+    lines = polygon_lines(L_SECTION)
+    with_newlines = analyze_iges(write_iges(tmp_path / "lf.igs", lines))
+    fixed = analyze_iges(write_iges(tmp_path / "fixed.igs", lines, newline=""))
+
+    assert fixed.is_valid, fixed.errors
+    assert fixed.to_dict() | {"path": None, "file_size": None} == \
+        with_newlines.to_dict() | {"path": None, "file_size": None}
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    report = analyze_iges(write_iges(tmp_path / "cut.igs", polygon_lines(L_SECTION),
+                                     terminate=False))
+    assert not report.is_valid
+    assert any("Terminate" in error for error in report.errors)
+
+
+def test_empty_file_is_rejected(tmp_path):
+    (tmp_path / "empty.igs").write_bytes(b"")
+    assert analyze_iges(str(tmp_path / "empty.igs")).errors == ["File vuoto"]
+
+
+@pytest.mark.parametrize("angle, dx, dy", [(0, 25.0, -7.5), (30, 0, 0), (117, 3.25, 1000.0), (180, 0, 0)])
+def test_signature_invariant_to_rotation_and_translation(tmp_path, angle, dx, dy):
+    reference = analyze_iges(write_iges(tmp_path / "ref.igs", polygon_lines(L_SECTION)),
+                             signature=True)
+    moved_points = transform_points(L_SECTION, angle, dx, dy)
+    # Stessa geometria con segmenti in ordine e verso diversi
+    moved_lines = [line[3:] + line[:3] for line in reversed(polygon_lines(moved_points))]
+    moved = analyze_iges(write_iges(tmp_path / "moved.igs", moved_lines), signature=True)
+
+    assert reference.signature is not None
+    assert moved.signature == reference.signature
+
+
+def test_signature_distinguishes_different_sections(tmp_path):
+    reference = analyze_iges(write_iges(tmp_path / "ref.igs", polygon_lines(L_SECTION)),
+                             signature=True)
+    scaled = analyze_iges(write_iges(tmp_path / "scaled.igs",
+                                     polygon_lines(transform_points(L_SECTION, scale=1.1))),
+                          signature=True)
+    mirrored = analyze_iges(write_iges(tmp_path / "mirror.igs",
+                                       polygon_lines([(-x, y) for x, y in L_SECTION])),
+                            signature=True)
+
+    assert scaled.signature != reference.signature
+    assert mirrored.signature != reference.signature
+
+
+def test_signature_not_computed_unless_requested(tmp_path):
+    report = analyze_iges(write_iges(tmp_path / "l.igs", polygon_lines(L_SECTION)))
+    assert report.signature is None
@@ -0,0 +1,75 @@
+"""Proprietà di sezione NumPy confrontate con le formule in forma chiusa"""
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from section_calculator import (check_properties, compute_properties, rank_sections,
+                                section_properties)
+from tests.iges_samples import transform_points
+
+B, H = 100.0, 40.0
+RECTANGLE = [(0.0, 0.0), (B, 0.0), (B, H), (0.0, H)]
+HOLE = [(10.0, 10.0), (20.0, 10.0), (20.0, 20.0), (10.0, 20.0)]  # Antiorario come il contorno
+
+
+def test_rectangle_matches_closed_form():
+    props = section_properties([RECTANGLE])
+
+    assert props["area"] == pytest.approx(B * H)
+    assert (props["x_bar"], props["y_bar"]) == pytest.approx((B / 2, H / 2))
+    assert props["ixx"] == pytest.approx(B * H ** 3 / 12)
+    assert props["iyy"] == pytest.approx(H * B ** 3 / 12)
+    assert props["ixy"] == pytest.approx(0.0, abs=1e-6)
+    assert props["i11"] == pytest.approx(H * B ** 3 / 12)
+    assert props["i22"] == pytest.approx(B * H ** 3 / 12)
+    assert props["zxx_plus"] == pytest.approx(B * H ** 2 / 6)
+    assert props["rx"] == pytest.approx(H / math.sqrt(12))
+
+
+def test_hole_is_detected_whatever_the_loop_orientation():
+    expected_area = B * H - 100.0
+    for loops in ([RECTANGLE, HOLE], [RECTANGLE[::-1], HOLE], [RECTANGLE, HOLE[::-1]]):
+        assert section_properties(loops)["area"] == pytest.approx(expected_area)
+
+
+def test_principal_values_are_invariant_to_rotation_and_translation():
+    reference = section_properties([RECTANGLE, HOLE])
+    moved = section_properties([transform_points(RECTANGLE, 37, 500.0, -20.0),
+                                transform_points(HOLE, 37, 500.0, -20.0)])
+
+    for name in ("area", "i11", "i22", "r1", "r2"):
+        assert moved[name] == pytest.approx(reference[name], rel=1e-9)
+
+
+def test_batch_matches_single_sections_and_marks_empty_ones_nan():
+    sections = [[RECTANGLE], [RECTANGLE, HOLE], [], [transform_points(RECTANGLE, scale=2.0)]]
+
+    batch = compute_properties(sections)
+
+    for index in (0, 1, 3):
+        single = section_properties(sections[index])
+        for name, values in batch.items():
+            assert values[index] == pytest.approx(single[name], nan_ok=True)
+    assert math.isnan(batch["area"][2])
+    assert batch["area"][3] == pytest.approx(4 * B * H)
+
+
+def test_check_properties_flags_only_real_discrepancies():
+    computed = section_properties([RECTANGLE])
+    reported = dict(computed)
+    reported["x_bar"] += 1e-4  # Entro la tolleranza rispetto al raggio polare
+    assert check_properties(computed, reported) == []
+
+    reported["i11"] *= 1.01
+    differences = check_properties(computed, reported)
+    assert len(differences) == 1 and differences[0].startswith("i11")
+
+
+def test_rank_sections_skips_nan():
+    properties = compute_properties([[RECTANGLE], [], [transform_points(RECTANGLE, scale=2.0)]])
+
+    ranking = rank_sections(["a", "vuota", "b"], properties, "area")
+
+    assert [name for name, _ in ranking] == ["b", "a"]
@@ -0,0 +1,68 @@
+"""Torsione di Saint-Venant: confronto con soluzioni analitiche note"""
+import math
+
+import pytest
+
+pytest.importorskip("scipy")
+
+from torsion_solver import solve_torsion, verify_torsion
+from tests.iges_samples import transform_points
+
+
+def circle(radius, n=96, cx=0.0, cy=0.0):
+    return [(cx + radius * math.cos(2 * math.pi * i / n), cy + radius * math.sin(2 * math.pi * i / n))
+            for i in range(n)]
+
+
+def polygon_polar_inertia(points):
+    """J di un poligono pieno di n lati se fosse un cerchio (correzione per la discretizzazione)"""
+    n = len(points)
+    radius = math.hypot(*points[0])
+    return n * radius ** 4 * math.sin(2 * math.pi / n) * (2 + math.cos(2 * math.pi / n)) / 12
+
+
+def test_solid_circle_has_polar_j_and_no_warping():
+    result = solve_torsion([circle(10.0)])
+
+    assert result["j"] == pytest.approx(polygon_polar_inertia(circle(10.0)), rel=0.02)
+    assert abs(result["iw"]) < 1e-3 * result["j"]
+    assert (result["x_shear"], result["y_shear"]) == pytest.approx((0.0, 0.0), abs=0.05)
+
+
+def test_tube_j():
+    outer, inner = 20.0, 15.0
+
+    result = solve_torsion([circle(outer), circle(inner)])
+
+    assert result["j"] == pytest.approx(math.pi / 2 * (outer ** 4 - inner ** 4), rel=0.03)
+
+
+def test_square_j_matches_saint_venant_coefficient():
+    a = 30.0
+    result = solve_torsion([[(0.0, 0.0), (a, 0.0), (a, a), (0.0, a)]])
+
+    assert result["j"] == pytest.approx(0.1406 * a ** 4, rel=0.02)
+    assert (result["x_shear"], result["y_shear"]) == pytest.approx((a / 2, a / 2), abs=0.05)
+
+
+def test_results_follow_a_rigid_motion_of_the_section():
+    channel = [(0.0, 0.0), (60.0, 0.0), (60.0, 8.0), (8.0, 8.0), (8.0, 92.0),
+               (60.0, 92.0), (60.0, 100.0), (0.0, 100.0)]
+    reference = solve_torsion([channel])
+    moved = solve_torsion([transform_points(channel, 90.0, 1000.0, 50.0)])
+
+    assert moved["j"] == pytest.approx(reference["j"], rel=0.02)
+    assert moved["iw"] == pytest.approx(reference["iw"], rel=0.05)
+    # Centro di taglio del canale all'esterno dell'anima, ruotato con la sezione
+    assert reference["x_shear"] < 0.0
+    assert (moved["x_shear"], moved["y_shear"]) == pytest.approx(
+        (1000.0 - reference["y_shear"], 50.0 + reference["x_shear"]), abs=0.5)
+
+
+def test_verify_torsion_accepts_matching_values_and_flags_wrong_ones():
+    loops = [circle(10.0)]
+    reference = solve_torsion(loops)
+
+    assert verify_torsion(loops, {"j": reference["j"] * 1.005, "iw": 0.0}) == []
+    differences = verify_torsion(loops, {"j": reference["j"] * 1.5})
+    assert len(differences) == 1 and differences[0].startswith("j")
@@ -0,0 +1,270 @@
+"""
+Torsion Solver
+Risolutore agli elementi finiti (NumPy/SciPy) della torsione di Saint-Venant
+
+Dai loop del contorno di una sezione genera una mesh di triangoli lineari,
+risolve il problema della funzione di ingobbamento con matrici sparse e
+restituisce costante torsionale J, centro di taglio e costante di
+ingobbamento Iw. Serve a verificare in blocco i risultati di St7GenerateBXS
+su qualsiasi sistema e a precalcolare le proprietà senza Strand7.
+NumPy e SciPy sono dipendenze opzionali.
+"""
+import sys
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    import scipy.sparse
+    import scipy.sparse.linalg
+    from scipy.spatial import Delaunay
+except ImportError:
+    np = None
+
+from section_calculator import section_properties
+
+# ==============================================================================
+# COSTANTI
+# ==============================================================================
+SCIPY_AVAILABLE = np is not None
+DEFAULT_TARGET_TRIANGLES = 4000
+DEFAULT_TORSION_TOLERANCE = 0.02  # Tolleranza relativa del confronto con Strand7
+
+Loop = Sequence[Tuple[float, float]]
+
+# ==============================================================================
+# FUNZIONI DI SUPPORTO
+# ==============================================================================
+def _require_scipy():
+    """Verifica che NumPy e SciPy siano installati"""
+    if np is None:
+        raise ImportError("NumPy/SciPy non installati: eseguire 'pip install numpy scipy'")
+
+def _loop_edges(loops: Sequence[Loop]):
+    """Lati (E, 4) [x1, y1, x2, y2] di tutti i loop"""
+    edges = []
+    for loop in loops:
+        points = np.asarray(loop, dtype=float).reshape(-1, 2)
+        if len(points) >= 3:
+            edges.append(np.hstack([points, np.roll(points, -1, axis=0)]))
+    return np.concatenate(edges)
+
+def _inside(points, edges):
+    """Test pari/dispari vettoriale di N punti rispetto all'insieme dei loop"""
+    px, py = points[:, 0:1], points[:, 1:2]
+    x1, y1, x2, y2 = (edges[:, i][None, :] for i in range(4))
+    crosses = (y1 > py) != (y2 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+    return np.count_nonzero(crosses & (px < x_cross), axis=1) % 2 == 1
+
+def _distance_to_edges(points, edges):
+    """Distanza minima di N punti dai lati del contorno"""
+    p = points[:, None, :]
+    a = edges[None, :, 0:2]
+    d = edges[None, :, 2:4] - a
+    length2 = np.maximum(np.sum(d * d, axis=2), 1e-300)
+    t = np.clip(np.sum((p - a) * d, axis=2) / length2, 0.0, 1.0)
+    closest = a + t[..., None] * d
+    return np.min(np.linalg.norm(p - closest, axis=2), axis=1)
+
+def mesh_section(loops: Sequence[Loop], element_size: Optional[float] = None,
+                 target_triangles: int = DEFAULT_TARGET_TRIANGLES):
+    """
+    Genera una mesh di triangoli della sezione
+
+    I lati del contorno vengono suddivisi alla dimensione dell'elemento, i
+    nodi interni sono disposti su un reticolo triangolare e la triangolazione
+    di Delaunay viene ridotta ai triangoli con baricentro interno alla sezione.
+
+    Args:
+        loops: Loop del contorno [(x, y), ...] (esterni e fori)
+        element_size: Dimensione dell'elemento; se None è ricavata da target_triangles
+        target_triangles: Numero indicativo di triangoli
+
+    Returns:
+        Tupla (nodi (N, 2), triangoli (T, 3))
+    """
+    _require_scipy()
+    edges = _loop_edges(loops)
+    x1, y1, x2, y2 = edges.T
+    if element_size is None:
+        area = section_properties(loops)["area"]
+        element_size = math.sqrt(2.0 * area / max(1, target_triangles))
+
+    # Nodi di contorno: suddivisione uniforme di ogni lato
+    lengths = np.hypot(x2 - x1, y2 - y1)
+    boundary = []
+    for edge, length in zip(edges, lengths):
+        n = max(1, int(math.ceil(length / element_size)))
+        t = np.arange(n)[:, None] / n
+        boundary.append(edge[0:2] + t * (edge[2:4] - edge[0:2]))
+    boundary = np.concatenate(boundary)
+
+    # Nodi interni su reticolo triangolare, lontani almeno mezzo elemento dal contorno
+    xmin, ymin = boundary.min(axis=0)
+    xmax, ymax = boundary.max(axis=0)
+    dy = element_size * math.sqrt(3.0) / 2.0
+    grid = []
+    for row, y in enumerate(np.arange(ymin + dy / 2, ymax, dy)):
+        xs = np.arange(xmin + (row % 2) * element_size / 2, xmax, element_size)
+        grid.append(np.column_stack([xs, np.full_like(xs, y)]))
+    interior = np.concatenate(grid) if grid else np.empty((0, 2))
+    if len(interior):
+        interior = interior[_inside(interior, edges)]
+    if len(interior):
+        interior = interior[_distance_to_edges(interior, edges) > 0.5 * element_size]
+
+    nodes = np.vstack([boundary, interior])
+    triangles = Delaunay(nodes).simplices
+    centroids = nodes[triangles].mean(axis=1)
+    triangles = triangles[_inside(centroids, edges)]
+
+    # Scarta triangoli degeneri e nodi inutilizzati
+    p = nodes[triangles]
+    double_area = ((p[:, 1, 0] - p[:, 0, 0]) * (p[:, 2, 1] - p[:, 0, 1])
+                   - (p[:, 2, 0] - p[:, 0, 0]) * (p[:, 1, 1] - p[:, 0, 1]))
+    triangles = triangles[np.abs(double_area) > 1e-12 * element_size ** 2]
+    used, triangles = np.unique(triangles, return_inverse=True)
+    return nodes[used], triangles.reshape(-1, 3)
+
+# ==============================================================================
+# FUNZIONI
+# ==============================================================================
+def solve_torsion(loops: Sequence[Loop], element_size: Optional[float] = None,
+                  target_triangles: int = DEFAULT_TARGET_TRIANGLES) -> Dict[str, float]:
+    """
+    Calcola J, centro di taglio e costante di ingobbamento di una sezione
+
+    Risolve con elementi triangolari lineari il problema di Neumann per la
+    funzione di ingobbamento (laplaciano nullo, derivata normale y·nx - x·ny)
+    in coordinate baricentriche.
+
+    Args:
+        loops: Loop del contorno [(x, y), ...]
+        element_size: Dimensione degli elementi (opzionale)
+        target_triangles: Numero indicativo di triangoli
+
+    Returns:
+        Dizionario con "j", "iw", "x_shear", "y_shear" (coordinate originali),
+        "area", "x_bar", "y_bar" della mesh, "nodes" e "triangles"
+    """
+    _require_scipy()
+    nodes, triangles = mesh_section(loops, element_size, target_triangles)
+    xy = nodes[triangles]                                  # (T, 3, 2)
+    x, y = xy[..., 0], xy[..., 1]
+    double_area = ((x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0])
+                   - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0]))
+    sign = np.sign(double_area)
+    area = np.abs(double_area) / 2.0
+
+    # Baricentro e momenti d'inerzia della mesh
+    total_area = area.sum()
+    x_bar = np.sum(area * x.mean(axis=1)) / total_area
+    y_bar = np.sum(area * y.mean(axis=1)) / total_area
+    x = x - x_bar
+    y = y - y_bar
+    xc, yc = x.mean(axis=1), y.mean(axis=1)
+
+    def integral_product(f, g):
+        # Integrale esatto di f·g (entrambe lineari) su ogni triangolo
+        return area / 12.0 * (np.sum(f * g, axis=1) + f.sum(axis=1) * g.sum(axis=1))
+
+    ixx = integral_product(y, y).sum()
+    iyy = integral_product(x, x).sum()
+    ixy = integral_product(x, y).sum()
+
+    # Gradienti delle funzioni di forma: dN/dx = b / 2A, dN/dy = c / 2A
+    b = np.stack([y[:, 1] - y[:, 2], y[:, 2] - y[:, 0], y[:, 0] - y[:, 1]], axis=1) * sign[:, None]
+    c = np.stack([x[:, 2] - x[:, 1], x[:, 0] - x[:, 2], x[:, 1] - x[:, 0]], axis=1) * sign[:, None]
+    dndx = b / (2.0 * area[:, None])
+    dndy = c / (2.0 * area[:, None])
+
+    # Matrice di rigidezza e termine noto: ∫∇N·∇ω = ∫(dN/dx·y - dN/dy·x)
+    ke = area[:, None, None] * (dndx[:, :, None] * dndx[:, None, :]
+                                + dndy[:, :, None] * dndy[:, None, :])
+    fe = area[:, None] * (dndx * yc[:, None] - dndy * xc[:, None])
+    n_nodes = len(nodes)
+    rows = np.repeat(triangles, 3, axis=1).ravel()
+    cols = np.tile(triangles, (1, 3)).ravel()
+    stiffness = scipy.sparse.coo_matrix((ke.ravel(), (rows, cols)),
+                                        shape=(n_nodes, n_nodes)).tocsr()
+    load = np.bincount(triangles.ravel(), weights=fe.ravel(), minlength=n_nodes)
+
+    # Problema di Neumann: ω definita a meno di una costante, si vincola il nodo 0
+    omega = np.zeros(n_nodes)
+    omega[1:] = scipy.sparse.linalg.spsolve(stiffness[1:, 1:].tocsc(), load[1:])
+    omega_e = omega[triangles]
+    omega -= np.sum(area * omega_e.mean(axis=1)) / total_area
+    omega_e = omega[triangles]
+
+    omega_x = np.sum(dndx * omega_e, axis=1)
+    omega_y = np.sum(dndy * omega_e, axis=1)
+    j = ixx + iyy + np.sum(area * (xc * omega_y - yc * omega_x))
+
+    # Centro di taglio: prodotti settoriali nulli rispetto agli assi baricentrici
+    q_x = integral_product(omega_e, x).sum()
+    q_y = integral_product(omega_e, y).sum()
+    det = ixx * iyy - ixy ** 2
+    x_shear = (q_x * ixy - iyy * q_y) / det
+    y_shear = (ixx * q_x - ixy * q_y) / det
+
+    omega_s = omega_e - y_shear * x + x_shear * y
+    mean_s = np.sum(area * omega_s.mean(axis=1)) / total_area
+    iw = integral_product(omega_s, omega_s).sum() - total_area * mean_s ** 2
+
+    return {
+        "j": float(j),
+        "iw": float(iw),
+        "x_shear": float(x_shear + x_bar),
+        "y_shear": float(y_shear + y_bar),
+        "area": float(total_area),
+        "x_bar": float(x_bar),
+        "y_bar": float(y_bar),
+        "nodes": n_nodes,
+        "triangles": len(triangles),
+    }
+
+def verify_torsion(loops: Sequence[Loop], reported: Dict[str, float],
+                   rel_tol: float = DEFAULT_TORSION_TOLERANCE,
+                   target_triangles: int = DEFAULT_TARGET_TRIANGLES) -> List[str]:
+    """
+    Confronta J e Iw calcolati con quelli riportati da Strand7 (prop_bxs)
+
+    Iw è nullo per sezioni compatte o a elementi concorrenti: viene confrontato
+    rispetto a J·A/π, ordine di grandezza di Iw per sezioni aperte.
+
+    Returns:
+        Lista di discrepanze (vuota se entro tolleranza)
+    """
+    result = solve_torsion(loops, target_triangles=target_triangles)
+    differences = []
+    for name in ("j", "iw"):
+        theirs = reported.get(name)
+        if theirs is None:
+            continue
+        scale = max(abs(result[name]), abs(theirs))
+        if name == "iw":
+            scale = max(scale, result["j"] * (result["area"] / math.pi))
+        if abs(result[name] - theirs) > rel_tol * scale:
+            differences.append(f"{name}: calcolato {result[name]:.6g}, Strand7 {theirs:.6g}")
+    return differences
+
+
+# ==============================================================================
+# ESEMPIO DI UTILIZZO
+# ==============================================================================
+if __name__ == "__main__":
+    from file_discovery import iter_files
+    from bxs_format import SECTION_FILE_EXTENSION, iter_bxsx
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    n_checked = n_mismatch = 0
+    for path in iter_files(folder, (SECTION_FILE_EXTENSION,), recursive=True, sort=True):
+        for section in iter_bxsx(path):
+            n_checked += 1
+            differences = verify_torsion(section.loops, section.properties)
+            if differences:
+                n_mismatch += 1
+                print(f"⚠ {section.name}: {'; '.join(differences)}")
+    print(f"Sezioni verificate: {n_checked}, discrepanze: {n_mismatch}")